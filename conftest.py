@@ -2,6 +2,9 @@
 
 import argparse
 import importlib.util
+import os
+
+import pytest
 
 
 def _addoption_if_missing(group, *args, **kwargs):
@@ -40,3 +43,17 @@ def pytest_addoption(parser):
         default=None,
         help="(noop) accepted for compatibility when pytest-cov is unavailable.",
     )
+
+
+@pytest.fixture(autouse=True)
+def _narrative_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep compiled narrative packs out of the real ``~/.cache`` during tests."""
+    if "GB_NARRATIVE_CACHE_DIR" not in os.environ:
+        monkeypatch.setenv("GB_NARRATIVE_CACHE_DIR", str(tmp_path_factory.getbasetemp() / "narrative-cache"))
+
+
+@pytest.fixture(autouse=True)
+def _chroma_dir(tmp_path_factory, monkeypatch):
+    """Send the content index and monster lookup artifacts to a temp ``.chroma``."""
+    if "GB_CHROMA_DIR" not in os.environ:
+        monkeypatch.setenv("GB_CHROMA_DIR", str(tmp_path_factory.getbasetemp() / ".chroma"))
@@ -1,5 +1,19 @@
 """AI cache utilities."""
 
-from .ai_cache import CacheInputs, call_with_cache, make_cache_key, make_key
+from .ai_cache import (
+    CacheInputs,
+    acall_with_cache,
+    call_many_with_cache,
+    call_with_cache,
+    make_cache_key,
+    make_key,
+)
 
-__all__ = ["CacheInputs", "call_with_cache", "make_key", "make_cache_key"]
+__all__ = [
+    "CacheInputs",
+    "acall_with_cache",
+    "call_many_with_cache",
+    "call_with_cache",
+    "make_key",
+    "make_cache_key",
+]
@@ -1,20 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import dataclasses
 import datetime as _dt
 import hashlib
+import heapq
 import inspect
 import json
 import os
 import tempfile
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable, Mapping, MutableMapping, Sequence
+from typing import Any, Callable, Mapping, Sequence
 
 CACHE_VERSION = 2
 _INDEX_FILENAME = "index.json"
 _LOCK_FILENAME = "index.lock"
-_TEXT_SUFFIX = ".txt"
+_BLOB_DIRNAME = "blobs"
+_BLOB_SUFFIX = ".z"
+_COMPRESS_LEVEL = 6
+_LOG_SUFFIX = ".log"
+# The log is folded into ``index.json`` once it has more ops than this and
+# more ops than there are entries.
+_COMPACT_MIN_OPS = 256
 _DEFAULT_PARAM_KEYS = (
     "temperature",
     "top_p",
@@ -41,7 +52,8 @@ def call_with_cache(inputs: CacheInputs, fn_call_model: Callable[..., str]) -> s
     ``fn_call_model`` will be invoked with ``inputs`` if its signature expects at
     least one positional argument; otherwise it is invoked without arguments for
     backwards compatibility. The callable is only executed on cache miss (or
-    when refresh is requested).
+    when refresh is requested). Concurrent misses for the same key in this
+    process share a single model call.
     """
 
     if _is_cache_disabled():
@@ -50,37 +62,140 @@ def call_with_cache(inputs: CacheInputs, fn_call_model: Callable[..., str]) -> s
     cache_dir = _cache_dir()
     cache_dir.mkdir(parents=True, exist_ok=True)
     key = make_key(inputs)
-    text_path = cache_dir / f"{key}{_TEXT_SUFFIX}"
     refresh = _refresh_requested()
-    expects_inputs = _fn_requires_inputs(fn_call_model)
+    store = _index_store(cache_dir)
+
+    # Hits need no file lock: the index is replayed from the append-only log
+    # and the hit is recorded as one appended line.
+    if not refresh:
+        text = _read_hit(store, cache_dir, key)
+        if text is not None:
+            return text
+
+    flight_key = (os.path.abspath(cache_dir), key)
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(flight_key)
+        leader = future is None
+        if leader:
+            future = _INFLIGHT[flight_key] = Future()
+    if not leader:
+        text = future.result()
+        hits = store.hit(key)
+        _log("HIT", key, hits=hits)
+        return text
 
+    try:
+        text = _fill(store, cache_dir, key, inputs, fn_call_model, refresh)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(text)
+        return text
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(flight_key, None)
+
+
+def _fill(
+    store: "_IndexStore",
+    cache_dir: Path,
+    key: str,
+    inputs: CacheInputs,
+    fn_call_model: Callable[..., str],
+    refresh: bool,
+) -> str:
+    """Miss path: call the model with the file lock held only around index updates."""
     with _index_lock(cache_dir):
-        index = _load_index(cache_dir)
-        entry = index.get("entries", {}).get(key)
-        entry = _validate_entry(cache_dir, key, entry)
-        ttl_expired = _ttl_expired(entry)
-        if entry and not refresh and not ttl_expired:
-            try:
-                text = text_path.read_text(encoding="utf-8")
-            except FileNotFoundError:
-                _log("STALE-INDEX", key)
-                _remove_entry(index, key, cache_dir)
-            else:
-                _touch_entry(entry)
-                _save_index(cache_dir, index)
-                _log("HIT", key, hits=entry.get("hits"))
+        store.refresh()
+        entry = store.entries.get(key)
+        if entry and not refresh:
+            # Another process may have written it since our lock-free check.
+            text = _read_hit(store, cache_dir, key, locked=True)
+            if text is not None:
                 return text
-        if entry and (refresh or ttl_expired):
-            _remove_entry(index, key, cache_dir)
-
-        text = fn_call_model(inputs) if expects_inputs else fn_call_model()
-        _write_text_atomic(text_path, text)
-        entry = _create_entry(inputs, text_path)
-        index.setdefault("entries", {})[key] = entry
-        _enforce_limits(cache_dir, index)
-        _save_index(cache_dir, index)
-        _log("MISS→WRITE", key, hits=entry.get("hits"))
-        return text
+            entry = store.entries.get(key)
+        if entry:
+            store.remove(key)
+
+    text = fn_call_model(inputs) if _fn_requires_inputs(fn_call_model) else fn_call_model()
+
+    with _index_lock(cache_dir):
+        store.refresh()
+        blob, size, raw_size = _write_blob(cache_dir, text)
+        entry = _create_entry(inputs, blob, size, raw_size)
+        store.put(key, entry)
+        _enforce_limits(cache_dir, store)
+        store.maybe_compact()
+    _log("MISS→WRITE", key, hits=entry.get("hits"))
+    return text
+
+
+async def acall_with_cache(inputs: CacheInputs, fn_call_model: Callable[..., Any]) -> str:
+    """Async :func:`call_with_cache`.
+
+    Cache I/O runs in the default executor.  ``fn_call_model`` may be a plain
+    callable or a coroutine function; coroutines run on the calling loop.
+    """
+
+    loop = asyncio.get_running_loop()
+    fn = fn_call_model
+    if inspect.iscoroutinefunction(fn_call_model):
+        wants_inputs = _fn_requires_inputs(fn_call_model)
+
+        def fn() -> str:
+            coro = fn_call_model(inputs) if wants_inputs else fn_call_model()
+            return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    return await loop.run_in_executor(None, call_with_cache, inputs, fn)
+
+
+def call_many_with_cache(
+    inputs_list: Sequence[CacheInputs],
+    fn_call_model: Callable[..., str],
+    *,
+    max_workers: int | None = None,
+) -> list[str]:
+    """:func:`call_with_cache` for each of ``inputs_list``, in order.
+
+    Misses run concurrently on at most ``max_workers`` threads (default
+    ``GRIMBRAIN_AI_CACHE_WORKERS`` or 4); duplicate inputs share one call.
+    """
+
+    if not inputs_list:
+        return []
+    workers = max(1, min(max_workers or _max_workers(), len(inputs_list)))
+    if workers == 1:
+        return [call_with_cache(inputs, fn_call_model) for inputs in inputs_list]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda inputs: call_with_cache(inputs, fn_call_model), inputs_list))
+
+
+def _read_hit(store: "_IndexStore", cache_dir: Path, key: str, *, locked: bool = False) -> str | None:
+    """Cached text for ``key`` (recording the hit), or ``None`` on a miss.
+
+    Only the touched entry is validated: a missing text file or an expired
+    entry is a miss and is cleaned up by the writer.
+    """
+    store.refresh()
+    entry = store.entries.get(key)
+    if not entry or _ttl_expired(entry):
+        return None
+    try:
+        text = _read_payload(cache_dir, entry)
+    except FileNotFoundError:
+        _log("STALE-INDEX", key)
+        return None
+    if text is None:
+        return None
+    hits = store.hit(key)
+    _log("HIT", key, hits=hits)
+    if locked:
+        store.maybe_compact()
+    elif store.needs_compaction():
+        with _index_lock(cache_dir):
+            store.maybe_compact()
+    return text
 
 
 def make_key(inputs: CacheInputs) -> str:
@@ -118,6 +233,10 @@ def _index_path(cache_dir: Path) -> Path:
     return cache_dir / _INDEX_FILENAME
 
 
+def _log_path(cache_dir: Path, generation: int) -> Path:
+    return cache_dir / f"index.{generation}{_LOG_SUFFIX}"
+
+
 @contextlib.contextmanager
 def _index_lock(cache_dir: Path):
     path = cache_dir / _LOCK_FILENAME
@@ -130,117 +249,333 @@ def _index_lock(cache_dir: Path):
             _unlock_file(lock_file)
 
 
-def _load_index(cache_dir: Path) -> MutableMapping[str, Any]:
-    index_path = _index_path(cache_dir)
-    if not index_path.exists():
-        return {"version": CACHE_VERSION, "entries": {}}
-    try:
-        data = json.loads(index_path.read_text(encoding="utf-8"))
-    except Exception:
-        return {"version": CACHE_VERSION, "entries": {}}
-    if data.get("version") != CACHE_VERSION:
-        return {"version": CACHE_VERSION, "entries": {}}
-    entries = data.get("entries")
-    if not isinstance(entries, dict):
-        entries = {}
-    _drop_missing_files(cache_dir, entries)
-    data["entries"] = entries
-    return data
-
-
-def _save_index(cache_dir: Path, index: Mapping[str, Any]) -> None:
-    index_path = _index_path(cache_dir)
-    payload = json.dumps(index, indent=2, ensure_ascii=False)
-    _write_text_atomic(index_path, payload, binary=True)
-
-
-def _drop_missing_files(cache_dir: Path, entries: MutableMapping[str, Any]) -> None:
-    missing: list[str] = []
-    for key, entry in list(entries.items()):
-        filename = entry.get("filename")
-        if not filename:
-            missing.append(key)
-            continue
-        path = cache_dir / filename
-        if not path.exists():
-            missing.append(key)
-    for key in missing:
-        entries.pop(key, None)
-        _log("STALE-INDEX", key)
+class _IndexStore:
+    """In-process view of one cache directory's index.
 
+    ``index.json`` is a snapshot naming the log generation that follows it;
+    ``index.<generation>.log`` holds one JSON op per line (``put``, ``hit``,
+    ``del``).  :meth:`refresh` replays only the lines appended since the last
+    call and reloads when another process has compacted.  Puts, deletes and
+    compaction happen under the directory's file lock; hits are appended
+    without it.
+    """
 
-def _validate_entry(cache_dir: Path, key: str, entry: Mapping[str, Any] | None):
-    if not entry:
-        return None
-    filename = entry.get("filename")
-    if not filename:
-        return None
-    path = cache_dir / filename
-    if not path.exists():
-        _log("STALE-INDEX", key)
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.generation = 0
+        # payload id -> number of entries using it, and its size on disk
+        self.blob_refs: dict[str, int] = {}
+        self.blob_sizes: dict[str, int] = {}
+        self.total_bytes = 0
+        # Recency for eviction: a min-heap of (seq, key) with lazy deletion;
+        # only the pair matching ``_recency[key]`` is live.
+        self._recency: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []
+        self._seq = 0
+        self._snapshot_id: tuple[int, int, int] | None = None
+        self._log_offset = 0
+        self._log_ops = 0
+        self._lock = threading.RLock()
+
+    def refresh(self) -> None:
+        with self._lock:
+            snapshot_id = _stat_id(_index_path(self.cache_dir))
+            if snapshot_id != self._snapshot_id or self._snapshot_id is None:
+                self._load_snapshot(snapshot_id)
+            self._replay_log()
+
+    def _load_snapshot(self, snapshot_id: tuple[int, int, int] | None) -> None:
+        data: Mapping[str, Any] = {}
+        if snapshot_id is not None:
+            try:
+                data = json.loads(_index_path(self.cache_dir).read_text(encoding="utf-8"))
+            except Exception:
+                data = {}
+        if not isinstance(data, Mapping) or data.get("version") != CACHE_VERSION:
+            data = {}
+        entries = data.get("entries")
+        entries = entries if isinstance(entries, dict) else {}
+        self.entries = {}
+        self.blob_refs, self.blob_sizes, self.total_bytes = {}, {}, 0
+        self._recency, self._heap, self._seq = {}, [], 0
+        for key, entry in sorted(entries.items(), key=lambda kv: (_last_used(kv[1]), kv[0])):
+            if isinstance(entry, dict):
+                self._add(key, dict(entry))
+        generation = data.get("log", 0)
+        self.generation = generation if isinstance(generation, int) else 0
+        self._snapshot_id = snapshot_id
+        self._log_offset = 0
+        self._log_ops = 0
+
+    def _replay_log(self) -> None:
+        path = _log_path(self.cache_dir, self.generation)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        if size < self._log_offset:  # truncated behind our back; start over
+            self._load_snapshot(self._snapshot_id)
+        if size == self._log_offset:
+            return
+        with path.open("rb") as fh:
+            fh.seek(self._log_offset)
+            offset = self._log_offset
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break  # partial line still being written
+                offset += len(line)
+                self._log_ops += 1
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, TypeError, AttributeError):
+                    continue
+            self._log_offset = offset
+
+    def _apply(self, op: Mapping[str, Any]) -> None:
+        kind = op.get("op")
+        key = op.get("key")
+        if kind == "put" and isinstance(op.get("entry"), dict):
+            self._forget(key)
+            self._add(key, dict(op["entry"]))
+        elif kind == "hit":
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry["hits"] = int(entry.get("hits", 0)) + 1
+                entry["last_hit_at"] = op.get("at") or entry.get("last_hit_at")
+                self._touch(key)
+        elif kind == "del":
+            self._forget(key)
+
+    def _add(self, key: str, entry: dict[str, Any]) -> None:
+        self.entries[key] = entry
+        payload = _payload_id(entry)
+        if payload is not None:
+            refs = self.blob_refs.get(payload, 0)
+            if refs == 0:
+                size = int(entry.get("size") or 0)
+                self.blob_sizes[payload] = size
+                self.total_bytes += size
+            self.blob_refs[payload] = refs + 1
+        self._touch(key)
+
+    def _forget(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        self._recency.pop(key, None)
+        payload = _payload_id(entry) if entry else None
+        if payload is None or payload not in self.blob_refs:
+            return
+        self.blob_refs[payload] -= 1
+        if self.blob_refs[payload] <= 0:
+            del self.blob_refs[payload]
+            self.total_bytes -= self.blob_sizes.pop(payload, 0)
+
+    def _touch(self, key: str) -> None:
+        self._seq += 1
+        self._recency[key] = self._seq
+        heapq.heappush(self._heap, (self._seq, key))
+        if len(self._heap) > 2 * len(self._recency) + 64:
+            self._heap = [(seq, k) for k, seq in self._recency.items()]
+            heapq.heapify(self._heap)
+
+    def least_recent(self) -> str | None:
+        """Least recently used key, in O(log n) amortized."""
+        with self._lock:
+            while self._heap:
+                seq, key = self._heap[0]
+                if self._recency.get(key) == seq:
+                    return key
+                heapq.heappop(self._heap)
+            return None
+
+    def _append(self, op: Mapping[str, Any], *, locked: bool = False) -> None:
+        """Append ``op`` to the current log.
+
+        Only callers holding the file lock may create the log: a lock-free
+        writer that missed a compaction would otherwise recreate an old
+        generation's log that nothing ever deletes.  When the open fails the
+        snapshot is reloaded and the append retried on its generation.
+        """
+        line = (json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        flags = os.O_WRONLY | os.O_APPEND | (os.O_CREAT if locked else 0)
+        for _ in range(2):
+            try:
+                fd = os.open(_log_path(self.cache_dir, self.generation), flags, 0o644)
+            except FileNotFoundError:
+                self._snapshot_id = None
+                self.refresh()
+                continue
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self._replay_log()
+            return
+        self._apply(op)  # no log to record it in; keep it in memory only
+
+    def hit(self, key: str) -> int:
+        with self._lock:
+            self._append({"op": "hit", "key": key, "at": _now()})
+            return int(self.entries.get(key, {}).get("hits", 0))
+
+    def put(self, key: str, entry: Mapping[str, Any]) -> None:
+        """Record ``entry`` for ``key`` (file lock held)."""
+        with self._lock:
+            self._append({"op": "put", "key": key, "entry": dict(entry)}, locked=True)
+
+    def remove(self, key: str) -> None:
+        """Drop ``key``, deleting its payload once no other entry shares it (file lock held)."""
+        with self._lock:
+            entry = self.entries.get(key)
+            self._append({"op": "del", "key": key}, locked=True)
+            payload = _payload_id(entry) if entry else None
+            if payload is None or payload in self.blob_refs:
+                return
+        with contextlib.suppress(FileNotFoundError):
+            _payload_path(self.cache_dir, entry).unlink()
+
+    def needs_compaction(self) -> bool:
+        return self._log_ops > max(_COMPACT_MIN_OPS, len(self.entries))
+
+    def maybe_compact(self) -> None:
+        """Fold the log into a new snapshot once it outgrows the index (file lock held)."""
+        with self._lock:
+            self.refresh()
+            if self.needs_compaction():
+                self.compact()
+
+    def compact(self) -> None:
+        with self._lock:
+            self.refresh()
+            old_log = _log_path(self.cache_dir, self.generation)
+            # Create the next log before the snapshot names it, so lock-free
+            # appends always find the current generation's log.
+            _log_path(self.cache_dir, self.generation + 1).touch()
+            snapshot = {"version": CACHE_VERSION, "log": self.generation + 1, "entries": self.entries}
+            _write_text_atomic(
+                _index_path(self.cache_dir),
+                json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")),
+                binary=True,
+            )
+            with contextlib.suppress(FileNotFoundError):
+                old_log.unlink()
+            self._snapshot_id = None
+            self.refresh()
+
+
+# (cache dir, key) -> result of the model call currently filling that key
+_INFLIGHT: dict[tuple[str, str], Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+_STORES: dict[str, _IndexStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _index_store(cache_dir: Path) -> _IndexStore:
+    key = os.path.abspath(cache_dir)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = _IndexStore(cache_dir)
+        return store
+
+
+def _stat_id(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
         return None
-    return entry
+    return st.st_ino, st.st_mtime_ns, st.st_size
 
 
-def _remove_entry(index: MutableMapping[str, Any], key: str, cache_dir: Path | None = None) -> None:
-    entries = index.get("entries")
-    if not isinstance(entries, dict):
-        return
-    entry = entries.pop(key, None)
-    if cache_dir is None or not entry:
-        return
-    filename = entry.get("filename")
-    if not filename:
-        return
-    with contextlib.suppress(FileNotFoundError):
-        (cache_dir / filename).unlink()
+def read_index(cache_dir: str | Path | None = None) -> dict[str, Any]:
+    """Current index (snapshot plus log) for ``cache_dir`` as ``{"version", "entries"}``."""
+    store = _IndexStore(Path(cache_dir) if cache_dir is not None else _cache_dir())
+    store.refresh()
+    return {"version": CACHE_VERSION, "entries": store.entries}
 
 
-def _touch_entry(entry: MutableMapping[str, Any]) -> None:
+def _create_entry(inputs: CacheInputs, blob: str, size: int, raw_size: int) -> dict[str, Any]:
     now = _now()
-    entry["last_hit_at"] = now
-    entry["hits"] = int(entry.get("hits", 0)) + 1
-
-
-def _create_entry(inputs: CacheInputs, path: Path) -> dict[str, Any]:
-    now = _now()
-    size = path.stat().st_size if path.exists() else 0
     return {
-        "filename": path.name,
+        "blob": blob,
         "model": inputs.model,
         "created_at": now,
         "last_hit_at": now,
         "hits": 1,
         "size": size,
+        "raw_size": raw_size,
     }
 
 
-def _enforce_limits(cache_dir: Path, index: MutableMapping[str, Any]) -> None:
-    entries = index.get("entries")
-    if not isinstance(entries, dict):
-        return
+def _enforce_limits(cache_dir: Path, store: _IndexStore) -> None:
+    """Evict least recently used entries until unique payload bytes fit the cap."""
     max_bytes = _max_bytes()
     if max_bytes <= 0:
         return
-    def _entry_size(item: tuple[str, Mapping[str, Any]]) -> int:
-        return int(item[1].get("size") or 0)
-
-    total = sum(_entry_size(item) for item in entries.items())
-    if total <= max_bytes:
-        return
-    sorted_items = sorted(
-        entries.items(),
-        key=lambda kv: (
-            kv[1].get("last_hit_at") or kv[1].get("created_at") or "",
-            kv[0],
-        ),
-    )
-    for key, entry in sorted_items:
-        size = int(entry.get("size") or 0)
-        _remove_entry(index, key, cache_dir)
-        total -= size
-        if total <= max_bytes:
+    while store.total_bytes > max_bytes:
+        key = store.least_recent()
+        if key is None:
             break
+        store.remove(key)
+
+
+def _last_used(entry: Mapping[str, Any]) -> str:
+    value = entry.get("last_hit_at") or entry.get("created_at") or ""
+    return value if isinstance(value, str) else ""
+
+
+# ---------------------------------------------------------------------------
+# Payload storage
+#
+# Completions are stored zlib-compressed under ``blobs/<xx>/<sha256>.z``,
+# addressed by the hash of the text, so identical outputs for different
+# requests share one file.  Entries written by older versions point at a
+# ``<key>.txt`` file via ``filename`` and are still read.
+
+
+def _blob_path(cache_dir: Path, blob: str) -> Path:
+    return cache_dir / _BLOB_DIRNAME / blob[:2] / f"{blob}{_BLOB_SUFFIX}"
+
+
+def _payload_id(entry: Mapping[str, Any]) -> str | None:
+    blob = entry.get("blob")
+    if blob:
+        return str(blob)
+    filename = entry.get("filename")
+    return f"file:{filename}" if filename else None
+
+
+def _payload_path(cache_dir: Path, entry: Mapping[str, Any]) -> Path:
+    blob = entry.get("blob")
+    if blob:
+        return _blob_path(cache_dir, str(blob))
+    return cache_dir / str(entry.get("filename"))
+
+
+def _read_payload(cache_dir: Path, entry: Mapping[str, Any]) -> str | None:
+    """Text for ``entry``; ``None`` if it has no payload or the blob is corrupt."""
+    if _payload_id(entry) is None:
+        return None
+    path = _payload_path(cache_dir, entry)
+    if not entry.get("blob"):
+        return path.read_text(encoding="utf-8")
+    try:
+        return zlib.decompress(path.read_bytes()).decode("utf-8")
+    except (zlib.error, UnicodeDecodeError):
+        return None
+
+
+def _write_blob(cache_dir: Path, text: str) -> tuple[str, int, int]:
+    """Store ``text`` unless an identical blob exists; returns ``(blob id, compressed size, raw size)``."""
+    raw = text.encode("utf-8")
+    blob = hashlib.sha256(raw).hexdigest()
+    path = _blob_path(cache_dir, blob)
+    with contextlib.suppress(FileNotFoundError):
+        return blob, path.stat().st_size, len(raw)
+    data = zlib.compress(raw, _COMPRESS_LEVEL)
+    _write_text_atomic(path, data, binary=True)
+    return blob, len(data), len(raw)
 
 
 # ---------------------------------------------------------------------------
@@ -332,6 +667,13 @@ def _refresh_requested() -> bool:
     return os.environ.get("GRIMBRAIN_AI_REFRESH_CACHE") == "1"
 
 
+def _max_workers() -> int:
+    try:
+        return max(1, int(os.environ.get("GRIMBRAIN_AI_CACHE_WORKERS", "4")))
+    except (TypeError, ValueError):
+        return 4
+
+
 def _max_bytes() -> int:
     try:
         return int(os.environ.get("GRIMBRAIN_AI_CACHE_MAX_BYTES", "0"))
@@ -33,6 +33,7 @@ Commands:
   content    Helpers for managing local content caches.
   validate   Validate player character or campaign data.
   character  Character creation and management tools.
+  serve      Keep a campaign session in memory and take commands over JSON-RPC.
 """
 
 app = typer.Typer(no_args_is_help=True)
@@ -104,6 +105,10 @@ def run_cli(argv: List[str] | None = None) -> int:
     if command == "play":
         typer.echo("play command not implemented", err=True)
         return 1
+    if command == "serve":
+        from grimbrain.scripts.campaign_session import _main as serve_main
+
+        return serve_main(args)
 
     typer.echo(f"Unknown command: {command}", err=True)
     return 1
@@ -147,5 +152,20 @@ def content(
         typer.echo("Rebuilt content/rules indexes (stub)")
 
 
+@app.command()
+def serve(
+    socket: Path | None = typer.Option(
+        None, "--socket", help="Unix socket path (default: JSON-RPC on stdin/stdout)"
+    ),
+    autosave: float | None = typer.Option(
+        None, "--autosave", help="Seconds between writes of changed campaign states"
+    ),
+) -> None:
+    """Keep a campaign session in memory and take commands over JSON-RPC."""
+    from grimbrain.scripts.campaign_session import serve as run_session
+
+    raise typer.Exit(run_session(str(socket) if socket else None, autosave))
+
+
 if __name__ == "__main__":
     raise SystemExit(run_cli())
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import threading
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, Sequence
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from grimbrain.config import flag
+
+CATALOG_VERSION = 1
 
 
 def _actions_len(data: dict) -> int:
@@ -16,7 +24,176 @@ def _actions_len(data: dict) -> int:
     return total
 
 
-def load_packs(names: Sequence[str], root: str | Path | None = None) -> Dict[str, dict]:
+# ---------------------------------------------------------------------------
+# Per-pack catalog cache
+#
+# Each pack directory gets two files under the cache dir (``GB_PACK_CACHE_DIR``,
+# default ``~/.cache/grimbrain/packs``):
+#
+# * ``<id>.names.json`` — the directory signature (dir mtime plus name, size and
+#   mtime of every ``*.json``) and the deduplicated ``(name, source)`` entries
+#   with their precomputed action lengths.
+# * ``<id>.data.json`` — the merged ``key -> monster data`` map, only read
+#   when a monster from that pack is actually looked up.
+#
+# ``GB_PACK_CACHE=0`` disables the on-disk cache.
+# ---------------------------------------------------------------------------
+
+def _cache_enabled() -> bool:
+    return flag("GB_PACK_CACHE", True)
+
+
+def _cache_dir() -> Path:
+    env = os.getenv("GB_PACK_CACHE_DIR")
+    return Path(env) if env else Path.home() / ".cache" / "grimbrain" / "packs"
+
+
+def _dir_signature(pack_dir: Path) -> Tuple[list, List[Path]]:
+    files = list(pack_dir.glob("*.json"))
+    stats = []
+    for path in files:
+        st = path.stat()
+        stats.append([path.name, st.st_size, st.st_mtime_ns])
+    return [pack_dir.stat().st_mtime_ns, sorted(stats)], files
+
+
+def _entry_key(name_lower: str, source: str) -> str:
+    return f"{name_lower}\x00{source}"
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) and data.get("version") == CATALOG_VERSION else None
+
+
+class _PackCache:
+    """Name index for one pack directory, with lazily loaded monster data."""
+
+    def __init__(self, pack_dir: Path) -> None:
+        self.pack_dir = pack_dir
+        digest = hashlib.sha1(str(pack_dir.resolve()).encode("utf-8")).hexdigest()[:16]
+        base = _cache_dir() / f"{pack_dir.name}-{digest}"
+        self.names_path = base.with_name(base.name + ".names.json")
+        self.data_path = base.with_name(base.name + ".data.json")
+        self.signature: Optional[list] = None
+        # [name_lower, source, actions_len] in first-seen order, deduplicated
+        self.entries: List[list] = []
+        self._data: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Make the name index match the directory, rebuilding if it changed."""
+        signature, files = _dir_signature(self.pack_dir)
+        if signature == self.signature:
+            return
+        if _cache_enabled():
+            cached = _read_json(self.names_path)
+            if cached and cached.get("signature") == signature:
+                with self._lock:
+                    self.signature, self.entries, self._data = signature, cached["entries"], None
+                return
+        self._rebuild(signature, files)
+
+    def _rebuild(self, signature: list, files: List[Path]) -> None:
+        merged: Dict[str, dict] = {}
+        lengths: Dict[str, int] = {}
+        order: List[Tuple[str, str, str]] = []
+        for path in files:
+            try:
+                data = json.loads(path.read_text())
+            except Exception:
+                continue
+            name = data.get("name")
+            source = data.get("source", "")
+            if not name:
+                continue
+            key = _entry_key(name.lower(), source)
+            n = _actions_len(data)
+            if key not in merged:
+                order.append((key, name.lower(), source))
+            elif n <= lengths[key]:
+                continue
+            merged[key], lengths[key] = data, n
+        entries = [[name_lower, source, lengths[key]] for key, name_lower, source in order]
+        with self._lock:
+            self.signature, self.entries, self._data = signature, entries, merged
+        if not _cache_enabled():
+            return
+        try:
+            self.names_path.parent.mkdir(parents=True, exist_ok=True)
+            # Data first: a names file with a matching signature implies the
+            # data file next to it is complete.
+            _write_json(self.data_path, {"version": CATALOG_VERSION, "signature": signature, "data": merged})
+            _write_json(self.names_path, {"version": CATALOG_VERSION, "signature": signature, "entries": entries})
+        except OSError:
+            pass
+
+    def data(self) -> Dict[str, dict]:
+        with self._lock:
+            if self._data is not None:
+                return self._data
+            signature = self.signature
+        cached = _read_json(self.data_path)
+        if cached and cached.get("signature") == signature:
+            with self._lock:
+                self._data = cached["data"]
+                return self._data
+        # Data file missing or stale: rebuild from the pack's JSON files.
+        self._rebuild(*_dir_signature(self.pack_dir))
+        with self._lock:
+            return self._data or {}
+
+
+_PACKS: Dict[str, _PackCache] = {}
+_PACKS_LOCK = threading.Lock()
+
+
+def _pack_cache(pack_dir: Path) -> _PackCache:
+    key = os.path.abspath(pack_dir)
+    with _PACKS_LOCK:
+        cache = _PACKS.get(key)
+        if cache is None:
+            cache = _PACKS[key] = _PackCache(pack_dir)
+    cache.refresh()
+    return cache
+
+
+def reset_pack_cache() -> None:
+    """Forget in-process pack indexes (on-disk catalogs are kept)."""
+    with _PACKS_LOCK:
+        _PACKS.clear()
+
+
+class PackCatalog(Mapping):
+    """Read-only ``name -> monster data`` mapping; data is loaded on access."""
+
+    def __init__(self, refs: Dict[str, Tuple[_PackCache, str]]) -> None:
+        self._refs = refs
+
+    def __getitem__(self, name: str) -> dict:
+        pack, key = self._refs[name]
+        return pack.data()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._refs)
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def __repr__(self) -> str:
+        return f"PackCatalog({len(self)} monsters)"
+
+
+def load_packs(names: Sequence[str], root: str | Path | None = None) -> PackCatalog:
     """Load JSON sidecars from pack directories.
 
     ``names`` may be a list of pack names (looked up under ``root/packs``)
@@ -25,25 +202,22 @@ def load_packs(names: Sequence[str], root: str | Path | None = None) -> Dict[str
     this file). Returns a catalog mapping normalized monster names to their
     JSON data. When multiple files share the same (name, source) pair, the
     entry with longer total action text is kept.
+
+    Each pack's name index is cached on disk keyed by the directory's file
+    stat signature, so unchanged packs are not re-read; a monster's full data
+    is loaded the first time it is accessed.
     """
 
     root_path = Path(root) if root else Path(__file__).resolve().parent.parent
-    catalog: Dict[tuple[str, str], dict] = {}
+    catalog: Dict[tuple[str, str], Tuple[int, _PackCache, str]] = {}
 
     def _load_dir(pack_dir: Path) -> None:
-        for path in pack_dir.glob("*.json"):
-            try:
-                data = json.loads(path.read_text())
-            except Exception:
-                continue
-            name = data.get("name")
-            source = data.get("source", "")
-            if not name:
-                continue
-            key = (name.lower(), source)
+        pack = _pack_cache(pack_dir)
+        for name_lower, source, n in pack.entries:
+            key = (name_lower, source)
             existing = catalog.get(key)
-            if existing is None or _actions_len(data) > _actions_len(existing):
-                catalog[key] = data
+            if existing is None or n > existing[0]:
+                catalog[key] = (n, pack, _entry_key(name_lower, source))
 
     for pack in names:
         pack_path = Path(pack)
@@ -64,7 +238,7 @@ def load_packs(names: Sequence[str], root: str | Path | None = None) -> Dict[str
         if pack_dir.exists():
             _load_dir(pack_dir)
 
-    by_name: Dict[str, dict] = {}
-    for (_name, _src), data in catalog.items():
-        by_name[data["name"].lower()] = data
-    return by_name
+    by_name: Dict[str, Tuple[_PackCache, str]] = {}
+    for (name_lower, _src), (_n, pack, key) in catalog.items():
+        by_name[name_lower] = (pack, key)
+    return PackCatalog(by_name)
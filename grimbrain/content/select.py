@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import bisect
 import json
+import os
 import random
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 # Root directory containing monster packs. Tests may monkeypatch this.
 PACK_ROOT = Path(__file__).resolve().parents[2] / "packs"
 
+QUERY_MEMO_SIZE = 256
+
 
 def _parse_cr(value: str | float | int | None) -> float | None:
     if value is None:
@@ -22,11 +28,50 @@ def _parse_cr(value: str | float | int | None) -> float | None:
             return None
 
 
-def _build_index(root: Path) -> List[dict]:
+def _scan(root: Path) -> Tuple[List[Path], List[Path]]:
+    """Pack files and directories under ``root`` (``root`` itself always included)."""
+    files: List[Path] = []
+    dirs: List[Path] = [root]
+    if root.is_dir():
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            if dirpath != str(root):
+                dirs.append(Path(dirpath))
+            files.extend(Path(dirpath) / name for name in sorted(filenames) if name.endswith(".json"))
+    return files, dirs
+
+
+def _pack_files(root: Path) -> List[Path]:
+    return _scan(root)[0]
+
+
+def _dir_signature(dirs: List[Path]) -> List[Optional[int]]:
+    """Directory mtimes: they change whenever a pack file is added, removed or replaced."""
+    sig: List[Optional[int]] = []
+    for path in dirs:
+        try:
+            sig.append(path.stat().st_mtime_ns)
+        except OSError:
+            sig.append(None)
+    return sig
+
+
+def _file_signature(files: List[Path]) -> List[Optional[Tuple[int, int]]]:
+    """Per-file (size, mtime_ns): catches pack files edited in place."""
+    sig: List[Optional[Tuple[int, int]]] = []
+    for path in files:
+        try:
+            st = path.stat()
+        except OSError:
+            sig.append(None)
+            continue
+        sig.append((st.st_size, st.st_mtime_ns))
+    return sig
+
+
+def _build_index(root: Path, files: Optional[List[Path]] = None) -> List[dict]:
     entries: List[dict] = []
-    if not root.exists():
-        return entries
-    for path in root.rglob("*.json"):
+    for path in _pack_files(root) if files is None else files:
         try:
             data = json.loads(path.read_text())
         except Exception:
@@ -40,6 +85,111 @@ def _build_index(root: Path) -> List[dict]:
     return entries
 
 
+class MonsterCatalog:
+    """Monsters from pack files indexed by CR and tag.
+
+    Entries are numbered in name order, so a sorted id set is already the
+    sorted candidate list the seeded choice expects.
+    """
+
+    def __init__(self, entries: List[dict]) -> None:
+        entries = sorted(entries, key=lambda e: e["name"])
+        self.names = [e["name"] for e in entries]
+        self.names_lower = [n.lower() for n in self.names]
+        self.all_ids = frozenset(range(len(entries)))
+        by_cr = sorted((e["cr"], i) for i, e in enumerate(entries) if e["cr"] is not None)
+        self.crs = [c for c, _ in by_cr]
+        self.cr_ids = [i for _, i in by_cr]
+        self.tags: Dict[str, Set[int]] = {}
+        for i, e in enumerate(entries):
+            for tag in e["tags"]:
+                self.tags.setdefault(tag, set()).add(i)
+        self._memo: "OrderedDict[tuple, Tuple[str, ...]]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+    def _cr_ids(self, lo: float, hi: float) -> Set[int]:
+        start = bisect.bisect_left(self.crs, lo)
+        end = bisect.bisect_right(self.crs, hi)
+        return set(self.cr_ids[start:end])
+
+    def _cr_filter(self, cr: str) -> Optional[Set[int]]:
+        """Ids matching ``cr`` ("2", "1-3"); ``None`` if it cannot be parsed."""
+        try:
+            if "-" in cr:
+                lo, hi = cr.split("-", 1)
+                return self._cr_ids(float(lo), float(hi))
+            target = float(cr)
+        except ValueError:
+            return None
+        return self._cr_ids(target, target)
+
+    def candidates(
+        self, tags: list[str] | None = None, cr: str | None = None, exclude: Set[str] | None = None
+    ) -> List[str]:
+        """Sorted names matching every tag and the CR filter, minus ``exclude`` (a fresh list)."""
+        key = (
+            tuple(sorted({t.lower() for t in tags})) if tags else (),
+            cr or "",
+            frozenset(e.lower() for e in (exclude or set())),
+        )
+        with self._memo_lock:
+            hit = self._memo.get(key)
+            if hit is not None:
+                self._memo.move_to_end(key)
+                return list(hit)
+
+        tag_keys, cr_key, exclude_l = key
+        postings = [self.tags.get(t, set()) for t in tag_keys]
+        if cr_key:
+            cr_ids = self._cr_filter(cr_key)
+            if cr_ids is not None:
+                postings.append(cr_ids)
+        ids = set.intersection(*sorted(postings, key=len)) if postings else self.all_ids
+        out = tuple(self.names[i] for i in sorted(ids) if self.names_lower[i] not in exclude_l)
+
+        with self._memo_lock:
+            self._memo[key] = out
+            if len(self._memo) > QUERY_MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return list(out)
+
+
+_CATALOGS: Dict[str, Tuple[List[Path], list, List[Path], list, MonsterCatalog]] = {}
+_CATALOGS_LOCK = threading.Lock()
+
+
+def monster_catalog(root: Path | None = None) -> MonsterCatalog:
+    """Cached catalog for ``root`` (default :data:`PACK_ROOT`).
+
+    A call stats the pack directories and files seen when the catalog was
+    built, without walking the tree.  A changed directory mtime (a file added,
+    removed or replaced) triggers a rescan; a changed file (size, mtime_ns),
+    e.g. an in-place edit, rebuilds the catalog from the known files.
+    """
+    root = Path(root or PACK_ROOT)
+    key = os.path.abspath(root)
+    with _CATALOGS_LOCK:
+        cached = _CATALOGS.get(key)
+    if cached is not None and _dir_signature(cached[0]) == cached[1]:
+        dirs, dir_sig, files = cached[0], cached[1], cached[2]
+        file_sig = _file_signature(files)
+        if file_sig == cached[3]:
+            return cached[4]
+    else:
+        files, dirs = _scan(root)
+        dir_sig = _dir_signature(dirs)
+        file_sig = _file_signature(files)
+    catalog = MonsterCatalog(_build_index(root, files))
+    with _CATALOGS_LOCK:
+        _CATALOGS[key] = (dirs, dir_sig, files, file_sig, catalog)
+    return catalog
+
+
+def reset_catalog() -> None:
+    with _CATALOGS_LOCK:
+        _CATALOGS.clear()
+
+
 def select_monster(
     tags: list[str] | None = None,
     cr: str | None = None,
@@ -48,37 +198,8 @@ def select_monster(
 ) -> str:
     """Pick a monster from local packs deterministically by seed."""
 
-    exclude_l = {e.lower() for e in (exclude or set())}
-    index = _build_index(PACK_ROOT)
-
-    candidates = []
-    for entry in index:
-        if entry["name"].lower() in exclude_l:
-            continue
-        if tags and not set(t.lower() for t in tags).issubset(entry["tags"]):
-            continue
-        if cr:
-            if "-" in cr:
-                lo, hi = cr.split("-", 1)
-                try:
-                    lo_f = float(lo)
-                    hi_f = float(hi)
-                    c = entry["cr"]
-                    if c is None or not (lo_f <= c <= hi_f):
-                        continue
-                except ValueError:
-                    pass
-            else:
-                try:
-                    target = float(cr)
-                    if entry["cr"] != target:
-                        continue
-                except ValueError:
-                    pass
-        candidates.append(entry["name"])
-
+    candidates = monster_catalog(PACK_ROOT).candidates(tags, cr, exclude)
     if not candidates:
         raise ValueError("No monsters match criteria")
     rng = random.Random(seed)
-    candidates.sort()
     return rng.choice(candidates)
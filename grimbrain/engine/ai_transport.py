@@ -0,0 +1,378 @@
+"""
+ai_transport.py — pooled keep-alive HTTP transport for AI narration.
+
+``HTTPTransport`` keeps a small pool of persistent ``http.client``
+connections per endpoint, so the TCP/TLS handshake is paid once per session
+rather than once per narration line.  Failed requests (connection errors,
+429 and 5xx responses) are retried with jittered exponential backoff.
+
+``StubServer`` is a local fake of the Responses endpoint for tests and
+offline benchmarks::
+
+    python -m grimbrain.engine.ai_transport bench --requests 200
+
+Environment:
+  GB_AI_BASE_URL=url    endpoint root (default https://api.openai.com)
+  GB_AI_TIMEOUT=secs    per-request timeout (default 15)
+  GB_AI_RETRIES=N       retries after the first attempt (default 2)
+  GB_AI_POOL_SIZE=N     idle connections kept per endpoint (default 4)
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Mapping, Optional, Protocol
+from urllib.parse import urlsplit
+
+DEFAULT_BASE_URL = "https://api.openai.com"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# How a reused keep-alive connection fails when the server has closed it.
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class TransportError(Exception):
+    """A request failed after all retries; ``status`` is set for HTTP errors."""
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        reason: str = "",
+        retry_after: Optional[str] = None,
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Transport(Protocol):
+    def post_json(self, path: str, body: Mapping[str, Any], headers: Mapping[str, str]) -> Dict[str, Any]:
+        ...
+
+
+class HTTPTransport:
+    """JSON-over-HTTP(S) with pooled keep-alive connections and retries."""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        *,
+        timeout: float = 15.0,
+        retries: int = 2,
+        backoff: float = 0.25,
+        max_backoff: float = 4.0,
+        pool_size: int = 4,
+    ) -> None:
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported AI endpoint: {base_url!r}")
+        self.base_url = base_url.rstrip("/")
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = max(1, pool_size)
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    # -- connection pool ----------------------------------------------------
+
+    def _acquire(self, fresh: bool = False) -> tuple[http.client.HTTPConnection, bool]:
+        """A connection and whether it was reused from the pool."""
+        with self._lock:
+            if self._idle and not fresh:
+                return self._idle.pop(), True
+            self.connections_opened += 1
+        cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return cls(self._host, self._port, timeout=self.timeout), False
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    # -- requests -------------------------------------------------------------
+
+    def _sleep_before_retry(self, attempt: int, retry_after: Optional[str] = None) -> None:
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        delay *= random.uniform(0.5, 1.5)
+        if retry_after:
+            try:
+                delay = max(delay, min(self.max_backoff, float(retry_after)))
+            except ValueError:
+                pass
+        time.sleep(delay)
+
+    def post_json(self, path: str, body: Mapping[str, Any], headers: Mapping[str, str]) -> Dict[str, Any]:
+        payload = json.dumps(body).encode("utf-8")
+        req_headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        req_headers.update(headers)
+        url = f"{self._prefix}{path}"
+        last: Optional[TransportError] = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._sleep_before_retry(attempt - 1, last.retry_after if last else None)
+            try:
+                resp, data = self._send(url, payload, req_headers)
+            except (OSError, http.client.HTTPException) as e:
+                last = TransportError(f"{type(e).__name__}: {e}")
+                continue
+            if resp.status >= 400:
+                last = TransportError(
+                    f"HTTP {resp.status}",
+                    status=resp.status,
+                    reason=resp.reason,
+                    retry_after=resp.getheader("Retry-After"),
+                )
+                if resp.status in RETRY_STATUSES:
+                    continue
+                raise last
+            try:
+                return json.loads(data.decode("utf-8"))
+            except ValueError as e:
+                raise TransportError(f"Invalid JSON response: {e}") from e
+        assert last is not None
+        raise last
+
+    def _send(self, url: str, payload: bytes, headers: Mapping[str, str]):
+        conn, reused = self._acquire()
+        while True:
+            resp = None
+            try:
+                conn.request("POST", url, body=payload, headers=dict(headers))
+                resp = conn.getresponse()
+                data = resp.read()  # drain fully so the connection can be reused
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused or resp is not None:
+                    raise
+                # The server dropped an idle keep-alive connection before
+                # answering; that is not a failed attempt, so retry at once on
+                # a new one.  Timeouts and anything after a response started
+                # count as attempts: the request may already be in progress.
+                conn, reused = self._acquire(fresh=True)
+                continue
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return resp, data
+
+
+_DEFAULT: Dict[str, HTTPTransport] = {}
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_transport() -> HTTPTransport:
+    """Process-wide transport for ``GB_AI_BASE_URL``, shared by all narrators."""
+    base_url = os.getenv("GB_AI_BASE_URL") or DEFAULT_BASE_URL
+    with _DEFAULT_LOCK:
+        transport = _DEFAULT.get(base_url)
+        if transport is None:
+            transport = _DEFAULT[base_url] = HTTPTransport(
+                base_url,
+                timeout=_env_float("GB_AI_TIMEOUT", 15.0),
+                retries=_env_int("GB_AI_RETRIES", 2),
+                pool_size=_env_int("GB_AI_POOL_SIZE", 4),
+            )
+        return transport
+
+
+def reset_default_transport() -> None:
+    with _DEFAULT_LOCK:
+        transports = list(_DEFAULT.values())
+        _DEFAULT.clear()
+    for transport in transports:
+        transport.close()
+
+
+# ---------------------------------------------------------------------------
+# Local stub endpoint
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Send headers and body in one segment; otherwise Nagle plus delayed ACK
+    # adds ~40ms per response and swamps what the benchmark measures.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:  # type: ignore[attr-defined]
+            self.server.connections += 1  # type: ignore[attr-defined]
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server API
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        with server.lock:  # type: ignore[attr-defined]
+            server.requests.append(body)  # type: ignore[attr-defined]
+            fail = server.fail_next.pop(0) if server.fail_next else None  # type: ignore[attr-defined]
+        if server.latency:  # type: ignore[attr-defined]
+            time.sleep(server.latency)  # type: ignore[attr-defined]
+        if fail:
+            payload = json.dumps({"error": {"message": "stub failure"}}).encode("utf-8")
+            self.send_response(fail)
+        else:
+            prompt = ""
+            for message in body.get("input") or []:
+                if isinstance(message, dict) and message.get("role") == "user":
+                    prompt = str(message.get("content", ""))
+            text = server.reply(prompt)  # type: ignore[attr-defined]
+            payload = json.dumps(
+                {
+                    "output": [{"content": [{"type": "output_text", "text": text}]}],
+                    "usage": {"output_tokens": len(text.split())},
+                }
+            ).encode("utf-8")
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # silence request logs
+        pass
+
+
+class StubServer:
+    """Fake Responses API on ``127.0.0.1`` for tests and offline benchmarks.
+
+    ``fail_next`` is a list of HTTP statuses returned (and consumed) before
+    normal replies; ``latency`` adds a fixed delay per request.
+    """
+
+    def __init__(self, reply=None, latency: float = 0.0) -> None:
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.lock = threading.Lock()
+        self._httpd.connections = 0
+        self._httpd.requests = []
+        self._httpd.fail_next = []
+        self._httpd.latency = latency
+        self._httpd.reply = reply or (lambda prompt: f"The narrator says: {prompt}")
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self) -> int:
+        return self._httpd.connections
+
+    @property
+    def requests(self) -> List[dict]:
+        return self._httpd.requests
+
+    @property
+    def fail_next(self) -> List[int]:
+        return self._httpd.fail_next
+
+    @property
+    def latency(self) -> float:
+        return self._httpd.latency
+
+    @latency.setter
+    def latency(self, value: float) -> None:
+        self._httpd.latency = value
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def bench(requests: int = 100, latency: float = 0.0) -> Dict[str, float]:
+    """Time ``requests`` sequential calls against a local stub."""
+    with StubServer(latency=latency) as server:
+        transport = HTTPTransport(server.url, retries=0)
+        body = {"model": "stub", "input": [{"role": "user", "content": "bench"}]}
+        start = time.perf_counter()
+        for _ in range(requests):
+            transport.post_json("/v1/responses", body, {})
+        elapsed = time.perf_counter() - start
+        transport.close()
+        return {
+            "requests": requests,
+            "seconds": round(elapsed, 4),
+            "ms_per_request": round(elapsed * 1000 / max(1, requests), 3),
+            "connections": server.connections,
+        }
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m grimbrain.engine.ai_transport")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    serve = sub.add_parser("serve", help="Run the stub endpoint until interrupted")
+    serve.add_argument("--latency", type=float, default=0.0)
+    b = sub.add_parser("bench", help="Benchmark the transport against the stub")
+    b.add_argument("--requests", type=int, default=100)
+    b.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    if args.cmd == "bench":
+        print(json.dumps(bench(args.requests, args.latency)))
+        return 0
+    server = StubServer(latency=args.latency).start()
+    print(f"Stub AI endpoint at {server.url} (set GB_AI_BASE_URL to use it)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(_main())
@@ -1,26 +1,83 @@
 from __future__ import annotations
+import copy
 import json
+import os
+import re
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from .types import Combatant
 from ..character import Character
 
 MONSTER_DIR = Path(__file__).resolve().parents[2] / "data" / "monsters"
 
+_SPEC_RE = re.compile(r"(.+) x(\d+)")
 
-def _load_monster_blob(name: str) -> dict:
-    base = name.lower().replace(" ", "_")
-    candidates = [f"{base}.json", f"{name}.json", f"{base}.yaml", f"{base}.yml"]
-    for fn in candidates:
-        path = MONSTER_DIR / fn
-        if path.exists():
+
+class _BestiaryCatalog:
+    """Directory listing and parsed blobs for one monster directory."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.dir_mtime: Optional[int] = None
+        self.files: Set[str] = set()
+        self.blobs: Dict[str, Tuple[int, dict]] = {}
+        self.lock = threading.Lock()
+
+    def _refresh_listing(self) -> None:
+        try:
+            mtime = self.root.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self.dir_mtime:
+            self.files = {p.name for p in self.root.iterdir()} if mtime is not None else set()
+            self.dir_mtime = mtime
+
+    def blob(self, name: str) -> dict:
+        """Parsed blob for ``name``; shared, so callers must not mutate it."""
+        base = name.lower().replace(" ", "_")
+        candidates = [f"{base}.json", f"{name}.json", f"{base}.yaml", f"{base}.yml"]
+        with self.lock:
+            self._refresh_listing()
+            fn = next((c for c in candidates if c in self.files), None)
+            if fn is None:
+                raise FileNotFoundError(f"Monster not found: {name}")
+            path = self.root / fn
+            mtime = path.stat().st_mtime_ns
+            cached = self.blobs.get(fn)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
             if path.suffix == ".json":
-                return json.loads(path.read_text())
+                blob = json.loads(path.read_text())
             else:
                 import yaml
-                return yaml.safe_load(path.read_text())
-    raise FileNotFoundError(f"Monster not found: {name}")
+                blob = yaml.safe_load(path.read_text())
+            self.blobs[fn] = (mtime, blob)
+            return blob
+
+
+_CATALOGS: Dict[str, _BestiaryCatalog] = {}
+_CATALOGS_LOCK = threading.Lock()
+
+
+def _catalog() -> _BestiaryCatalog:
+    # Keyed by path so tests that point MONSTER_DIR elsewhere get their own.
+    key = os.path.abspath(MONSTER_DIR)
+    with _CATALOGS_LOCK:
+        cat = _CATALOGS.get(key)
+        if cat is None:
+            cat = _CATALOGS[key] = _BestiaryCatalog(Path(MONSTER_DIR))
+        return cat
+
+
+def reset_bestiary_cache() -> None:
+    with _CATALOGS_LOCK:
+        _CATALOGS.clear()
+
+
+def _load_monster_blob(name: str) -> dict:
+    return copy.deepcopy(_catalog().blob(name))
 
 
 def _score(mod: int) -> int:
@@ -28,7 +85,7 @@ def _score(mod: int) -> int:
 
 
 def make_combatant_from_monster(name: str, *, team: str, cid: Optional[str] = None) -> Combatant:
-    blob = _load_monster_blob(name)
+    blob = _catalog().blob(name)
     cid = cid or blob["name"][0].upper()
     actor = Character(
         str_score=_score(blob["str_mod"]),
@@ -67,6 +124,40 @@ def make_combatant_from_monster(name: str, *, team: str, cid: Optional[str] = No
 
 
 def weapon_names_for_monster(name: str) -> Tuple[Optional[str], Optional[str]]:
-    blob = _load_monster_blob(name)
+    blob = _catalog().blob(name)
     return blob.get("weapon_primary"), blob.get("weapon_offhand")
 
+
+def _expand_specs(spec_list: Iterable[str]) -> List[str]:
+    names: List[str] = []
+    for spec in spec_list:
+        text = str(spec).strip()
+        m = _SPEC_RE.match(text)
+        if m:
+            names.extend([m.group(1).strip()] * int(m.group(2)))
+        else:
+            names.append(text)
+    return names
+
+
+def make_combatants(
+    spec_list: Iterable[str], *, team: str = "B", id_prefix: str = "E", start: int = 1
+) -> List[Combatant]:
+    """Build combatants for specs like ``["Goblin x20", "Ogre"]``.
+
+    Each distinct monster is built once; further copies are clones of that
+    prototype.  Ids are ``f"{id_prefix}{n}"`` numbered from ``start`` across
+    the expanded list, matching the one-at-a-time encounter builders.
+    """
+    prototypes: Dict[str, Combatant] = {}
+    out: List[Combatant] = []
+    for idx, name in enumerate(_expand_specs(spec_list), start):
+        cid = f"{id_prefix}{idx}"
+        proto = prototypes.get(name)
+        if proto is None:
+            proto = prototypes[name] = make_combatant_from_monster(name, team=team)
+        cmb = copy.deepcopy(proto)
+        cmb.id = cid
+        out.append(cmb)
+    return out
+
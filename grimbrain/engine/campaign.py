@@ -9,6 +9,8 @@ import yaml
 from ..models import PC, MonsterSidecar
 from .combat import run_encounter as _run_encounter
 from .encounter import apply_difficulty
+from .journal_log import read_journal
+from ..io.campaign_store import discard_store, read_document
 from ..campaign import load_party_file
 from .types import Combatant
 
@@ -208,6 +210,9 @@ class CampaignState:
     short_rest_hours: int = 4
     long_rest_to_morning: bool = True
     journal: List[Dict[str, Any]] = field(default_factory=list)
+    # Journal directory holding entries already saved; ``journal`` then only
+    # holds entries logged since (see engine.journal_log).
+    journal_log: Optional[str] = None
     light_level: str = "normal"
     narrative_style: str = "classic"
 
@@ -229,8 +234,7 @@ class CampaignState:
 
 
 def load_campaign(path: str) -> CampaignState:
-    with open(path, "r", encoding="utf-8") as f:
-        raw = json.load(f)
+    raw = read_document(path)
 
     raw_current_hp = raw.get("current_hp", {})
     current_hp: Dict[str, int] = {}
@@ -287,7 +291,7 @@ def load_campaign(path: str) -> CampaignState:
         encounter_clock_step=raw.get("encounter_clock_step", 10),
         short_rest_hours=raw.get("short_rest_hours", 4),
         long_rest_to_morning=raw.get("long_rest_to_morning", True),
-        journal=raw.get("journal", []) or [],
+        journal=read_journal(path, raw),
         light_level=raw.get("light_level", "normal"),
         narrative_style=raw.get("narrative_style", "classic"),
     )
@@ -301,6 +305,7 @@ def save_campaign(state: CampaignState, path: str) -> None:
     blob = asdict(state)
     with open(path, "w", encoding="utf-8") as f:
         json.dump(blob, f, indent=2)
+    discard_store(path)
 
 
 def advance_time(state: CampaignState, hours: int = 4) -> None:
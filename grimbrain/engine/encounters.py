@@ -3,7 +3,7 @@ from __future__ import annotations
 import random
 from typing import Dict, List, Optional
 
-from .bestiary import make_combatant_from_monster, weapon_names_for_monster
+from .bestiary import make_combatants
 from .campaign import CampaignState, apply_combat_results, party_to_combatants
 from .loot import roll_loot
 from .progression import award_xp, maybe_level_up
@@ -28,15 +28,6 @@ def roll_overland_encounter(state: CampaignState, rng: random.Random) -> Optiona
     return None
 
 
-def _enemy_to_combatant(name: str, idx: int) -> Combatant:
-    cmb = make_combatant_from_monster(name, team="B", cid=f"E{idx}")
-    wp, off = weapon_names_for_monster(name)
-    if wp:
-        cmb.weapon = wp
-    cmb.offhand = off
-    return cmb
-
-
 def run_encounter(
     state: CampaignState, rng: random.Random, notes: List[str], force: bool = False
 ) -> Dict[str, object]:
@@ -45,11 +36,9 @@ def run_encounter(
     if not table:
         notes.append("No encounter.")
         return {"encounter": None}
-    enemies: List[Combatant] = []
-    for idx, ename in enumerate(table["enemies"], 1):
-        cmb = _enemy_to_combatant(ename, idx)
+    enemies: List[Combatant] = make_combatants(table["enemies"], team="B")
+    for cmb in enemies:
         cmb.environment_light = getattr(state, "light_level", "normal")
-        enemies.append(cmb)
     roster = list(allies_map.values()) + enemies
     res = run_skirmish(roster, seed=rng.randint(1, 999999))
     apply_combat_results(state, allies_map)
@@ -0,0 +1,305 @@
+"""
+journal_log.py — append-only, segmented campaign journal.
+
+The journal lives next to the campaign save in ``<save stem>.journal/`` as
+JSONL segments of at most ``GB_JOURNAL_SEGMENT`` entries.  ``index.json``
+records, per segment, its entry count and byte length plus the day range,
+kinds and locations it contains.  The save file itself only carries a
+pointer (``{"path": ..., "entries": N}``) and ``state.journal`` only holds
+entries logged since the last save, so saving appends a few lines and
+rewrites the small index no matter how long the campaign has run.
+
+Queries skip segments whose summary cannot match and page from the newest
+entry backwards, so ``journal --tail 10`` reads one segment.
+
+Environment:
+  GB_JOURNAL_SEGMENT=N  entries per segment file (default 500)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+JOURNAL_VERSION = 1
+INDEX_NAME = "index.json"
+DEFAULT_SEGMENT_SIZE = 500
+
+
+def _segment_size() -> int:
+    try:
+        return max(1, int(os.getenv("GB_JOURNAL_SEGMENT", str(DEFAULT_SEGMENT_SIZE))))
+    except ValueError:
+        return DEFAULT_SEGMENT_SIZE
+
+
+def _as_day(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _encode(entry: Dict[str, Any]) -> bytes:
+    return (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class JournalLog:
+    """Journal entries in segment files under ``root`` with a per-segment index."""
+
+    def __init__(self, root: str | Path, segment_size: Optional[int] = None) -> None:
+        self.root = Path(root)
+        self.segment_size = _segment_size() if segment_size is None else max(1, segment_size)
+        self._segments: List[Dict[str, Any]] = []
+        self._index_sig: Optional[List[int]] = None
+        self._lock = threading.Lock()
+
+    # -- index ----------------------------------------------------------------
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_NAME
+
+    def _refresh(self) -> None:
+        """Reload ``index.json`` if it changed on disk."""
+        try:
+            st = self.index_path.stat()
+        except OSError:
+            self._segments = []
+            self._index_sig = None
+            return
+        sig = [st.st_size, st.st_mtime_ns]
+        if sig == self._index_sig:
+            return
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        segments = data.get("segments") if isinstance(data, dict) else None
+        if not isinstance(segments, list) or data.get("version") != JOURNAL_VERSION:
+            segments = []
+        self._segments = segments
+        self._index_sig = sig
+
+    def _write_index(self) -> None:
+        tmp = self.index_path.with_name(f"{INDEX_NAME}.{os.getpid()}.tmp")
+        data = {"version": JOURNAL_VERSION, "segments": self._segments}
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+        st = self.index_path.stat()
+        self._index_sig = [st.st_size, st.st_mtime_ns]
+
+    # -- writing --------------------------------------------------------------
+
+    def append(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Append ``entries``; returns the total number of entries in the log."""
+        pending = [e for e in entries if isinstance(e, dict)]
+        with self._lock:
+            self._refresh()
+            if not pending:
+                return self._count()
+            self.root.mkdir(parents=True, exist_ok=True)
+            while pending:
+                if not self._segments or self._segments[-1]["count"] >= self.segment_size:
+                    self._segments.append(
+                        {
+                            "file": f"seg-{len(self._segments):05d}.jsonl",
+                            "count": 0,
+                            "bytes": 0,
+                            "day_min": None,
+                            "day_max": None,
+                            "kinds": [],
+                            "locs": [],
+                        }
+                    )
+                seg = self._segments[-1]
+                room = self.segment_size - seg["count"]
+                batch, pending = pending[:room], pending[room:]
+                self._write_segment(seg, batch)
+            self._write_index()
+            return self._count()
+
+    def _write_segment(self, seg: Dict[str, Any], batch: List[Dict[str, Any]]) -> None:
+        data = b"".join(_encode(e) for e in batch)
+        with (self.root / seg["file"]).open("ab") as fh:
+            if fh.tell() != seg["bytes"]:
+                # Lines past the indexed length come from an interrupted
+                # append that never reached the index; drop them.
+                fh.truncate(seg["bytes"])
+                fh.seek(seg["bytes"])
+            fh.write(data)
+        seg["count"] += len(batch)
+        seg["bytes"] += len(data)
+        kinds = set(seg["kinds"])
+        locs = set(seg["locs"])
+        for entry in batch:
+            kinds.add(str(entry.get("kind", "info")))
+            locs.add(str(entry.get("loc", "")))
+            day = _as_day(entry.get("day"))
+            if day is not None:
+                seg["day_min"] = day if seg["day_min"] is None else min(seg["day_min"], day)
+                seg["day_max"] = day if seg["day_max"] is None else max(seg["day_max"], day)
+        seg["kinds"] = sorted(kinds)
+        seg["locs"] = sorted(locs)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._refresh()
+            segments, self._segments = self._segments, []
+            if self.root.exists():
+                self._write_index()
+            for seg in segments:
+                (self.root / seg["file"]).unlink(missing_ok=True)
+
+    # -- reading --------------------------------------------------------------
+
+    def _count(self) -> int:
+        return sum(int(seg.get("count", 0)) for seg in self._segments)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self._count()
+
+    @staticmethod
+    def _segment_matches(
+        seg: Dict[str, Any], day: Optional[int], kind: Optional[str], loc: Optional[str]
+    ) -> bool:
+        if day is not None:
+            lo, hi = seg.get("day_min"), seg.get("day_max")
+            if lo is None or not lo <= day <= hi:
+                return False
+        if kind is not None and kind not in seg.get("kinds", ()):
+            return False
+        if loc is not None and loc not in {str(l).lower() for l in seg.get("locs", ())}:
+            return False
+        return True
+
+    def _read_segment(self, seg: Dict[str, Any]) -> List[Dict[str, Any]]:
+        try:
+            with (self.root / seg["file"]).open("rb") as fh:
+                data = fh.read(seg["bytes"])
+        except OSError:
+            return []
+        rows = []
+        for line in data.splitlines():
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(row, dict):
+                rows.append(row)
+        return rows
+
+    def entries(
+        self,
+        *,
+        day: Optional[int] = None,
+        kind: Optional[str] = None,
+        loc: Optional[str] = None,
+        grep: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Matching entries in log order (or newest first).
+
+        ``kind`` matches exactly, ``loc`` case-insensitively and ``grep`` is a
+        case-insensitive substring of the text.
+        """
+        with self._lock:
+            self._refresh()
+            segments = list(self._segments)
+        loc_key = loc.lower() if loc is not None else None
+        needle = grep.lower() if grep else None
+        if newest_first:
+            segments.reverse()
+        for seg in segments:
+            if not self._segment_matches(seg, day, kind, loc_key):
+                continue
+            rows = self._read_segment(seg)
+            if newest_first:
+                rows.reverse()
+            for row in rows:
+                if day is not None and _as_day(row.get("day")) != day:
+                    continue
+                if kind is not None and str(row.get("kind", "info")) != kind:
+                    continue
+                if loc_key is not None and str(row.get("loc", "")).lower() != loc_key:
+                    continue
+                if needle and needle not in str(row.get("text", "")).lower():
+                    continue
+                yield row
+
+    def page(
+        self, page: int = 1, per_page: int = 20, **filters: Any
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Page ``page`` (1 = most recent) of matching entries, oldest first.
+
+        Also returns whether older matching entries exist.
+        """
+        skip = max(0, page - 1) * per_page
+        picked: List[Dict[str, Any]] = []
+        more = False
+        for idx, row in enumerate(self.entries(newest_first=True, **filters)):
+            if idx < skip:
+                continue
+            if len(picked) == per_page:
+                more = True
+                break
+            picked.append(row)
+        picked.reverse()
+        return picked, more
+
+
+def journal_dir(save_path: str | Path) -> Path:
+    """Default journal directory for a campaign save."""
+    p = Path(save_path)
+    return p.with_name(f"{p.stem}.journal")
+
+
+def resolve_pointer(save_path: str | Path, pointer: Any) -> Optional[Path]:
+    """Journal directory named by a save's ``journal_log`` pointer, if any."""
+    if not isinstance(pointer, dict) or not pointer.get("path"):
+        return None
+    return Path(save_path).parent / str(pointer["path"])
+
+
+def flush_journal(state: Any, save_path: str | Path) -> Dict[str, Any]:
+    """Move ``state.journal`` into the log for ``save_path``; returns the pointer.
+
+    A state without ``journal_log`` carries its whole history inline (a legacy
+    save, or one loaded with :func:`read_journal`), so the log is rebuilt from
+    it rather than appended to.
+    """
+    save_path = Path(save_path)
+    pending = list(getattr(state, "journal", None) or [])
+    root = getattr(state, "journal_log", None)
+    log = JournalLog(root or journal_dir(save_path))
+    if root is None:
+        log.clear()
+    total = log.append(pending)
+    state.journal_log = str(log.root)
+    state.journal = []
+    rel = os.path.relpath(log.root, save_path.parent or Path("."))
+    return {"path": Path(rel).as_posix(), "entries": total}
+
+
+def read_journal(save_path: str | Path, raw: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Full history of a save document: the log named by its pointer, then inline entries."""
+    inline = raw.get("journal") or []
+    if not isinstance(inline, list):
+        inline = [inline]
+    root = resolve_pointer(save_path, raw.get("journal_log"))
+    logged = list(JournalLog(root).entries()) if root is not None else []
+    return logged + list(inline)
+
+
+__all__ = [
+    "JournalLog",
+    "flush_journal",
+    "journal_dir",
+    "read_journal",
+    "resolve_pointer",
+]
@@ -0,0 +1,206 @@
+"""
+narration_cache.py — indexed narration store on top of ``narration.jsonl``.
+
+The file format is unchanged (one ``{"key", "text"}`` object per line), but
+lookups no longer scan it: the first access builds a ``key -> (offset,
+length)`` index, later accesses only read lines appended since (e.g. by
+another process), and a hit reads a single line.  The last line for a key
+wins.
+
+When duplicate lines outnumber live keys, or the number of keys exceeds the
+cap, the file is compacted: rewritten atomically with one line per key,
+keeping the most recently used ``GB_NARRATION_CACHE_MAX`` keys.
+
+Environment:
+  GB_NARRATION_CACHE_MAX=N  keep at most N narration lines (default 5000, 0 = unbounded)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 5000
+# Compaction is skipped until at least this many lines are redundant.
+MIN_COMPACT_DEAD = 64
+
+
+def _max_entries() -> int:
+    try:
+        return max(0, int(os.getenv("GB_NARRATION_CACHE_MAX", str(DEFAULT_MAX_ENTRIES))))
+    except ValueError:
+        return DEFAULT_MAX_ENTRIES
+
+
+def _encode(key: str, text: str) -> bytes:
+    return (json.dumps({"key": key, "text": text}, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class NarrationStore:
+    """``key -> text`` over an append-only JSONL file with an in-memory index."""
+
+    def __init__(self, path: str | Path, max_entries: Optional[int] = None) -> None:
+        self.path = Path(path)
+        self.max_entries = _max_entries() if max_entries is None else max_entries
+        # key -> (offset, length); order is least to most recently used
+        self._index: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._scanned = 0
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._dead = 0
+        self._lock = threading.Lock()
+
+    # -- index maintenance -------------------------------------------------
+
+    def _reset(self) -> None:
+        self._index.clear()
+        self._scanned = 0
+        self._dead = 0
+
+    def _sync(self) -> None:
+        """Index lines appended since the last sync; restart if the file was replaced."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            self._reset()
+            self._file_id = None
+            return
+        file_id = (st.st_dev, st.st_ino)
+        if file_id != self._file_id or st.st_size < self._scanned:
+            self._reset()
+            self._file_id = file_id
+        if st.st_size == self._scanned:
+            return
+        with self.path.open("rb") as fh:
+            fh.seek(self._scanned)
+            offset = self._scanned
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break  # partial line still being written
+                length = len(line)
+                self._index_line(line, offset, length)
+                offset += length
+            self._scanned = offset
+
+    def _index_line(self, line: bytes, offset: int, length: int) -> None:
+        if not line.strip():
+            return
+        try:
+            key = json.loads(line).get("key")
+        except (ValueError, AttributeError):
+            self._dead += 1
+            return
+        if not isinstance(key, str):
+            self._dead += 1
+            return
+        if key in self._index:
+            self._dead += 1
+            self._index.move_to_end(key)
+        self._index[key] = (offset, length)
+
+    def _read(self, ref: Tuple[int, int]) -> Optional[str]:
+        offset, length = ref
+        try:
+            with self.path.open("rb") as fh:
+                fh.seek(offset)
+                row = json.loads(fh.read(length))
+        except (OSError, ValueError):
+            return None
+        return row.get("text", "") if isinstance(row, dict) else None
+
+    # -- public API ---------------------------------------------------------
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            self._sync()
+            ref = self._index.get(key)
+            if ref is None:
+                return None
+            text = self._read(ref)
+            if text is not None:
+                self._index.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str) -> None:
+        data = _encode(key, text)
+        with self._lock:
+            self._sync()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("ab") as fh:
+                offset = fh.tell()
+                fh.write(data)
+            if offset == self._scanned:
+                if key in self._index:
+                    self._dead += 1
+                    del self._index[key]
+                self._index[key] = (offset, len(data))
+                self._scanned = offset + len(data)
+            else:  # another writer got in between; pick our line up on sync
+                self._sync()
+            if self._needs_compaction():
+                self._compact()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._index)
+
+    def compact(self) -> None:
+        with self._lock:
+            self._sync()
+            self._compact()
+
+    def _needs_compaction(self) -> bool:
+        if self.max_entries and len(self._index) > self.max_entries:
+            return True
+        return self._dead >= MIN_COMPACT_DEAD and self._dead > len(self._index)
+
+    def _compact(self) -> None:
+        keep = list(self._index.items())
+        if self.max_entries:
+            keep = keep[-self.max_entries:]
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        index: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        try:
+            with self.path.open("rb") as src, tmp.open("wb") as dst:
+                offset = 0
+                for key, (off, length) in keep:
+                    src.seek(off)
+                    line = src.read(length)
+                    dst.write(line)
+                    index[key] = (offset, length)
+                    offset += length
+            os.replace(tmp, self.path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        st = self.path.stat()
+        self._index = index
+        self._scanned = offset
+        self._file_id = (st.st_dev, st.st_ino)
+        self._dead = 0
+
+
+_STORES: Dict[str, NarrationStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def narration_store(path: str | Path) -> NarrationStore:
+    """Process-wide store for ``path``."""
+    key = os.path.abspath(path)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = NarrationStore(path)
+        return store
+
+
+def reset_narration_stores() -> None:
+    with _STORES_LOCK:
+        _STORES.clear()
+
+
+__all__ = ["NarrationStore", "narration_store", "reset_narration_stores"]
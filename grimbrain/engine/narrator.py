@@ -1,51 +1,86 @@
 import hashlib
-import random
+import os
+import queue
 import sys
-from collections import defaultdict
-from functools import lru_cache
+import threading
+from concurrent.futures import Future, wait
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-import yaml
-
-from .config import get_api_key, NARRATION_CACHE, append_cache_line, iter_cache
+from .config import get_api_key, NARRATION_CACHE
+from .narration_cache import narration_store
+from .template_packs import CompiledPack, load_pack, pick_index, render_braces
 
 
 _NARRATIVE_ROOT = Path(__file__).resolve().parents[2] / "data" / "narrative"
 
+# Concurrency and time budget for CachedNarrator.render_many.  The deadline
+# stays below the AI transport's per-request timeout (GB_AI_TIMEOUT, 15s).
+PREFETCH_WORKERS = int(os.getenv("GB_NARRATION_WORKERS", "4"))
+PREFETCH_DEADLINE = float(os.getenv("GB_NARRATION_DEADLINE", "10"))
+
+NarrationLine = Tuple[str, str, Dict[str, Any]]
+
+
+class _DaemonPool:
+    """Fixed daemon worker threads: a call still running never delays exit."""
+
+    def __init__(self, workers: int) -> None:
+        self._queue: "queue.SimpleQueue[Tuple[Future, Callable[..., Any], tuple]]" = queue.SimpleQueue()
+        for i in range(max(1, workers)):
+            threading.Thread(target=self._work, name=f"grimbrain-narration-{i}", daemon=True).start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        fut: Future = Future()
+        self._queue.put((fut, fn, args))
+        return fut
+
+    def _work(self) -> None:
+        while True:
+            fut, fn, args = self._queue.get()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(fn(*args))
+            except BaseException as exc:
+                fut.set_exception(exc)
+
+
+_PREFETCH_POOL: Optional[_DaemonPool] = None
+_PREFETCH_POOL_LOCK = threading.Lock()
+
 
-@lru_cache(maxsize=None)
-def _load_template_pack(pack: str) -> Dict[str, list[str]]:
-    path = _NARRATIVE_ROOT / f"{pack}.yaml"
-    if not path.exists():
-        path = _NARRATIVE_ROOT / "classic.yaml"
-    if not path.exists():
-        return {}
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
-    return data or {}
+def _prefetch_pool() -> _DaemonPool:
+    """Process-wide workers for ``render_many``, started on first use."""
+    global _PREFETCH_POOL
+    with _PREFETCH_POOL_LOCK:
+        if _PREFETCH_POOL is None:
+            _PREFETCH_POOL = _DaemonPool(PREFETCH_WORKERS)
+        return _PREFETCH_POOL
+
+
+def _load_template_pack(pack: str) -> CompiledPack:
+    compiled = load_pack(_NARRATIVE_ROOT / f"{pack}.yaml")
+    if compiled is None:
+        compiled = load_pack(_NARRATIVE_ROOT / "classic.yaml")
+    return compiled or {}
 
 
 def pick_template_line(
     pack: str, section: str, ctx: Dict[str, Any], seed: int | None = None
 ) -> tuple[str, str]:
-    data = _load_template_pack(pack)
-    options = list(data.get(section) or [])
+    options = _load_template_pack(pack).get(section)
     if not options:
         return "", ""
-    rng = random.Random(seed)
-    idx = rng.randrange(len(options))
-    raw = options[idx]
+    idx = pick_index(seed, len(options))
     tpl_id = f"{pack}:{section}:{idx}"
-    return raw.format_map(defaultdict(str, ctx)), tpl_id
+    return options[idx].render(ctx), tpl_id
 
 class TemplateNarrator:
     KIND = "template"
     REASON = "ok"
     def render(self, template: str, ctx: Dict[str, object]) -> str:
-        out = template or ""
-        for k, v in ctx.items():
-            out = out.replace(f"{{{{{k}}}}}", str(v))
-        return out
+        return render_braces(template or "", ctx)
 
 def _hash(scene_id: str, template: str, ctx: Dict[str, Any], backend_kind: str) -> str:
     """Include BACKEND KIND in the hash so template and AI never collide."""
@@ -66,6 +101,13 @@ class CachedNarrator:
         self._template = TemplateNarrator()
 
     def render(self, scene_id: str, template: str, ctx: Dict[str, Any]) -> str:
+        text, note = self._render(scene_id, template, ctx)
+        if note:
+            print(note)
+        return text
+
+    def _render(self, scene_id: str, template: str, ctx: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """Rendered text plus the debug line to print (``None`` without ``debug``)."""
         ctx_local: Dict[str, Any] = dict(ctx or {})
         if "section" not in ctx_local:
             base, _, tail = scene_id.partition("#")
@@ -74,12 +116,11 @@ class CachedNarrator:
         ctx_local.setdefault("style", ctx_local.get("style") or "classic")
         ctx_local.setdefault("_ai_debug", self.debug)
         key = _hash(scene_id, template, ctx_local, self.kind)
+        store = narration_store(NARRATION_CACHE)
         if not self.flush:
-            for row in iter_cache(NARRATION_CACHE):
-                if row.get("key") == key:
-                    if self.debug:
-                        print(f"[narration] backend={self.kind} reason={self.reason} cache=HIT scene={scene_id}")
-                    return row.get("text","")
+            cached = store.get(key)
+            if cached is not None:
+                return cached, self._note(f"cache=HIT scene={scene_id}")
         text = self.backend.render(template, ctx_local)
         # Always preserve the underlying template text so deterministic tests can
         # assert on authored story beats even when an AI backend embellishes the
@@ -91,10 +132,46 @@ class CachedNarrator:
                 if text and not text.endswith("\n"):
                     text += "\n"
                 text += fallback
-        append_cache_line(NARRATION_CACHE, {"key": key, "text": text})
-        if self.debug:
-            print(f"[narration] backend={self.kind} reason={self.reason} cache=MISS scene={scene_id}")
-        return text
+        store.put(key, text)
+        return text, self._note(f"cache=MISS scene={scene_id}")
+
+    def _note(self, detail: str) -> Optional[str]:
+        if not self.debug:
+            return None
+        return f"[narration] backend={self.kind} reason={self.reason} {detail}"
+
+    def render_many(
+        self, lines: Sequence[NarrationLine], deadline: float | None = None
+    ) -> List[str]:
+        """Render ``(scene_id, template, ctx)`` lines, in order.
+
+        With an AI backend the lines are rendered concurrently on shared daemon
+        workers, so a step costs one round trip instead of one per line.  Any
+        line not finished within ``deadline`` seconds (default
+        ``GB_NARRATION_DEADLINE``) falls back to its template text; the late
+        call still fills the cache when it lands, without holding up the
+        command or interpreter exit.  Debug lines are printed on the calling
+        thread, so a late call never writes to stdout.
+        """
+        if self.kind == "template" or len(lines) <= 1:
+            return [self.render(*line) for line in lines]
+        timeout = PREFETCH_DEADLINE if deadline is None else deadline
+        pool = _prefetch_pool()
+        futures = [pool.submit(self._render, *line) for line in lines]
+        wait(futures, timeout=timeout)
+        out: List[str] = []
+        for fut, (scene_id, template, ctx) in zip(futures, lines):
+            fut.cancel()  # drop lines no worker has started yet
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                text, note = fut.result()
+                if note:
+                    print(note)
+                out.append(text)
+                continue
+            if self.debug:
+                print(f"[narration] backend={self.kind} reason=deadline fallback=template scene={scene_id}")
+            out.append(self._template.render(template, dict(ctx or {})))
+        return out
 
 def get_narrator(ai_enabled: bool, debug: bool = False, flush: bool = False):
     key = get_api_key()
@@ -1,17 +1,21 @@
-import json, urllib.request, urllib.error, sys, time
+import sys, time
 
 from grimbrain.ai import CacheInputs, call_with_cache
 
+from .ai_transport import Transport, TransportError, default_transport
 from .narrator import TemplateNarrator
 
 class AINarrator:
     KIND = "openai:gpt-4o-mini"
     REASON = "ok"
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, transport: Transport | None = None):
         self.api_key = api_key
+        # Shared per endpoint, so connections are reused across narrators.
+        self.transport = transport or default_transport()
+        self._template = TemplateNarrator()
 
     def render(self, template: str, ctx: dict) -> str:
-        prompt = TemplateNarrator().render(template, ctx)
+        prompt = self._template.render(template, ctx)
         model = "gpt-4o-mini"
         style = (ctx or {}).get("style") or "classic"
         section = (ctx or {}).get("section") or "misc"
@@ -33,17 +37,11 @@ class AINarrator:
                     "max_output_tokens": 120,
                     "temperature": 0.7,
                 }
-                req = urllib.request.Request(
-                    "https://api.openai.com/v1/responses",
-                    data=json.dumps(body).encode("utf-8"),
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    method="POST",
+                data = self.transport.post_json(
+                    "/v1/responses",
+                    body,
+                    {"Authorization": f"Bearer {self.api_key}"},
                 )
-                with urllib.request.urlopen(req, timeout=15) as r:
-                    data = json.loads(r.read().decode("utf-8"))
                 elapsed = int((time.time() - start) * 1000)
                 out = ""
                 for item in data.get("output", []):
@@ -58,12 +56,15 @@ class AINarrator:
                     file=sys.stderr,
                 )
                 return (out or prompt_text).strip()
-            except urllib.error.HTTPError as e:
-                print(f"[narration] ERROR http {e.code}: {e.reason}", file=sys.stderr)
-                return TemplateNarrator().render(template, ctx)
+            except TransportError as e:
+                if e.status is not None:
+                    print(f"[narration] ERROR http {e.status}: {e.reason}", file=sys.stderr)
+                else:
+                    print(f"[narration] ERROR {e}", file=sys.stderr)
+                return prompt
             except Exception as e:
                 print(f"[narration] ERROR {type(e).__name__}: {e}", file=sys.stderr)
-                return TemplateNarrator().render(template, ctx)
+                return prompt
 
         messages = [
             {
@@ -0,0 +1,256 @@
+"""
+template_packs.py — narrative YAML packs compiled to render-ready templates.
+
+Each line of a pack is parsed once into literal and field segments, so
+rendering is a lookup per field and a join rather than a fresh
+``str.format_map`` parse.  Compiled packs are kept in-process and, as plain
+JSON segment lists, under ``GB_NARRATIVE_CACHE_DIR`` (default
+``~/.cache/grimbrain/narrative``), both keyed by the YAML file's size and
+mtime; YAML is only parsed when a pack changes.  ``GB_NARRATIVE_CACHE=0``
+disables the on-disk copy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import re
+import string
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from grimbrain.config import flag
+
+PACK_CACHE_VERSION = 2
+
+_FORMATTER = string.Formatter()
+_CONVERT = {"r": repr, "s": str, "a": ascii}
+_MISSING = object()
+
+
+class CompiledTemplate:
+    """A ``str.format`` template split into literals and ``(name, conversion, spec)`` fields.
+
+    Templates using positional, attribute or index fields (or nested specs)
+    keep ``simple = False`` and render through ``format_map`` as before.
+    """
+
+    __slots__ = ("raw", "segments", "simple")
+
+    def __init__(self, raw: str) -> None:
+        self.raw = raw
+        self.segments: Tuple[Any, ...] = ()
+        self.simple = False
+        try:
+            parsed = list(_FORMATTER.parse(raw))
+        except ValueError:
+            return  # malformed; format_map raises the same error at render time
+        segments: List[Any] = []
+        for literal, field, spec, conversion in parsed:
+            if literal:
+                segments.append(literal)
+            if field is None:
+                continue
+            if not field.isidentifier() or (spec and "{" in spec):
+                return
+            segments.append((field, conversion, spec or ""))
+        self.segments = tuple(segments)
+        self.simple = True
+
+    @classmethod
+    def from_parts(cls, raw: str, simple: bool, segments: List[Any]) -> "CompiledTemplate":
+        """Rebuild a template from :meth:`parts` without parsing ``raw`` again."""
+        tpl = cls.__new__(cls)
+        tpl.raw = raw
+        tpl.simple = bool(simple)
+        tpl.segments = tuple(seg if isinstance(seg, str) else tuple(seg) for seg in segments)
+        return tpl
+
+    def parts(self) -> List[Any]:
+        """JSON-safe ``[raw, simple, segments]``."""
+        return [self.raw, self.simple, [seg if isinstance(seg, str) else list(seg) for seg in self.segments]]
+
+    def render(self, ctx: Mapping[str, Any]) -> str:
+        """Same result as ``raw.format_map(defaultdict(str, ctx))``."""
+        if not self.simple:
+            return self.raw.format_map(defaultdict(str, ctx))
+        parts = []
+        for seg in self.segments:
+            if seg.__class__ is str:
+                parts.append(seg)
+                continue
+            name, conversion, spec = seg
+            value = ctx.get(name, "")
+            if conversion:
+                value = _CONVERT[conversion](value)
+            parts.append(value if value.__class__ is str and not spec else format(value, spec))
+        return "".join(parts)
+
+
+CompiledPack = Dict[str, Tuple[CompiledTemplate, ...]]
+
+
+def compile_pack(data: Mapping[str, Any]) -> CompiledPack:
+    pack: CompiledPack = {}
+    for section, options in (data or {}).items():
+        if isinstance(options, list):
+            pack[str(section)] = tuple(CompiledTemplate(str(o)) for o in options)
+    return pack
+
+
+# ---------------------------------------------------------------------------
+# Pack loading
+
+
+def _cache_dir() -> Path:
+    env = os.getenv("GB_NARRATIVE_CACHE_DIR")
+    return Path(env) if env else Path.home() / ".cache" / "grimbrain" / "narrative"
+
+
+def _cache_path(path: Path) -> Path:
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return _cache_dir() / f"{path.stem}-{digest}.json"
+
+
+def _read_cached(path: Path, signature: List[int]) -> Optional[CompiledPack]:
+    try:
+        payload = json.loads(_cache_path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != PACK_CACHE_VERSION
+        or payload.get("signature") != signature
+    ):
+        return None
+    try:
+        return {
+            str(section): tuple(CompiledTemplate.from_parts(*parts) for parts in options)
+            for section, options in payload["pack"].items()
+        }
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+def _write_cached(path: Path, signature: List[int], pack: CompiledPack) -> None:
+    target = _cache_path(path)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        data = {section: [tpl.parts() for tpl in options] for section, options in pack.items()}
+        tmp.write_text(
+            json.dumps(
+                {"version": PACK_CACHE_VERSION, "signature": signature, "pack": data},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, target)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _compile_file(path: Path, signature: List[int]) -> CompiledPack:
+    use_disk = flag("GB_NARRATIVE_CACHE", True)
+    if use_disk:
+        cached = _read_cached(path, signature)
+        if cached is not None:
+            return cached
+    import yaml
+
+    pack = compile_pack(yaml.safe_load(path.read_text(encoding="utf-8")) or {})
+    if use_disk:
+        _write_cached(path, signature, pack)
+    return pack
+
+
+_LOADED: Dict[str, Tuple[List[int], CompiledPack]] = {}
+_LOADED_LOCK = threading.Lock()
+
+
+def load_pack(path: Path) -> Optional[CompiledPack]:
+    """Compiled pack for ``path``; ``None`` if the file does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    signature = [st.st_size, st.st_mtime_ns]
+    key = os.path.abspath(path)
+    with _LOADED_LOCK:
+        cached = _LOADED.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    pack = _compile_file(path, signature)
+    with _LOADED_LOCK:
+        _LOADED[key] = (signature, pack)
+    return pack
+
+
+def reset_template_packs() -> None:
+    with _LOADED_LOCK:
+        _LOADED.clear()
+
+
+# ---------------------------------------------------------------------------
+# ``{{name}}`` templates (TemplateNarrator)
+
+_BRACES_RE = re.compile(r"\{\{([^{}]*)\}\}")
+
+
+@lru_cache(maxsize=1024)
+def compile_braces(template: str) -> Tuple[Any, ...]:
+    """Split ``template`` into literals and ``(name,)`` placeholders."""
+    segments: List[Any] = []
+    pos = 0
+    for m in _BRACES_RE.finditer(template):
+        if m.start() > pos:
+            segments.append(template[pos:m.start()])
+        segments.append((m.group(1),))
+        pos = m.end()
+    if pos < len(template):
+        segments.append(template[pos:])
+    return tuple(segments)
+
+
+def render_braces(template: str, ctx: Mapping[str, Any]) -> str:
+    """Substitute ``{{name}}`` from ``ctx``; unknown names are left as is."""
+    parts = []
+    for seg in compile_braces(template):
+        if seg.__class__ is str:
+            parts.append(seg)
+            continue
+        value = ctx.get(seg[0], _MISSING)
+        parts.append("{{" + seg[0] + "}}" if value is _MISSING else str(value))
+    return "".join(parts)
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _seeded_index(seed: Any, n: int) -> int:
+    return random.Random(seed).randrange(n)
+
+
+def pick_index(seed: Any, n: int) -> int:
+    """``random.Random(seed).randrange(n)``, memoized for hashable seeds."""
+    if seed is not None:
+        try:
+            return _seeded_index(seed, n)
+        except TypeError:  # unhashable seed (e.g. bytearray)
+            pass
+    return random.Random(seed).randrange(n)
+
+
+__all__ = [
+    "CompiledTemplate",
+    "compile_braces",
+    "compile_pack",
+    "load_pack",
+    "pick_index",
+    "render_braces",
+    "reset_template_packs",
+]
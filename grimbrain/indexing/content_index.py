@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Iterable, Dict, List, Tuple, Mapping
 
 from grimbrain.content.ids import canonicalize_id
+from grimbrain.indexing.monster_lookup import write_monster_lookup
 
 PersistentClient = None  # type: ignore
 
@@ -448,6 +449,10 @@ def incremental_index(
     # persist manifest
     manifest_file.parent.mkdir(parents=True, exist_ok=True)
     manifest_file.write_text(json.dumps(new_manifest, indent=2))
+    try:
+        write_monster_lookup(new_manifest, manifest_file)
+    except OSError:
+        pass  # play falls back to reading the manifest
 
     # compute idx using new_manifest
     idx = index_signature(
@@ -0,0 +1,203 @@
+"""Prebuilt monster lookup for ``play`` startup.
+
+``incremental_index`` writes two files next to ``manifest.json``:
+
+* ``monsters.dat`` — the monster payloads as canonical JSON, back to back.
+* ``monsters.idx.json`` — ``alias -> id``, ``id -> [offset, length]`` into the
+  payload store, and the stat signature of the manifest it was built from.
+
+``play`` reads the small index and maps the payload store, so startup no
+longer parses every rule, spell and item in the manifest.  If the artifact is
+missing or older than the manifest, the lookup is rebuilt from the manifest.
+"""
+
+from __future__ import annotations
+
+import bisect
+import difflib
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from grimbrain.content.ids import canonicalize_id
+
+LOOKUP_VERSION = 1
+LOOKUP_INDEX = "monsters.idx.json"
+LOOKUP_DATA = "monsters.dat"
+
+
+def _manifest_signature(manifest_path: Path) -> Optional[List[int]]:
+    try:
+        st = manifest_path.stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _monster_aliases(manifest: Mapping[str, dict]) -> Tuple[Dict[str, str], Dict[str, dict]]:
+    """``alias -> id`` and ``id -> payload`` for the monsters in ``manifest``."""
+    payloads: Dict[str, dict] = {}
+    aliases: Dict[str, str] = {}
+    for entry in manifest.values():
+        if entry.get("doc_type") != "monster":
+            continue
+        cid = canonicalize_id("monster", entry.get("id", ""))
+        payloads[cid] = entry.get("payload", {})
+        aliases[entry.get("name", "").lower()] = cid
+        aliases[cid] = cid
+        for a in entry.get("aliases", []) or []:
+            aliases[str(a).lower()] = cid
+    return aliases, payloads
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_monster_lookup(manifest: Mapping[str, dict], manifest_path: str | Path) -> None:
+    """Write the lookup artifact for ``manifest`` next to ``manifest_path``.
+
+    Call after the manifest itself is written: the artifact records the
+    manifest's stat signature and is ignored once that no longer matches.
+    """
+    manifest_path = Path(manifest_path)
+    aliases, payloads = _monster_aliases(manifest)
+    blob = bytearray()
+    offsets: Dict[str, List[int]] = {}
+    for cid, payload in payloads.items():
+        data = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        offsets[cid] = [len(blob), len(data)]
+        blob += data
+    index = {
+        "version": LOOKUP_VERSION,
+        "manifest": _manifest_signature(manifest_path),
+        "aliases": aliases,
+        "offsets": offsets,
+    }
+    out_dir = manifest_path.parent
+    # Data first: an index whose signature matches implies complete data.
+    _write_bytes(out_dir / LOOKUP_DATA, bytes(blob))
+    _write_bytes(out_dir / LOOKUP_INDEX, json.dumps(index, separators=(",", ":")).encode("utf-8"))
+
+
+class FuzzyIndex:
+    """Close-match suggestions over a fixed set of keys.
+
+    Keys are bucketed by length; a difflib ratio of at least ``cutoff`` is
+    only possible between strings whose lengths are within a factor of
+    ``(2 - cutoff) / cutoff``, so only that window is scored.  Results match
+    ``difflib.get_close_matches`` over the full key set.
+    """
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        ordered = sorted({k.lower() for k in keys}, key=lambda k: (len(k), k))
+        self.keys = ordered
+        self.lengths = [len(k) for k in ordered]
+
+    def suggest(self, name: str, n: int = 3, cutoff: float = 0.6) -> List[str]:
+        name = name.lower()
+        if not self.keys or cutoff <= 0:
+            return difflib.get_close_matches(name, self.keys, n=n, cutoff=cutoff)
+        size = len(name)
+        lo = size * cutoff / (2 - cutoff)
+        hi = size * (2 - cutoff) / cutoff
+        start = bisect.bisect_left(self.lengths, int(lo))
+        end = bisect.bisect_right(self.lengths, int(hi) + 1)
+        return difflib.get_close_matches(name, self.keys[start:end], n=n, cutoff=cutoff)
+
+
+class MonsterLookup:
+    """Resolve monster names and aliases to ids and payloads."""
+
+    def __init__(self, aliases: Dict[str, str], offsets: Dict[str, List[int]], data=None,
+                 payloads: Optional[Dict[str, dict]] = None) -> None:
+        self.aliases = aliases
+        self._offsets = offsets
+        self._data = data
+        self._payloads: Dict[str, dict] = dict(payloads or {})
+        self._fuzzy: Optional[FuzzyIndex] = None
+
+    @classmethod
+    def from_manifest(cls, manifest: Mapping[str, dict]) -> "MonsterLookup":
+        aliases, payloads = _monster_aliases(manifest)
+        return cls(aliases, {}, payloads=payloads)
+
+    def resolve(self, name: str) -> Optional[str]:
+        return self.aliases.get(name.lower()) or self.aliases.get(canonicalize_id("monster", name))
+
+    def payload(self, cid: str) -> dict:
+        hit = self._payloads.get(cid)
+        if hit is not None:
+            return hit
+        ref = self._offsets.get(cid)
+        if ref is None or self._data is None:
+            return {}
+        off, length = ref
+        payload = json.loads(self._data[off:off + length].decode("utf-8"))
+        self._payloads[cid] = payload
+        return payload
+
+    def suggest(self, name: str, n: int = 3, cutoff: float = 0.6) -> List[str]:
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(self.aliases)
+        return self._fuzzy.suggest(name, n=n, cutoff=cutoff)
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
+
+
+def _open_artifact(chroma_dir: Path, signature: List[int]) -> Optional[MonsterLookup]:
+    try:
+        index = json.loads((chroma_dir / LOOKUP_INDEX).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or index.get("version") != LOOKUP_VERSION:
+        return None
+    if index.get("manifest") != signature:
+        return None
+    offsets = index.get("offsets") or {}
+    data = None
+    if offsets:
+        try:
+            with open(chroma_dir / LOOKUP_DATA, "rb") as fh:
+                data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+    return MonsterLookup(index.get("aliases") or {}, offsets, data)
+
+
+def open_monster_lookup(chroma_dir: str | Path) -> MonsterLookup:
+    """Monster lookup for the index in ``chroma_dir``.
+
+    Uses the prebuilt artifact when it matches ``manifest.json``; otherwise
+    falls back to reading the manifest.
+    """
+    chroma_dir = Path(chroma_dir)
+    manifest_path = chroma_dir / "manifest.json"
+    signature = _manifest_signature(manifest_path)
+    if signature is None:
+        return MonsterLookup({}, {})
+    lookup = _open_artifact(chroma_dir, signature)
+    if lookup is not None:
+        return lookup
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        manifest = {}
+    return MonsterLookup.from_manifest(manifest)
+
+
+__all__ = [
+    "FuzzyIndex",
+    "LOOKUP_DATA",
+    "LOOKUP_INDEX",
+    "MonsterLookup",
+    "open_monster_lookup",
+    "write_monster_lookup",
+]
@@ -5,6 +5,10 @@ from dataclasses import asdict, is_dataclass
 from pathlib import Path
 from typing import Any, Dict
 
+from grimbrain.config import flag
+
+from .campaign_store import campaign_store, discard_store, read_document
+
 try:  # pragma: no cover - optional dependency
     import yaml  # type: ignore
 except Exception:  # pragma: no cover - PyYAML is optional
@@ -108,7 +112,7 @@ def load_campaign(path: str | Path) -> Dict[str, Any]:
     """Load a campaign document and normalize it to a plain dictionary."""
 
     p = Path(path)
-    payload = _read_payload(p)
+    payload = read_document(p)
     state: Dict[str, Any] = dict(payload)
 
     clock = payload.get("clock") if isinstance(payload.get("clock"), dict) else {}
@@ -235,23 +239,10 @@ def load_campaign(path: str | Path) -> Dict[str, Any]:
     return state
 
 
-def save_campaign(data: Dict[str, Any], path: str | Path, fmt: str | None = None) -> Path:
-    """Save a normalized campaign dictionary to disk."""
-
+def _prepare_payload(data: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(data, dict):
         raise TypeError("save_campaign expects a dictionary")
 
-    p = Path(path)
-    chosen = (fmt or "").lower() or None
-    if chosen not in {None, "json", "yaml", "yml"}:
-        raise ValueError("fmt must be json or yaml")
-    if chosen is None:
-        suffix = p.suffix.lower()
-        if suffix in {".yaml", ".yml"}:
-            chosen = "yaml"
-        else:
-            chosen = "json"
-
     payload = dict(data)
     raw_party = payload.get("party")
     if isinstance(raw_party, list):
@@ -292,6 +283,20 @@ def save_campaign(data: Dict[str, Any], path: str | Path, fmt: str | None = None
                 hp_value = member.get("max_hp", member.get("hp_max", 0))
             current_hp_map.setdefault(str(mid), _coerce_int(hp_value, default=0))
     payload["current_hp"] = {str(k): _coerce_int(v, default=0) for k, v in current_hp_map.items()}
+    return payload
+
+
+def _write_payload(payload: Dict[str, Any], path: str | Path, fmt: str | None = None) -> Path:
+    p = Path(path)
+    chosen = (fmt or "").lower() or None
+    if chosen not in {None, "json", "yaml", "yml"}:
+        raise ValueError("fmt must be json or yaml")
+    if chosen is None:
+        suffix = p.suffix.lower()
+        if suffix in {".yaml", ".yml"}:
+            chosen = "yaml"
+        else:
+            chosen = "json"
 
     if chosen in {"yaml", "yml"}:
         if yaml is None:
@@ -304,4 +309,36 @@ def save_campaign(data: Dict[str, Any], path: str | Path, fmt: str | None = None
     return p
 
 
-__all__ = ["load_campaign", "save_campaign", "yaml"]
+def save_campaign(data: Dict[str, Any], path: str | Path, fmt: str | None = None) -> Path:
+    """Save a normalized campaign dictionary to disk."""
+
+    out = _write_payload(_prepare_payload(data), path, fmt)
+    discard_store(out)
+    return out
+
+
+def commit_campaign(data: Dict[str, Any], path: str | Path) -> Path:
+    """Record a campaign dictionary as the new state of the save at ``path``.
+
+    Appends the changes to the save's op log (see ``campaign_store``) instead
+    of rewriting the file; with ``GB_CAMPAIGN_STORE=0`` this is
+    :func:`save_campaign`.
+    """
+
+    payload = _prepare_payload(data)
+    if not flag("GB_CAMPAIGN_STORE", True):
+        return save_campaign(payload, path)
+    campaign_store(path).commit(payload)
+    return Path(path)
+
+
+def export_campaign(path: str | Path, out: str | Path | None = None, fmt: str | None = None) -> Path:
+    """Write the current state of the save at ``path`` as YAML or JSON.
+
+    Without ``out`` the save file itself is brought up to date.
+    """
+
+    return campaign_store(path).export(out, fmt)
+
+
+__all__ = ["commit_campaign", "export_campaign", "load_campaign", "save_campaign", "yaml"]
@@ -0,0 +1,418 @@
+"""
+campaign_store.py — JSON snapshot plus op log behind a campaign save.
+
+Committing a campaign document does not rewrite the YAML/JSON save.  Instead
+the change is diffed against the last committed document and appended to
+``<save stem>.store/ops.<gen>.log`` as one line of ``set``/``del`` ops on
+document paths (``["set", ["current_hp", "PC1"], 7]``), so a command that
+changes a few HP values, an inventory count and the clock writes a few
+hundred bytes whatever the size of the save.  Loading reads a JSON
+snapshot and replays the log instead of parsing YAML.
+
+Every ``GB_CAMPAIGN_COMPACT_OPS`` commits the log is folded: the save file is
+re-exported in its own format and a new snapshot (generation ``gen + 1``)
+replaces the log.  :meth:`CampaignStore.export` exports on demand.
+
+The snapshot records the stat signature of the save file it matches.  When
+the save is edited by hand (or just touched), the ops not yet exported are
+replayed on top of the edited file, so neither the edit nor the progress
+since the last export is lost; ``save_campaign`` discards the store instead.
+
+Commits, compaction and rebasing run under an ``flock`` on ``<store>/lock``,
+so several processes can commit to the same save.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+STORE_VERSION = 1
+SNAPSHOT_NAME = "snapshot.json"
+LOCK_NAME = "lock"
+DEFAULT_COMPACT_OPS = 200
+
+
+def _compact_ops() -> int:
+    try:
+        return max(1, int(os.getenv("GB_CAMPAIGN_COMPACT_OPS", str(DEFAULT_COMPACT_OPS))))
+    except ValueError:
+        return DEFAULT_COMPACT_OPS
+
+
+def _stat_signature(path: Path) -> Optional[List[int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _clone(value: Any) -> Any:
+    """Deep copy of plain document data (much faster than ``copy.deepcopy``).
+
+    In memory only: nothing pickled is ever written to or read from disk.
+    """
+    return pickle.loads(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+@contextlib.contextmanager
+def _store_lock(root: Path) -> Iterator[None]:
+    """Exclusive cross-process lock on a store directory."""
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / LOCK_NAME, "a+b") as lock_file:
+        _lock_file(lock_file)
+        try:
+            yield
+        finally:
+            _unlock_file(lock_file)
+
+
+def _lock_file(handle) -> None:
+    if os.name == "nt":  # pragma: no cover
+        import msvcrt
+
+        msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+    else:  # pragma: no branch
+        import fcntl
+
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(handle) -> None:
+    if os.name == "nt":  # pragma: no cover
+        import msvcrt
+
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+    else:  # pragma: no branch
+        import fcntl
+
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def store_dir(save_path: str | Path) -> Path:
+    p = Path(save_path)
+    return p.with_name(f"{p.stem}.store")
+
+
+# ---------------------------------------------------------------------------
+# Document ops
+
+
+def diff_document(old: Any, new: Any, path: Optional[List[Any]] = None) -> List[list]:
+    """Ops turning ``old`` into ``new``; dicts and equal-length lists are diffed per item."""
+    path = path or []
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[list] = [["del", path + [key]] for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append(["set", path + [key], value])
+            else:
+                ops.extend(diff_document(old[key], value, path + [key]))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for idx, (a, b) in enumerate(zip(old, new)):
+            ops.extend(diff_document(a, b, path + [idx]))
+        return ops
+    return [["set", path, new]]
+
+
+def apply_ops(doc: Dict[str, Any], ops: List[list]) -> Dict[str, Any]:
+    """Apply ``ops`` to ``doc`` in place; returns the (possibly replaced) root."""
+    for op in ops:
+        kind, path = op[0], op[1]
+        if not path:
+            if kind == "set":
+                doc = _clone(op[2])
+            continue
+        parent = doc
+        for key in path[:-1]:
+            parent = parent[key]
+        if kind == "set":
+            parent[path[-1]] = _clone(op[2])
+        elif kind == "del" and isinstance(parent, dict):
+            parent.pop(path[-1], None)
+    return doc
+
+
+# ---------------------------------------------------------------------------
+# Store
+
+
+class CampaignStore:
+    """Snapshot + op log for one campaign save file."""
+
+    def __init__(self, path: str | Path, compact_ops: Optional[int] = None) -> None:
+        self.path = Path(path)
+        self.root = store_dir(self.path)
+        self.compact_ops = _compact_ops() if compact_ops is None else max(1, compact_ops)
+        self._doc: Optional[Dict[str, Any]] = None
+        self._gen = 0
+        self._source: Optional[List[int]] = None
+        self._snap_sig: Optional[List[int]] = None
+        self._scanned = 0
+        self._commits = 0
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.root / SNAPSHOT_NAME
+
+    def _log_path(self, gen: Optional[int] = None) -> Path:
+        return self.root / f"ops.{self._gen if gen is None else gen}.log"
+
+    # -- snapshot -------------------------------------------------------------
+
+    def _forget(self) -> None:
+        self._doc = None
+        self._source = None
+        self._snap_sig = None
+        self._scanned = 0
+        self._commits = 0
+
+    def _load_snapshot(self) -> bool:
+        try:
+            snap = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if not isinstance(snap, dict) or snap.get("version") != STORE_VERSION:
+            return False
+        self._doc = snap["doc"]
+        self._gen = int(snap.get("gen", 0))
+        self._source = snap.get("source")
+        self._snap_sig = _stat_signature(self.snapshot_path)
+        self._scanned = 0
+        self._commits = 0
+        return True
+
+    def _write_snapshot(self, doc: Dict[str, Any], source: Optional[List[int]]) -> None:
+        """Start generation ``gen + 1`` from ``doc`` and drop older logs."""
+        gen = self._gen + 1
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._log_path(gen).unlink(missing_ok=True)
+        tmp = self.snapshot_path.with_name(f"{SNAPSHOT_NAME}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps(
+                {"version": STORE_VERSION, "gen": gen, "source": source, "doc": doc},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.snapshot_path)
+        for log in self.root.glob("ops.*.log"):
+            if log.name != self._log_path(gen).name:
+                log.unlink(missing_ok=True)
+        self._doc = doc
+        self._gen = gen
+        self._source = source
+        self._snap_sig = _stat_signature(self.snapshot_path)
+        self._scanned = 0
+        self._commits = 0
+
+    # -- sync -----------------------------------------------------------------
+
+    def _valid(self) -> bool:
+        """
+        Bring the in-memory document up to date; ``False`` if there is no usable store.
+
+        Call with the store lock held: a save edited behind the store's back
+        is rebased here.
+        """
+        snap_sig = _stat_signature(self.snapshot_path)
+        if snap_sig is None:
+            self._forget()
+            return False
+        if self._doc is None or snap_sig != self._snap_sig:
+            if not self._load_snapshot():
+                self._forget()
+                return False
+        source = _stat_signature(self.path)
+        if self._source != source:
+            return source is not None and self._rebase()
+        self._replay()
+        return True
+
+    def _read_ops(self, start: int) -> Tuple[List[list], int]:
+        """Op lines of the current log from byte ``start``; returns them and the end offset."""
+        batches: List[list] = []
+        log = self._log_path()
+        try:
+            size = log.stat().st_size
+        except OSError:
+            return batches, start
+        if size <= start:
+            return batches, start
+        with log.open("rb") as fh:
+            fh.seek(start)
+            offset = start
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break  # partial line still being written
+                offset += len(line)
+                try:
+                    batches.append(json.loads(line).get("ops") or [])
+                except (ValueError, AttributeError):
+                    continue
+        return batches, offset
+
+    def _replay(self) -> None:
+        """Apply op lines appended since the last sync (e.g. by another process)."""
+        batches, self._scanned = self._read_ops(self._scanned)
+        for ops in batches:
+            self._doc = apply_ops(self._doc, ops)
+            self._commits += 1
+
+    def _rebase(self) -> bool:
+        """
+        The save file changed behind the store: start a new snapshot from it
+        with every op not yet exported replayed on top.  Ops whose target the
+        edit removed are dropped; everything else in the edit is kept.
+        """
+        from .campaign_io import _read_payload
+
+        doc = _read_payload(self.path)
+        batches, _ = self._read_ops(0)
+        for ops in batches:
+            for op in ops:
+                try:
+                    doc = apply_ops(doc, [op])
+                except (KeyError, IndexError, TypeError):
+                    continue
+        self._write_snapshot(doc, _stat_signature(self.path))
+        return True
+
+    # -- public API -------------------------------------------------------------
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Current document, or ``None`` if there is no store for the save file."""
+        if not self.snapshot_path.exists():
+            return None
+        with self._lock, _store_lock(self.root):
+            if not self._valid():
+                return None
+            return _clone(self._doc)
+
+    def commit(self, doc: Dict[str, Any]) -> None:
+        """Record ``doc`` as the current state of the save."""
+        with self._lock, _store_lock(self.root):
+            if not self._valid():
+                if self.path.exists():
+                    from .campaign_io import _read_payload
+
+                    self._write_snapshot(_read_payload(self.path), _stat_signature(self.path))
+                else:
+                    self._export(doc, self.path)
+                    self._write_snapshot(_clone(doc), _stat_signature(self.path))
+                    return
+            ops = diff_document(self._doc, doc)
+            if not ops:
+                return
+            line = (json.dumps({"ops": ops}, separators=(",", ":")) + "\n").encode("utf-8")
+            with self._log_path().open("ab") as fh:
+                offset = fh.tell()
+                fh.write(line)
+            self._doc = apply_ops(self._doc, ops)
+            if offset == self._scanned:
+                self._scanned = offset + len(line)
+            self._commits += 1
+            if self._commits >= self.compact_ops:
+                self._compact()
+
+    def _export(self, doc: Dict[str, Any], out: Path, fmt: Optional[str] = None) -> Path:
+        from .campaign_io import _write_payload
+
+        return _write_payload(doc, out, fmt)
+
+    def _compact(self) -> None:
+        self._export(self._doc, self.path)
+        self._write_snapshot(self._doc, _stat_signature(self.path))
+
+    def compact(self) -> None:
+        """Re-export the save file and fold the op log into a new snapshot."""
+        with self._lock, _store_lock(self.root):
+            if self._valid():
+                self._compact()
+
+    def export(self, out: Optional[str | Path] = None, fmt: Optional[str] = None) -> Path:
+        """Write the current document to ``out`` (default: the save file itself)."""
+        with self._lock, _store_lock(self.root):
+            valid = self._valid()
+            if out is None or os.path.abspath(out) == os.path.abspath(self.path):
+                if valid:
+                    self._compact()
+                return self.path
+            if valid:
+                return self._export(self._doc, Path(out), fmt)
+        from .campaign_io import _read_payload
+
+        return self._export(_read_payload(self.path), Path(out), fmt)
+
+    def discard(self) -> None:
+        """Remove the store, e.g. after the save file was written directly."""
+        if not self.root.is_dir():
+            with self._lock:
+                self._forget()
+            return
+        with self._lock, _store_lock(self.root):
+            self._forget()
+            self.snapshot_path.unlink(missing_ok=True)
+            if self.root.is_dir():
+                for log in self.root.glob("ops.*.log"):
+                    log.unlink(missing_ok=True)
+
+
+_STORES: Dict[str, CampaignStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def campaign_store(path: str | Path) -> CampaignStore:
+    """Process-wide store for the save at ``path``."""
+    key = os.path.abspath(path)
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = CampaignStore(path)
+        return store
+
+
+def reset_campaign_stores() -> None:
+    with _STORES_LOCK:
+        _STORES.clear()
+
+
+def read_document(path: str | Path) -> Dict[str, Any]:
+    """The current document for a save: its store if one matches, else the file."""
+    if store_dir(path).joinpath(SNAPSHOT_NAME).exists():
+        doc = campaign_store(path).load()
+        if doc is not None:
+            return doc
+    from .campaign_io import _read_payload
+
+    return _read_payload(Path(path))
+
+
+def discard_store(path: str | Path) -> None:
+    """Drop the store for ``path`` (call after writing the save file directly)."""
+    if store_dir(path).exists() or os.path.abspath(path) in _STORES:
+        campaign_store(path).discard()
+
+
+__all__ = [
+    "CampaignStore",
+    "apply_ops",
+    "campaign_store",
+    "diff_document",
+    "discard_store",
+    "read_document",
+    "reset_campaign_stores",
+    "store_dir",
+]
@@ -22,7 +22,7 @@ import subprocess
 from grimbrain.effects import EffectEngine
 
 from grimbrain.content import cli as content_cli
-from grimbrain.content.ids import canonicalize_id
+from grimbrain.indexing.monster_lookup import open_monster_lookup
 from grimbrain.rules.resolver import RuleResolver
 from grimbrain.rules.evaluator import Evaluator
 
@@ -106,21 +106,6 @@ def _parse_encounter(spec: str) -> List[str]:
     return names
 
 
-def _monster_indexes(manifest: Dict[str, dict]) -> tuple[Dict[str, dict], Dict[str, str]]:
-    id_map: Dict[str, dict] = {}
-    alias_map: Dict[str, str] = {}
-    for entry in manifest.values():
-        if entry.get("doc_type") != "monster":
-            continue
-        cid = canonicalize_id("monster", entry.get("id", ""))
-        id_map[cid] = entry.get("payload", {})
-        alias_map[entry.get("name", "").lower()] = cid
-        alias_map[cid] = cid
-        for a in entry.get("aliases", []) or []:
-            alias_map[str(a).lower()] = cid
-    return id_map, alias_map
-
-
 def _save_party(path: Path, party: List[Dict[str, object]], gold: int, inventory: Dict[str, int]) -> None:
     # Avoid mutating test fixtures in-place.  When the ``--pc`` argument points
     # at the repository's ``tests/fixtures`` directory we skip writing back the
@@ -182,21 +167,20 @@ def main(argv: Optional[List[str]] = None) -> int:
     _run_index_for_play(args, args.json)
 
     chroma_dir = Path(os.getenv("GB_CHROMA_DIR", ".chroma"))
-    manifest = json.loads((chroma_dir / "manifest.json").read_text()) if (chroma_dir / "manifest.json").exists() else {}
-    mon_id_map, mon_alias = _monster_indexes(manifest)
+    monster_lookup = open_monster_lookup(chroma_dir)
 
     party, gold, inventory = _load_party(Path(args.pc))
     monsters: List[Dict[str, object]] = []
     for name in _parse_encounter(args.encounter):
-        key = mon_alias.get(name.lower()) or mon_alias.get(canonicalize_id("monster", name))
+        key = monster_lookup.resolve(name)
         if key is None:
-            sugg = _suggest(name, mon_alias.keys())
+            sugg = monster_lookup.suggest(name)
             msg = f"Unknown monster '{name}'"
             if sugg:
                 msg += ". Did you mean: " + ", ".join(sugg)
             log(msg)
             continue
-        payload = mon_id_map.get(key, {})
+        payload = monster_lookup.payload(key)
         monsters.append({
             "name": payload.get("name", name),
             "hp": int(payload.get("hp", 1)),
@@ -208,6 +192,7 @@ def main(argv: Optional[List[str]] = None) -> int:
             "side": "monsters",
             "tags": set(),
         })
+    monster_lookup.close()
 
     combatants = party + monsters
     name_map = {c["name"].lower(): c for c in combatants}
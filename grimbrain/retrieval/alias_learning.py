@@ -0,0 +1,98 @@
+"""
+alias_learning.py — batched, background persistence of learned aliases.
+
+``query_router`` used to rewrite ``aliases.json`` synchronously whenever a
+query learned an alias.  Learned aliases are now buffered in memory and
+merged into the file by a debounced background timer (and once more at
+interpreter exit), so bulk lookups pay for at most one write per batch.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from . import trace
+
+FLUSH_DELAY = 2.0
+
+
+class AliasLearner:
+    """Buffer ``(type, alias) -> canonical`` pairs and flush them in batches."""
+
+    def __init__(self, path: Path, delay: float = FLUSH_DELAY) -> None:
+        self.path = Path(path)
+        self.delay = delay
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def pending(self) -> Dict[Tuple[str, str], str]:
+        with self._lock:
+            return dict(self._pending)
+
+    def learn(self, qtype: str, alias: str, canonical: str) -> None:
+        with self._lock:
+            self._pending[(qtype, alias)] = canonical
+            if self._timer is None and self.delay >= 0:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> int:
+        """Merge pending aliases into the alias file; returns how many."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            timer, self._timer = self._timer, None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        if not pending:
+            return 0
+        with trace.span("alias_flush", count=len(pending)):
+            data = {}
+            if self.path.exists():
+                try:
+                    data = json.loads(self.path.read_text(encoding="utf-8"))
+                except Exception:
+                    data = {}
+            for (qtype, alias), canonical in pending.items():
+                bucket = data.setdefault(qtype, {})
+                entry = bucket.setdefault(alias, {"canonical": canonical, "also": []})
+                if "also" not in entry or not isinstance(entry["also"], list):
+                    entry["also"] = []
+                if alias not in entry["also"]:
+                    entry["also"].append(alias)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        return len(pending)
+
+
+_LEARNERS: Dict[str, AliasLearner] = {}
+_LEARNERS_LOCK = threading.Lock()
+
+
+def learner_for(path: Path) -> AliasLearner:
+    key = os.path.abspath(path)
+    with _LEARNERS_LOCK:
+        learner = _LEARNERS.get(key)
+        if learner is None:
+            learner = _LEARNERS[key] = AliasLearner(path)
+        return learner
+
+
+def flush_all() -> int:
+    with _LEARNERS_LOCK:
+        learners = list(_LEARNERS.values())
+    return sum(learner.flush() for learner in learners)
+
+
+atexit.register(flush_all)
+
+__all__ = ["AliasLearner", "FLUSH_DELAY", "flush_all", "learner_for"]
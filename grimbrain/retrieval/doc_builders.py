@@ -0,0 +1,346 @@
+"""
+doc_builders.py — typed, size-bounded index text per content kind.
+
+``retrieval.indexing`` turns every resolved data entry into one (or, with
+chunking enabled, a few) index documents.  Each content kind (monster, spell,
+item, feat, class, table) has its own builder that renders only the fields a
+search needs; anything else falls back to a generic builder that keeps
+scalar fields and the ``entries`` prose but never dumps nested structures.
+
+All text is capped at ``max_chars`` (``GB_INDEX_MAX_CHARS``).  With
+``chunk_chars`` (``GB_INDEX_CHUNK_CHARS``) set, long texts are split into
+pre-sized chunks that each repeat the entry name, so the node parser has
+nothing left to re-chunk.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .utils import strip_markup
+
+MAX_DOC_CHARS = 4000
+KINDS = ("monster", "spell", "item", "feat", "class", "table", "generic")
+
+# Bookkeeping fields that never help a search.
+_SKIP_FIELDS = {
+    "page", "srd", "basicRules", "hasFluff", "hasFluffImages", "otherSources",
+    "reprintedAs", "additionalSources", "meta", "edition", "entries",
+}
+_ITEM_FIELDS = {"rarity", "weight", "value", "wondrous", "reqAttune", "weaponCategory", "armor"}
+_FEAT_FOLDERS = ("feats", "optionalfeatures")
+
+# {@spell fireball|phb} -> fireball; bare tags such as {@atk mw} are dropped.
+_TAG_TEXT_RE = re.compile(r"\{@\w+\s+([^}|]*)[^}]*\}")
+
+Built = Tuple[str, Dict[str, Any]]
+
+
+def max_doc_chars() -> int:
+    return int(os.getenv("GB_INDEX_MAX_CHARS", str(MAX_DOC_CHARS)))
+
+
+def chunk_chars() -> int:
+    return int(os.getenv("GB_INDEX_CHUNK_CHARS", "0"))
+
+
+def detect_kind(entry: Dict[str, Any], collection: Optional[str] = None) -> str:
+    """Classify a resolved entry into one of :data:`KINDS`."""
+    entry_type_raw = entry.get("type", "")
+    entry_type = entry_type_raw.lower() if isinstance(entry_type_raw, str) else ""
+    if "hp" in entry or "hit_points" in entry or entry_type in ["npc", "monster"]:
+        return "monster"
+    if "hd" in entry or "className" in entry or "classFeatures" in entry:
+        return "class"
+    if "level" in entry or "school" in entry:
+        return "spell"
+    if "rows" in entry and ("colLabels" in entry or "caption" in entry):
+        return "table"
+    if "prerequisite" in entry or (collection or "").endswith(_FEAT_FOLDERS):
+        return "feat"
+    if _ITEM_FIELDS & entry.keys():
+        return "item"
+    return "generic"
+
+
+# ------------------------------------------------------------------ rendering
+
+def plain(text: str) -> str:
+    """Plain text for embedding: keep tag display text, drop markup."""
+    return strip_markup(_TAG_TEXT_RE.sub(r"\1", text))
+
+
+def bound(text: str, limit: int) -> str:
+    """Cap ``text`` at ``limit`` chars, cutting at a line break when possible."""
+    if limit <= 0 or len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit)
+    if cut < limit // 2:
+        cut = limit
+    return text[:cut].rstrip() + "\n…"
+
+
+def render_entries(value: Any, limit: int) -> str:
+    """Flatten 5eTools ``entries`` prose to plain text, stopping near ``limit``."""
+    lines: List[str] = []
+    size = 0
+
+    def _walk(node: Any) -> None:
+        nonlocal size
+        if size >= limit:
+            return
+        if isinstance(node, str):
+            text = plain(node)
+            if text:
+                lines.append(text)
+                size += len(text) + 1
+        elif isinstance(node, list):
+            for item in node:
+                _walk(item)
+        elif isinstance(node, dict):
+            if isinstance(node.get("name"), str):
+                _walk(node["name"] + ".")
+            for key in ("entries", "items", "entry"):
+                if key in node:
+                    _walk(node[key])
+            if "rows" in node:
+                _walk([" | ".join(str(c) for c in row) for row in node["rows"] if isinstance(row, list)])
+
+    _walk(value)
+    return "\n".join(lines)
+
+
+def _scalar(value: Any) -> Optional[str]:
+    if isinstance(value, (str, int, float, bool)):
+        return plain(value) if isinstance(value, str) else str(value)
+    if isinstance(value, list) and value and all(isinstance(v, (str, int, float)) for v in value):
+        return ", ".join(str(v) for v in value)
+    return None
+
+
+def _fields(entry: Dict[str, Any], keys: Optional[List[str]] = None) -> List[str]:
+    out = []
+    for k in keys if keys is not None else entry.keys():
+        if k in ("name", "source") or k in _SKIP_FIELDS or k.startswith("_"):
+            continue
+        rendered = _scalar(entry.get(k))
+        if rendered:
+            out.append(f"{k}: {rendered}")
+    return out
+
+
+def _join_list(raw: Any) -> str:
+    return ", ".join(str(v) for v in raw) if isinstance(raw, list) else str(raw)
+
+
+# ------------------------------------------------------------------ builders
+
+def _ac_str(entry: Dict[str, Any]) -> str:
+    ac_val = entry.get("ac", entry.get("armor_class", "Unknown"))
+    if isinstance(ac_val, list):
+        return ", ".join(str(x.get("ac", x)) if isinstance(x, dict) else str(x) for x in ac_val)
+    return str(ac_val)
+
+
+def _hp_str(entry: Dict[str, Any]) -> str:
+    hp_val = entry.get("hp", entry.get("hit_points", "Unknown"))
+    return str(hp_val.get("average", hp_val)) if isinstance(hp_val, dict) else str(hp_val)
+
+
+def build_monster(entry: Dict[str, Any], limit: int) -> Built:
+    name = entry.get("name", "Unknown")
+    raw_speed = entry.get("speed", "Unknown")
+    speed_str = ", ".join(f"{k}: {v}" for k, v in raw_speed.items()) if isinstance(raw_speed, dict) else str(raw_speed)
+    ac_str, hp_str = _ac_str(entry), _hp_str(entry)
+    text = (
+        f"{name}\n"
+        f"{entry.get('description', '')}\n\n"
+        f"AC: {ac_str}\n"
+        f"HP: {hp_str}\n"
+        f"Speed: {speed_str}\n"
+        f"STR: {str(entry.get('str', 'Unknown'))}, "
+        f"DEX: {str(entry.get('dex', 'Unknown'))}, "
+        f"CON: {str(entry.get('con', 'Unknown'))}, "
+        f"INT: {str(entry.get('int', 'Unknown'))}, "
+        f"WIS: {str(entry.get('wis', 'Unknown'))}, "
+        f"CHA: {str(entry.get('cha', 'Unknown'))}\n"
+    )
+    return bound(text, limit), {"type": "monster", "hp": hp_str, "ac": ac_str, "speed": speed_str}
+
+
+def build_spell(entry: Dict[str, Any], limit: int) -> Built:
+    name = entry.get("name", "Unknown")
+    body = entry.get("entries", entry.get("desc", []))
+    level = entry.get("level", "Unknown")
+    school = entry.get("school", "Unknown")
+    meta = {
+        "type": "spell",
+        "level": str(level),
+        "school": school,
+        "range": _join_list(entry.get("range", "Unknown")),
+        "damage": _join_list(entry.get("damage", "Unknown")),
+        "components": _join_list(entry.get("components", [])),
+        "duration": str(entry.get("duration", "Unknown")),
+        "casting_time": str(entry.get("time", "Unknown")),
+    }
+    text_body = "\n".join(str(line) for line in body) if isinstance(body, list) else str(body)
+    text = (
+        f"{name}\n"
+        f"Level {level} {school}\n"
+        f"Range: {meta['range']}\n"
+        f"Damage: {meta['damage']}\n"
+        f"Components: {meta['components']}\n"
+        f"Duration: {meta['duration']}\n"
+        f"Casting Time: {meta['casting_time']}\n\n"
+        f"{text_body[:limit]}"
+    )
+    return bound(text, limit), meta
+
+
+def build_item(entry: Dict[str, Any], limit: int) -> Built:
+    head = _fields(entry, ["type", "rarity", "reqAttune", "wondrous", "weaponCategory", "dmg1", "dmgType",
+                           "property", "ac", "value", "weight"])
+    text = "\n".join([str(entry.get("name", "Unknown")), *head, "", render_entries(entry.get("entries"), limit)])
+    meta = {"type": "item"}
+    for key in ("rarity", "value", "weight"):
+        if _scalar(entry.get(key)):
+            meta[key] = _scalar(entry.get(key))
+    if entry.get("reqAttune"):
+        meta["req_attune"] = _scalar(entry["reqAttune"]) or "yes"
+    return bound(text, limit), meta
+
+
+def _brief(value: Any) -> str:
+    if isinstance(value, dict):
+        return ", ".join(str(k) for k in value)
+    if isinstance(value, list):
+        return ", ".join(str(v.get("name", v)) if isinstance(v, dict) else str(v) for v in value)
+    return str(value)
+
+
+def _prerequisite(entry: Dict[str, Any]) -> str:
+    parts = []
+    for prereq in entry.get("prerequisite") or []:
+        if isinstance(prereq, dict):
+            parts.extend(f"{k} {_brief(v)}" for k, v in prereq.items())
+    return "; ".join(parts)
+
+
+def build_feat(entry: Dict[str, Any], limit: int) -> Built:
+    prereq = _prerequisite(entry)
+    lines = [str(entry.get("name", "Unknown"))]
+    if prereq:
+        lines.append(f"Prerequisite: {prereq}")
+    lines += ["", render_entries(entry.get("entries"), limit)]
+    meta = {"type": "feat"}
+    if prereq:
+        meta["prerequisite"] = prereq
+    return bound("\n".join(lines), limit), meta
+
+
+def build_class(entry: Dict[str, Any], limit: int) -> Built:
+    hd = entry.get("hd")
+    lines = [str(entry.get("name", "Unknown"))]
+    lines += _fields(entry, ["className", "subclassShortName", "level", "subclassTitle"])
+    if isinstance(hd, dict):
+        lines.append(f"Hit Die: {hd.get('number', 1)}d{hd.get('faces', '?')}")
+    if isinstance(entry.get("proficiency"), list):
+        lines.append(f"Saving Throws: {_join_list(entry['proficiency'])}")
+    lines += ["", render_entries(entry.get("entries"), limit)]
+    meta = {"type": "class"}
+    if entry.get("className"):
+        meta["class_name"] = str(entry["className"])
+    if entry.get("level") is not None:
+        meta["level"] = str(entry["level"])
+    return bound("\n".join(lines), limit), meta
+
+
+def build_table(entry: Dict[str, Any], limit: int) -> Built:
+    lines = [str(entry.get("name", "Unknown"))]
+    if entry.get("caption"):
+        lines.append(plain(str(entry["caption"])))
+    if isinstance(entry.get("colLabels"), list):
+        lines.append(" | ".join(plain(str(c)) for c in entry["colLabels"]))
+    lines.append(render_entries({"rows": entry.get("rows") or []}, limit))
+    meta = {"type": "table"}
+    if entry.get("caption"):
+        meta["caption"] = str(entry["caption"])
+    return bound("\n".join(lines), limit), meta
+
+
+def build_generic(entry: Dict[str, Any], limit: int) -> Built:
+    text = "\n".join([str(entry.get("name", "Unknown")), *_fields(entry), "", render_entries(entry.get("entries"), limit)])
+    return bound(text.rstrip(), limit), {"type": "generic"}
+
+
+BUILDERS: Dict[str, Callable[[Dict[str, Any], int], Built]] = {
+    "monster": build_monster,
+    "spell": build_spell,
+    "item": build_item,
+    "feat": build_feat,
+    "class": build_class,
+    "table": build_table,
+    "generic": build_generic,
+}
+
+
+def chunk_text(name: str, text: str, size: int) -> List[str]:
+    """Split ``text`` into chunks of about ``size`` chars, each headed by ``name``."""
+    if size <= 0 or len(text) <= size:
+        return [text]
+    chunks: List[str] = []
+    current: List[str] = []
+    length = 0
+    for line in text.split("\n"):
+        for start in range(0, max(len(line), 1), size):
+            piece = line[start:start + size]
+            if current and length + len(piece) + 1 > size:
+                chunks.append("\n".join(current))
+                current, length = [], 0
+            current.append(piece)
+            length += len(piece) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return [chunks[0]] + [f"{name}\n{c}" for c in chunks[1:]]
+
+
+def build_entry(
+    entry: Dict[str, Any],
+    collection: Optional[str] = None,
+    *,
+    limit: Optional[int] = None,
+    chunk: Optional[int] = None,
+) -> List[Built]:
+    """Render ``entry`` to one or more ``(text, metadata)`` pairs."""
+    limit = max_doc_chars() if limit is None else limit
+    chunk = chunk_chars() if chunk is None else chunk
+    name_value = entry.get("name", "Unknown")
+    text, meta = BUILDERS[detect_kind(entry, collection)](entry, limit)
+
+    entry_metadata = {"source": str(entry.get("source", "Unknown")), "name": str(name_value)}
+    entry_metadata.update(meta)
+    if entry.get("doc_type"):      entry_metadata["doc_type"]   = entry["doc_type"]
+    if entry.get("is_variant") is not None: entry_metadata["is_variant"] = entry["is_variant"]
+    if entry.get("variant_of"):    entry_metadata["variant_of"] = entry["variant_of"]
+    if entry.get("priority") is not None:   entry_metadata["priority"]   = entry["priority"]
+    if entry.get("canonical_id"):  entry_metadata["canonical_id"] = entry["canonical_id"]
+
+    chunks = chunk_text(str(name_value), text, chunk)
+    if len(chunks) == 1:
+        return [(text, entry_metadata)]
+    return [(c, {**entry_metadata, "chunk": i, "chunks": len(chunks)}) for i, c in enumerate(chunks)]
+
+
+__all__ = [
+    "BUILDERS",
+    "KINDS",
+    "MAX_DOC_CHARS",
+    "bound",
+    "build_entry",
+    "chunk_text",
+    "detect_kind",
+    "plain",
+    "render_entries",
+]
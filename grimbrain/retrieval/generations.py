@@ -0,0 +1,222 @@
+"""
+generations.py — versioned vector-store directories behind a pointer file.
+
+A full rebuild no longer wipes ``chroma_store`` in place (which meant killing
+every process holding it open).  Instead it builds ``chroma_store.<gen>/`` and
+then atomically rewrites ``chroma_store.current`` to name the new directory.
+Readers resolve the pointer when they (re)open a store, so a long-running
+session keeps querying the old generation until it reopens.
+
+A process using a generation holds a shared ``flock`` on its lease file
+(``chroma_store.<gen>.lease``) until it exits or resets its pools.  Pruning
+takes the lease exclusively before removing a directory and skips any
+generation another process still holds, so old generations are only removed
+once nobody reads them.
+
+Without a pointer file the base directory itself is used, so stores built by
+older versions keep working.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Tuple, Union
+
+from .utils import reset_client_pool
+
+try:  # pragma: no cover - fcntl is missing on Windows
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+POINTER_SUFFIX = ".current"
+LEASE_SUFFIX = ".lease"
+KEEP_GENERATIONS = 2
+
+PathLike = Union[str, Path]
+
+_CURRENT: Dict[str, Tuple[Tuple[int, int], Path]] = {}
+_CURRENT_LOCK = threading.Lock()
+
+_LEASES: Dict[str, IO[bytes]] = {}
+_LEASES_LOCK = threading.Lock()
+
+
+def pointer_path(base: PathLike) -> Path:
+    base = Path(base)
+    return base.with_name(base.name + POINTER_SUFFIX)
+
+
+def current_dir(base: PathLike) -> Path:
+    """Directory of the current generation of ``base`` (``base`` if unversioned)."""
+    pointer = pointer_path(base)
+    try:
+        st = pointer.stat()
+    except OSError:
+        return Path(base)
+    stat_key = (st.st_mtime_ns, st.st_size)
+    key = os.path.abspath(pointer)
+    with _CURRENT_LOCK:
+        cached = _CURRENT.get(key)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+    try:
+        name = pointer.read_text(encoding="utf-8").strip()
+    except OSError:
+        return Path(base)
+    resolved = Path(base).with_name(name) if name else Path(base)
+    with _CURRENT_LOCK:
+        _CURRENT[key] = (stat_key, resolved)
+    return resolved
+
+
+def lease_path(gen_dir: PathLike) -> Path:
+    gen_dir = Path(gen_dir)
+    return gen_dir.with_name(gen_dir.name + LEASE_SUFFIX)
+
+
+def acquire_lease(gen_dir: PathLike) -> bool:
+    """
+    Hold a shared lease on ``gen_dir`` for the rest of this process.
+
+    Returns ``False`` if the directory was pruned before the lease was taken.
+    """
+    key = os.path.abspath(gen_dir)
+    with _LEASES_LOCK:
+        if key in _LEASES:
+            return True
+        if fcntl is None:  # pragma: no cover - prune relies on rmtree failing instead
+            return Path(gen_dir).is_dir()
+        handle = open(lease_path(gen_dir), "a+b")
+        fcntl.flock(handle.fileno(), fcntl.LOCK_SH)  # waits out a prune in progress
+        if not Path(gen_dir).is_dir():
+            handle.close()
+            lease_path(gen_dir).unlink(missing_ok=True)
+            return False
+        _LEASES[key] = handle
+        return True
+
+
+def release_lease(gen_dir: Optional[PathLike] = None) -> None:
+    """Drop this process's lease on ``gen_dir`` (all leases if ``None``)."""
+    with _LEASES_LOCK:
+        keys = list(_LEASES) if gen_dir is None else [os.path.abspath(gen_dir)]
+        for key in keys:
+            handle = _LEASES.pop(key, None)
+            if handle is not None:
+                handle.close()
+
+
+def lease_current(base: PathLike) -> Path:
+    """
+    Resolve the current generation of ``base`` and lease it.
+
+    Only versioned ``<base>.<n>`` directories are leased: an unversioned
+    ``base`` is never pruned, so it needs no lease (and gets no lease file).
+    """
+    while True:
+        path = current_dir(base)
+        if path == Path(base) or not path.is_dir() or acquire_lease(path):
+            return path
+
+
+def generation_dirs(base: PathLike) -> List[Tuple[int, Path]]:
+    """Existing ``<base>.<n>`` directories, oldest first."""
+    base = Path(base)
+    out = []
+    for path in base.parent.glob(f"{base.name}.*"):
+        suffix = path.name[len(base.name) + 1:]
+        if suffix.isdigit() and path.is_dir():
+            out.append((int(suffix), path))
+    return sorted(out)
+
+
+def new_generation(base: PathLike) -> Path:
+    """Create, lease and return an empty directory for the next generation."""
+    base = Path(base)
+    base.parent.mkdir(parents=True, exist_ok=True)
+    gen = max((n for n, _ in generation_dirs(base)), default=0) + 1
+    while True:
+        path = base.with_name(f"{base.name}.{gen}")
+        try:
+            path.mkdir()
+            acquire_lease(path)
+            return path
+        except FileExistsError:  # a concurrent builder took this number
+            gen += 1
+
+
+def publish(base: PathLike, gen_dir: PathLike, keep: int = KEEP_GENERATIONS) -> None:
+    """Atomically make ``gen_dir`` the current generation, then prune old ones."""
+    pointer = pointer_path(base)
+    tmp = pointer.with_name(f"{pointer.name}.{os.getpid()}.tmp")
+    tmp.write_text(Path(gen_dir).name, encoding="utf-8")
+    os.replace(tmp, pointer)
+    prune(base, keep)
+
+
+def prune(base: PathLike, keep: int = KEEP_GENERATIONS) -> List[Path]:
+    """
+    Remove all but the newest ``keep`` generations (never the current one).
+
+    An unversioned ``base`` directory (a store built before generations) is
+    never removed: readers open it without a lease, so delete it by hand once
+    no old process uses it.  This process's own pooled clients and leases on removed generations are
+    dropped; a generation leased by another process is skipped and left for
+    a later prune, as is one that cannot be removed (e.g. open on Windows).
+    """
+    base = Path(base)
+    current = os.path.abspath(current_dir(base))
+    candidates = [p for _, p in generation_dirs(base)]
+    stale = [p for p in candidates if os.path.abspath(p) != current]
+    removed = []
+    for path in stale[: max(0, len(stale) - max(keep - 1, 0))]:
+        reset_client_pool(path)
+        release_lease(path)
+        if _remove_unleased(path):
+            removed.append(path)
+    return removed
+
+
+def _remove_unleased(path: Path) -> bool:
+    if fcntl is None:  # pragma: no cover
+        shutil.rmtree(path, ignore_errors=True)
+        return not path.exists()
+    lease = lease_path(path)
+    with open(lease, "a+b") as handle:
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False  # a reader still holds it
+        shutil.rmtree(path, ignore_errors=True)
+        if path.exists():
+            return False
+        lease.unlink(missing_ok=True)
+    return True
+
+
+def discard(gen_dir: PathLike) -> None:
+    """Drop an unpublished generation (e.g. after a failed build)."""
+    reset_client_pool(gen_dir)
+    release_lease(gen_dir)
+    shutil.rmtree(gen_dir, ignore_errors=True)
+    lease_path(gen_dir).unlink(missing_ok=True)
+
+
+__all__ = [
+    "KEEP_GENERATIONS",
+    "acquire_lease",
+    "current_dir",
+    "discard",
+    "generation_dirs",
+    "lease_current",
+    "lease_path",
+    "new_generation",
+    "pointer_path",
+    "prune",
+    "publish",
+    "release_lease",
+]
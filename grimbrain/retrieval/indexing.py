@@ -1,19 +1,39 @@
 import json
 import hashlib
 import os
-import psutil
-import shutil
-import stat
-from collections import defaultdict
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from chromadb import PersistentClient
 from llama_index.core import VectorStoreIndex, StorageContext
 from llama_index.core.node_parser import SimpleNodeParser
 from llama_index.vector_stores.chroma import ChromaVectorStore
 from llama_index.core.schema import Document
-from .utils import infer_root_key, resolve_copy, stamp_doc_meta, ensure_collection
+try:
+    from llama_index.core.schema import MetadataMode
+except ImportError:  # pragma: no cover - test shim has no metadata modes
+    MetadataMode = None
+from . import generations
+from .doc_builders import build_entry
+from .name_index import IndexedNode, update_name_index
+from .utils import (
+    CopyResolver,
+    collection_for_folder,
+    ensure_collection,
+    folder_for_path,
+    get_persistent_client,
+    infer_root_key,
+    stamp_doc_meta,
+)
 
 HASH_CACHE_FILE = "hash_cache.json"
+COPY_DEPS_FILE = "copy_deps.json"
+COPY_DEPS_VERSION = 2
+INDEX_BATCH_SIZE = 256
 
 def calculate_sha256(file_path: Path) -> str:
     sha256 = hashlib.sha256()
@@ -32,264 +52,501 @@ def save_hash_cache(cache: dict):
     with open(HASH_CACHE_FILE, "w", encoding="utf-8") as f:
         json.dump(cache, f, indent=2)
 
-def kill_other_python_processes():
-    current_pid = os.getpid()
-    current_cmdline = " ".join(psutil.Process(current_pid).cmdline())
-
-    for proc in psutil.process_iter(["pid", "name", "cmdline"]):
-        try:
-            if proc.info["name"] == "python.exe" and proc.pid != current_pid:
-                other_cmdline = " ".join(proc.info["cmdline"])
-                if "main.py" not in other_cmdline:
-                    print(f"⚠️ Killing stray Python: PID={proc.pid}, CMD={other_cmdline}")
-                    proc.kill()
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-
-def force_remove_readonly(func, path, _):
-    os.chmod(path, stat.S_IWRITE)
-    func(path)
-
-def wipe_chroma_store(log_entries):
-    store_path = Path("chroma_store")
-    if store_path.exists():
-        shutil.rmtree(store_path, onerror=force_remove_readonly)
-        print(f"🗑️ Wiped Chroma store: {store_path}")
+def copy_deps_path() -> Path:
+    """The ``_copy`` dependency graph lives next to the hash cache."""
+    return Path(HASH_CACHE_FILE).with_name(COPY_DEPS_FILE)
+
+def load_copy_deps() -> dict:
+    path = copy_deps_path()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != COPY_DEPS_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+def save_copy_deps(records: dict):
+    path = copy_deps_path()
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(
+        json.dumps({"version": COPY_DEPS_VERSION, "files": records}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+def wipe_chroma_store(log_entries, path="chroma_store"):
+    """
+    Point the store at a fresh, empty generation and prune old ones.
+
+    Nothing is killed: the previous generation is kept, and older ones are
+    only removed once no other process holds a lease on them (see
+    ``generations``).
+    """
+    existed = Path(path).exists() or generations.pointer_path(path).exists()
+    generations.publish(path, generations.new_generation(path))
+    if existed:
+        print(f"🗑️ Wiped Chroma store: {path}")
         log_entries.append({
             "file": "ALL",
             "entries": 0,
             "collection": "ALL",
             "status": "Wiped Chroma store"
         })
+
 def flatten_field(value):
     if isinstance(value, dict):
         return ', '.join(f"{k}: {v}" for k, v in value.items())
     return str(value)
 
-def load_and_index_grouped_by_folder(data_dir: Path, embed_model, log_entries, vector_dir="chroma_store", force_wipe=False):
+def load_and_index_grouped_by_folder(
+    data_dir: Path, embed_model, log_entries, vector_dir="chroma_store", force_wipe=False, batch_size=None,
+    workers=None,
+):
+    """
+    Index ``data_dir`` into one Chroma collection per top-level folder.
+
+    Two passes keep memory flat regardless of corpus size: the first records
+    only (name, source) keys and ``_copy`` references per file; the second
+    streams changed files through a memoizing ``CopyResolver`` and embedding in batches
+    of ``batch_size`` documents (``GB_INDEX_BATCH_SIZE``).  Entries in
+    unchanged files that ``_copy`` (transitively) from a changed base entry
+    are re-indexed as well.
+
+    With ``force_wipe`` everything is rebuilt into a new store generation
+    (see ``generations``) that replaces the current one only when complete.
+
+    Docs are built by ``workers`` processes (``GB_INDEX_WORKERS``, default:
+    all cores), embedded with ``get_text_embedding_batch`` and written to
+    Chroma by a single writer thread.
+    """
+    batch_size = batch_size or int(os.getenv("GB_INDEX_BATCH_SIZE", str(INDEX_BATCH_SIZE)))
+    workers = workers or int(os.getenv("GB_INDEX_WORKERS", "0")) or os.cpu_count() or 1
     hash_cache = load_hash_cache()
     updated_hash_cache = hash_cache.copy()
+    old_records = {} if force_wipe else load_copy_deps()
 
-    folder_to_changed_files, folder_entries, folder_filehash = _scan_json_files(
-        data_dir, hash_cache, updated_hash_cache, log_entries, force_wipe
+    folder_to_changed_files, records, folder_filehash = _scan_json_files(
+        data_dir, hash_cache, updated_hash_cache, log_entries, force_wipe, old_records
     )
+    folder_lookup = _lookups_by_folder(records)
+    dependents = _copy_dependents(records, old_records, folder_to_changed_files, folder_lookup)
 
-    for folder, triples in folder_entries.items():
-        safe_folder = "".join(c for c in folder if c.isalnum() or c in "_-").lower()
-        collection_name = f"grim_{safe_folder}"
-
-        all_entries = [e for _, e, _ in triples]
-        global_lookup = _build_global_lookup(all_entries)
-
-        docs = []
-        for rel_path, raw_entry, changed in triples:
-            resolved = resolve_copy(raw_entry, global_lookup) if raw_entry.get("_copy") else raw_entry
-            stamped = stamp_doc_meta(resolved, collection_name)
-            if changed:
-                docs.append(_entry_to_doc(stamped))
-
-        if not docs:
+    tasks = []
+    files_by_collection = defaultdict(set)
+    for folder in folder_lookup:
+        if folder not in folder_to_changed_files and folder not in dependents:
             continue
-
-        _index_docs_to_chroma(
-            docs, folder, folder_to_changed_files, collection_name, vector_dir, embed_model, log_entries
-        )
+        collection_name = collection_for_folder(folder)
+        work = [(rel_path, None) for rel_path in folder_to_changed_files.get(folder, [])]
+        work.extend(sorted(dependents.get(folder, {}).items()))
+        for rel_path, indices in work:
+            tasks.append((folder, collection_name, rel_path, indices))
+            files_by_collection[collection_name].add(rel_path)
+
+    # A forced rebuild goes into a new generation that readers only see once
+    # it is published; incremental updates extend the current one.
+    target_dir = generations.new_generation(vector_dir) if force_wipe else generations.lease_current(vector_dir)
+    pipeline = _IndexPipeline(target_dir, embed_model, batch_size, complete=force_wipe)
+    try:
+        try:
+            for collection_name, docs, build_s in _iter_built_docs(data_dir, folder_lookup, tasks, workers):
+                pipeline.add(collection_name, docs, build_s)
+        finally:
+            stats = pipeline.close()
+    except BaseException:
+        if force_wipe:
+            generations.discard(target_dir)
+        raise
+    if force_wipe:
+        generations.publish(vector_dir, target_dir)
+
+    for collection_name, st in stats.items():
+        if not st["docs"]:
+            continue
+        log_entries.append({
+            "file": ",".join(sorted(files_by_collection[collection_name])),
+            "entries": st["docs"],
+            "collection": collection_name,
+            "status": "Re-indexed (changed)",
+            "seconds": round(st["seconds"], 3),
+        })
 
     save_hash_cache(updated_hash_cache)
+    save_copy_deps(records)
 
-def _scan_json_files(data_dir, hash_cache, updated_hash_cache, log_entries, force_wipe):
-    folder_to_changed_files = defaultdict(list)
-    folder_entries = defaultdict(list)
-    folder_filehash = {}
-
+def _iter_json_files(data_dir):
     for json_file in data_dir.rglob("*.json"):
         if json_file.name.startswith("fluff-") or "foundry" in json_file.name:
             continue
+        yield json_file, json_file.relative_to(data_dir)
+
+def _read_entries(json_file):
+    """Return the entry list of a data file, or ``None`` if it has none."""
+    with open(json_file, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    # Support files that are:
+    # - a dict with a root key (e.g., "monster", "spell", "data") holding a list
+    # - a top-level list of entries
+    # - a single dict entry
+    if isinstance(raw, list):
+        entries = raw
+    elif isinstance(raw, dict):
+        key = infer_root_key(raw)
+        if key and isinstance(raw.get(key), list):
+            entries = raw.get(key, [])
+        else:
+            # Treat the dict itself as a single entry
+            entries = [raw]
+    else:
+        entries = []
+    return entries if isinstance(entries, list) else None
+
+def _scan_json_files(data_dir, hash_cache, updated_hash_cache, log_entries, force_wipe, old_records=None):
+    """
+    First pass: hash every file and record its entry keys and ``_copy``
+    references.  Files whose SHA matches their previous record are not parsed.
+    """
+    old_records = old_records or {}
+    folder_to_changed_files = defaultdict(list)
+    records = {}
+    folder_filehash = {}
 
-        rel_path = json_file.relative_to(data_dir)
-        top_folder = rel_path.parts[0] if len(rel_path.parts) > 1 else rel_path.stem
+    for json_file, rel_path in _iter_json_files(data_dir):
+        top_folder = folder_for_path(rel_path)
         file_hash = calculate_sha256(json_file)
         folder_filehash[str(rel_path)] = file_hash
 
         changed = force_wipe or (str(rel_path) not in hash_cache or hash_cache[str(rel_path)] != file_hash)
 
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-        except Exception as e:
-            print(f"❌ Failed to load {rel_path}: {e}")
-            log_entries.append({
-                "file": str(rel_path), "entries": 0, "collection": "N/A", "status": f"Error: {e}"
-            })
-            continue
-
-        # Support files that are:
-        # - a dict with a root key (e.g., "monster", "spell", "data") holding a list
-        # - a top-level list of entries
-        # - a single dict entry
-        if isinstance(raw, list):
-            key = None
-            entries = raw
-        elif isinstance(raw, dict):
-            key = infer_root_key(raw)
-            if key and isinstance(raw.get(key), list):
-                entries = raw.get(key, [])
-            else:
-                # Treat the dict itself as a single entry
-                entries = [raw]
-        else:
-            key = None
-            entries = []
+        record = old_records.get(str(rel_path))
+        if not record or record.get("sha") != file_hash:
+            try:
+                entries = _read_entries(json_file)
+            except Exception as e:
+                print(f"❌ Failed to load {rel_path}: {e}")
+                log_entries.append({
+                    "file": str(rel_path), "entries": 0, "collection": "N/A", "status": f"Error: {e}"
+                })
+                continue
 
-        if not isinstance(entries, list):
-            print(f"⚠️ Skipping {rel_path} (no list entries found)")
-            continue
+            if entries is None:
+                print(f"⚠️ Skipping {rel_path} (no list entries found)")
+                continue
+            record = _file_record(entries, file_hash)
 
-        for e in entries:
-            folder_entries[top_folder].append((str(rel_path), e, changed))
+        records[str(rel_path)] = record
 
         if changed:
             folder_to_changed_files[top_folder].append(str(rel_path))
             updated_hash_cache[str(rel_path)] = file_hash
 
-    return folder_to_changed_files, folder_entries, folder_filehash
-
-def _build_global_lookup(all_entries):
-    lookup = {}
-    for e in all_entries:
-        key = (e.get("name"), e.get("source"))
-        if not key[0] or not key[1]:
+    return folder_to_changed_files, records, folder_filehash
+
+def _entry_digest(entry):
+    """Return ``(size, digest)`` from one serialization of ``entry``."""
+    payload = json.dumps(entry, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return len(payload), hashlib.sha1(payload).hexdigest()[:16]
+
+def _file_record(entries, file_hash):
+    """
+    Compact per-file record: ``keys`` rows are ``[index, name, source, size,
+    digest]`` and ``copies`` rows are ``[index, base_name, base_source]``.
+    """
+    keys, copies = [], []
+    for i, e in enumerate(entries):
+        if not isinstance(e, dict):
             continue
+        if e.get("name") and e.get("source"):
+            keys.append([i, e["name"], e["source"], *_entry_digest(e)])
+        spec = e.get("_copy")
+        if isinstance(spec, dict):
+            copies.append([i, spec.get("name"), spec.get("source") or spec.get("src") or spec.get("from")])
+    return {"sha": file_hash, "keys": keys, "copies": copies}
+
+def _build_global_lookup(keys, rel_path, lookup=None):
+    """
+    Record ``(name, source) -> (rel_path, index, size, digest)`` for ``keys``.
+
+    On duplicate keys the largest entry (by serialized size, recorded in the
+    first pass) wins; only its location is kept so the entry itself can be
+    reloaded on demand.
+    """
+    lookup = {} if lookup is None else lookup
+    for i, name, source, size, digest in keys:
+        key = (name, source)
         existing = lookup.get(key)
-        if not existing:
-            lookup[key] = e
-        else:
-            if len(str(e)) > len(str(existing)):
-                lookup[key] = e
+        if not existing or size > existing[2]:
+            lookup[key] = (rel_path, i, size, digest)
     return lookup
 
-def _entry_to_doc(entry):
-    name_value = entry.get("name", "Unknown")
-    entry_type_raw = entry.get("type", "")
-    entry_type = entry_type_raw.lower() if isinstance(entry_type_raw, str) else ""
-    is_monster = "hp" in entry or "hit_points" in entry or entry_type in ["npc", "monster"]
-
-    ac_val = entry.get("ac", entry.get("armor_class", "Unknown"))
-    if isinstance(ac_val, list):
-        ac_str = ", ".join(str(x.get("ac", x)) if isinstance(x, dict) else str(x) for x in ac_val)
-    else:
-        ac_str = str(ac_val)
-
-    hp_val = entry.get("hp", entry.get("hit_points", "Unknown"))
-    hp_str = str(hp_val.get("average", hp_val)) if isinstance(hp_val, dict) else str(hp_val)
-
-    raw_speed = entry.get("speed", "Unknown")
-    speed_str = ", ".join(f"{k}: {v}" for k, v in raw_speed.items()) if isinstance(raw_speed, dict) else str(raw_speed)
-    raw_range = entry.get("range", "Unknown")
-    range_str = ", ".join(str(v) for v in raw_range) if isinstance(raw_range, list) else str(raw_range)
-    raw_damage = entry.get("damage", "Unknown")
-    damage_str = ", ".join(str(v) for v in raw_damage) if isinstance(raw_damage, list) else str(raw_damage)
-    raw_components = entry.get("components", [])
-    components_str = ", ".join(raw_components) if isinstance(raw_components, list) else str(raw_components)
-    duration_str = str(entry.get("duration", "Unknown"))
-    casting_time_str = str(entry.get("time", "Unknown"))
-
-    if is_monster:
-        name = entry.get("name", "Unknown")
-        description = entry.get("description", "")
-        text = (
-            f"{name}\n"
-            f"{description}\n\n"
-            f"AC: {ac_str}\n"
-            f"HP: {hp_str}\n"
-            f"Speed: {speed_str}\n"
-            f"STR: {str(entry.get('str', 'Unknown'))}, "
-            f"DEX: {str(entry.get('dex', 'Unknown'))}, "
-            f"CON: {str(entry.get('con', 'Unknown'))}, "
-            f"INT: {str(entry.get('int', 'Unknown'))}, "
-            f"WIS: {str(entry.get('wis', 'Unknown'))}, "
-            f"CHA: {str(entry.get('cha', 'Unknown'))}\n"
-        )
-        print(f"🧾 Indexed '{name_value}' as monster")
-
-    elif "level" in entry or "school" in entry:
-        body = entry.get("entries", entry.get("desc", []))
-        level = entry.get("level", "Unknown")
-        school = entry.get("school", "Unknown")
-        text_body = "\n".join(str(line) for line in body) if isinstance(body, list) else str(body)
-        text = (
-            f"{name_value}\n"
-            f"Level {level} {school}\n"
-            f"Range: {range_str}\n"
-            f"Damage: {damage_str}\n"
-            f"Components: {components_str}\n"
-            f"Duration: {duration_str}\n"
-            f"Casting Time: {casting_time_str}\n\n"
-            f"{text_body}"
-        )
-        print(f"📘 Indexed '{name_value}' as spell-like")
-    else:
-        lines = [f"{k}: {v}" for k, v in entry.items()]
-        text = f"{name_value}\n" + "\n".join(lines)
-        print(f"📦 Indexed '{name_value}' as generic")
-
-    entry_metadata = {
-        "source": str(entry.get("source", "Unknown")),
-        "name": str(name_value)
-    }
-
-    if is_monster:
-        entry_metadata.update({
-            "type": "monster",
-            "hp": hp_str,
-            "ac": ac_str,
-            "speed": speed_str
-        })
-    elif "level" in entry or "school" in entry:
-        entry_metadata.update({
-            "type": "spell",
-            "level": str(entry.get("level", "Unknown")),
-            "school": entry.get("school", "Unknown"),
-            "range": range_str,
-            "damage": damage_str,
-            "components": components_str,
-            "duration": duration_str,
-            "casting_time": casting_time_str
-        })
-    else:
-        entry_metadata["type"] = "generic"
-
-    if entry.get("doc_type"):      entry_metadata["doc_type"]   = entry["doc_type"]
-    if entry.get("is_variant") is not None: entry_metadata["is_variant"] = entry["is_variant"]
-    if entry.get("variant_of"):    entry_metadata["variant_of"] = entry["variant_of"]
-    if entry.get("priority") is not None:   entry_metadata["priority"]   = entry["priority"]
-    if entry.get("canonical_id"):  entry_metadata["canonical_id"] = entry["canonical_id"]
-
-    doc = Document(text=text, metadata=entry_metadata)
-    return doc
-
-def _index_docs_to_chroma(
-    docs, folder, folder_to_changed_files, collection_name, vector_dir, embed_model, log_entries
-):
-    print(f"\n📦 Indexing collection '{collection_name}' with {len(docs)} updated documents...")
-    log_entries.append({
-        "file": ",".join(sorted(set(folder_to_changed_files[folder]))),
-        "entries": len(docs),
-        "collection": collection_name,
-        "status": "Re-indexed (changed)"
-    })
-
-    chroma_client = PersistentClient(path=vector_dir)
-    collection = ensure_collection(chroma_client, collection_name, embed_model)
-    vector_store = ChromaVectorStore.from_collection(collection)
+def _lookups_by_folder(records):
+    folder_lookup = defaultdict(dict)
+    for rel_path, record in records.items():
+        _build_global_lookup(record["keys"], rel_path, folder_lookup[folder_for_path(Path(rel_path))])
+    return folder_lookup
+
+def _copy_dependents(records, old_records, folder_to_changed_files, folder_lookup):
+    """
+    Find entries outside changed files that must be re-resolved because a
+    (transitive) ``_copy`` base changed.  Returns ``{folder: {rel_path: [index, ...]}}``.
+    """
+    old_lookup = _lookups_by_folder({p: r for p, r in old_records.items() if isinstance(r, dict)})
+    out = {}
+    for folder, changed_files in folder_to_changed_files.items():
+        new_lookup, prev_lookup = folder_lookup[folder], old_lookup.get(folder, {})
+        changed_keys = set()
+        for rel_path in changed_files:
+            for rec in (records.get(rel_path), old_records.get(rel_path)):
+                for _, name, source, _, _ in (rec or {}).get("keys", []):
+                    old, new = prev_lookup.get((name, source)), new_lookup.get((name, source))
+                    if not old or not new or old[3] != new[3]:
+                        changed_keys.add((name, source))
+        if not changed_keys:
+            continue
 
+        graph = defaultdict(list)
+        own_key = {}
+        for rel_path, record in records.items():
+            if folder_for_path(Path(rel_path)) != folder:
+                continue
+            for i, name, source, _, _ in record["keys"]:
+                own_key[(rel_path, i)] = (name, source)
+            for i, base_name, base_source in record["copies"]:
+                graph[(base_name, base_source)].append((rel_path, i))
+
+        changed = set(changed_files)
+        seen, stack, hits = set(changed_keys), list(changed_keys), defaultdict(set)
+        while stack:
+            for rel_path, i in graph.get(stack.pop(), ()):
+                if rel_path not in changed:
+                    hits[rel_path].add(i)
+                key = own_key.get((rel_path, i))
+                if key and key not in seen:
+                    seen.add(key)
+                    stack.append(key)
+        if hits:
+            out[folder] = {rel_path: sorted(idx) for rel_path, idx in hits.items()}
+    return out
+
+class _EntryLoader:
+    """Re-read data files on demand, keeping only a few parsed files alive."""
+
+    def __init__(self, data_dir, max_files=8):
+        self.data_dir = Path(data_dir)
+        self.max_files = max_files
+        self._files = OrderedDict()
+
+    def entries(self, rel_path):
+        cached = self._files.get(rel_path)
+        if cached is not None:
+            self._files.move_to_end(rel_path)
+            return cached
+        entries = _read_entries(self.data_dir / rel_path) or []
+        self._files[rel_path] = entries
+        if len(self._files) > self.max_files:
+            self._files.popitem(last=False)
+        return entries
+
+    def resolver(self, lookup):
+        def _resolve(name, source):
+            loc = lookup.get((name, source))
+            if loc is None:
+                return None
+            entries = self.entries(loc[0])
+            return entries[loc[1]] if loc[1] < len(entries) else None
+        return _resolve
+
+_WORKER = {}
+
+def _init_doc_worker(data_dir, folder_lookup):
+    _WORKER.clear()
+    _WORKER.update(loader=_EntryLoader(data_dir), lookups=folder_lookup, resolvers={})
+
+def _build_docs(folder, collection_name, rel_path, indices):
+    """
+    Resolve and build the docs for one file (``indices=None`` means every
+    entry).  Runs in a worker process; ``_copy`` bases are memoized per folder.
+    """
+    t0 = time.perf_counter()
+    loader = _WORKER["loader"]
+    resolver = _WORKER["resolvers"].get(folder)
+    if resolver is None:
+        resolver = CopyResolver(loader.resolver(_WORKER["lookups"][folder]))
+        _WORKER["resolvers"][folder] = resolver
+    entries = loader.entries(rel_path)
+    selected = entries if indices is None else [entries[i] for i in indices if i < len(entries)]
+    docs = []
+    for raw_entry in selected:
+        resolved = resolver.resolve(raw_entry) if raw_entry.get("_copy") else raw_entry
+        docs.extend(_entry_to_docs(stamp_doc_meta(resolved, collection_name), collection_name))
+    return collection_name, docs, time.perf_counter() - t0
+
+def _iter_built_docs(data_dir, folder_lookup, tasks, workers):
+    """Yield ``(collection, docs, seconds)`` per task, in task order."""
+    if workers <= 1 or len(tasks) <= 1:
+        _init_doc_worker(data_dir, folder_lookup)
+        try:
+            for task in tasks:
+                yield _build_docs(*task)
+        finally:
+            _WORKER.clear()
+        return
+
+    pending = deque()
+    remaining = iter(tasks)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_doc_worker, initargs=(data_dir, dict(folder_lookup))
+    ) as pool:
+        # Keep a bounded number of files in flight so built docs don't pile up
+        # faster than they can be embedded.
+        for task in islice(remaining, workers * 2):
+            pending.append(pool.submit(_build_docs, *task))
+        while pending:
+            result = pending.popleft().result()
+            task = next(remaining, None)
+            if task is not None:
+                pending.append(pool.submit(_build_docs, *task))
+            yield result
+
+def _embed_docs(docs, embed_model):
+    """Parse docs into nodes and embed them in one ``get_text_embedding_batch`` call."""
     for doc in docs:
         doc.metadata = flatten_metadata(doc.metadata)
-
     nodes = SimpleNodeParser().get_nodes_from_documents(docs)
+    embed_batch = getattr(embed_model, "get_text_embedding_batch", None)
+    if nodes and embed_batch is not None:
+        texts = [_embed_text(n) for n in nodes]
+        try:
+            vectors = embed_batch(texts, show_progress=False)
+        except TypeError:
+            vectors = embed_batch(texts)
+        # Nodes that already carry an embedding are not re-embedded on insert.
+        for node, vector in zip(nodes, vectors):
+            node.embedding = list(vector)
+    return nodes
+
+def _embed_text(node):
+    if MetadataMode is not None:
+        return node.get_content(metadata_mode=MetadataMode.EMBED)
+    return node.get_content()
+
+class _IndexPipeline:
+    """
+    Buffer built docs per collection, embed them in ``batch_size`` batches on
+    the calling thread and hand the embedded nodes to a single writer thread,
+    which owns every Chroma write.  ``complete`` marks the name indexes it
+    writes as covering whole collections (a full build).
+    """
+
+    def __init__(self, vector_dir, embed_model, batch_size, complete=False):
+        self.vector_dir = vector_dir
+        self.complete = complete
+        self.embed_model = embed_model
+        self.batch_size = batch_size
+        self.buffers = defaultdict(list)
+        self.stats = {}
+        self.rows = defaultdict(list)
+        self.error = None
+        self._queue = queue.Queue(maxsize=2)
+        self._writer = threading.Thread(target=self._write_loop, name="grimbrain-index-writer", daemon=True)
+        self._writer.start()
+
+    def _stat(self, collection_name):
+        st = self.stats.get(collection_name)
+        if st is None:
+            st = self.stats[collection_name] = {
+                "docs": 0, "batches": 0, "build_s": 0.0, "embed_s": 0.0, "write_s": 0.0,
+                "started": time.perf_counter(), "seconds": 0.0, "chars": 0, "kinds": defaultdict(int),
+            }
+        return st
+
+    def add(self, collection_name, docs, build_s=0.0):
+        st = self._stat(collection_name)
+        st["build_s"] += build_s
+        for doc in docs:
+            st["kinds"][doc.metadata.get("type", "generic")] += 1
+            st["chars"] += len(doc.text)
+        buf = self.buffers[collection_name]
+        buf.extend(docs)
+        while len(buf) >= self.batch_size:
+            self._submit(collection_name, buf[:self.batch_size])
+            del buf[:self.batch_size]
+
+    def _submit(self, collection_name, docs):
+        if self.error is not None:
+            raise self.error
+        st = self._stat(collection_name)
+        t0 = time.perf_counter()
+        nodes = _embed_docs(docs, self.embed_model)
+        st["embed_s"] += time.perf_counter() - t0
+        st["docs"] += len(docs)
+        st["batches"] += 1
+        self._queue.put((collection_name, nodes))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue
+            collection_name, nodes = item
+            t0 = time.perf_counter()
+            try:
+                rows = _index_docs_to_chroma(nodes, collection_name, self.vector_dir, self.embed_model)
+            except BaseException as e:  # surfaced on the caller's thread
+                self.error = e
+                continue
+            self.rows[collection_name].extend(rows)
+            self.stats[collection_name]["write_s"] += time.perf_counter() - t0
+
+    def close(self):
+        """Flush partial batches, stop the writer and update the name indexes."""
+        try:
+            if self.error is None:
+                for collection_name, buf in self.buffers.items():
+                    if buf:
+                        self._submit(collection_name, list(buf))
+                        buf.clear()
+        finally:
+            self._queue.put(None)
+            self._writer.join()
+        if self.error is not None:
+            raise self.error
+        for collection_name, rows in self.rows.items():
+            if rows:
+                update_name_index(collection_name, rows, self.vector_dir, complete=self.complete)
+        for collection_name, st in self.stats.items():
+            st["seconds"] = time.perf_counter() - st["started"]
+            if st["docs"]:
+                print(
+                    f"📦 {collection_name}: {st['docs']} docs in {st['batches']} batches, "
+                    f"{st['seconds']:.1f}s ({st['docs'] / max(st['seconds'], 1e-9):.0f} docs/s; "
+                    f"build {st['build_s']:.1f}s, embed {st['embed_s']:.1f}s, write {st['write_s']:.1f}s; "
+                    f"{st['chars']} chars; "
+                    + ", ".join(f"{kind}={n}" for kind, n in sorted(st["kinds"].items()))
+                    + ")"
+                )
+        return self.stats
+
+def _entry_to_docs(entry, collection_name=None):
+    """Typed, size-bounded Documents for one resolved entry (see ``doc_builders``)."""
+    return [Document(text=text, metadata=meta) for text, meta in build_entry(entry, collection_name)]
+
+def _index_docs_to_chroma(nodes, collection_name, vector_dir, embed_model):
+    """Write one batch of embedded nodes to Chroma; returns name-index rows for them."""
+    chroma_client = get_persistent_client(vector_dir, PersistentClient)
+    collection = ensure_collection(chroma_client, collection_name, embed_model)
+    vector_store = ChromaVectorStore.from_collection(collection)
+
     storage_context = StorageContext.from_defaults(vector_store=vector_store)
     index = VectorStoreIndex(nodes, storage_context=storage_context, embed_model=embed_model)
     index.storage_context.persist()
+    # Keep only what the name index needs, not the nodes and their embeddings.
+    return [IndexedNode(str(n.node_id), n.get_content(), dict(n.metadata or {})) for n in nodes]
 
 def flatten_metadata(meta: dict) -> dict:
     flat_meta = {}
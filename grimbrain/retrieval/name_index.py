@@ -0,0 +1,204 @@
+"""
+name_index.py — inverted index over entry names for exact/prefix lookups.
+
+``retrieval.indexing`` writes one ``<collection>.json`` per collection under
+``<vector_dir>/name_index/`` holding the indexed node text and metadata.
+``query_router`` loads it lazily and, when a query names an entry exactly
+(e.g. "goblin", "booyahg whip"), builds its hit list from the index instead of
+running a vector search.  Anything else falls back to Chroma.
+
+An index is only trusted once a full (``force_wipe``) build has written it
+with ``"complete": true``; incremental runs keep that flag when they merge
+into a complete index, but an index they start from scratch covers only the
+files that changed and is ignored.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .utils import _norm, _tokens
+
+NAME_INDEX_DIRNAME = "name_index"
+INDEX_VERSION = 1
+MAX_CANDIDATES = 200
+
+
+@dataclass
+class IndexedNode:
+    """Minimal node exposing the attributes retrieval helpers read."""
+
+    id: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def node_id(self) -> str:
+        return self.id
+
+    def get_content(self) -> str:
+        return self.text
+
+    get_text = get_content
+
+
+@dataclass
+class IndexedHit:
+    """Stand-in for ``NodeWithScore``; name hits carry no vector score."""
+
+    node: IndexedNode
+    score: float = 0.0
+
+
+def index_path(collection: str, vector_dir: str | Path = "chroma_store") -> Path:
+    return Path(vector_dir) / NAME_INDEX_DIRNAME / f"{collection}.json"
+
+
+def _entry_key(meta: Dict[str, Any]) -> Tuple[str, str]:
+    return str(meta.get("name") or ""), str(meta.get("source") or "")
+
+
+def update_name_index(
+    collection: str, nodes: Iterable[Any], vector_dir: str | Path = "chroma_store", complete: bool = False
+) -> Path:
+    """
+    Merge freshly indexed ``nodes`` into the collection's name index.
+
+    Entries are keyed by (name, source); re-indexing an entry replaces every
+    node previously recorded for it.  Pass ``complete=True`` when ``nodes``
+    are the whole collection (a full build); otherwise the result is complete
+    only if the index merged into was.
+    """
+    path = index_path(collection, vector_dir)
+    fresh: List[dict] = []
+    for node in nodes:
+        meta = dict(getattr(node, "metadata", None) or {})
+        node_id = getattr(node, "node_id", None) or getattr(node, "id_", None) or getattr(node, "id", None)
+        text = node.get_content() if hasattr(node, "get_content") else getattr(node, "text", "")
+        fresh.append({"id": str(node_id), "text": text or "", "metadata": meta})
+
+    replaced = {_entry_key(e["metadata"]) for e in fresh}
+    old_entries, old_complete = _read_index(path)
+    entries = [e for e in old_entries if _entry_key(e.get("metadata") or {}) not in replaced]
+    entries.extend(fresh)
+    complete = complete or old_complete
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(
+        json.dumps({"version": INDEX_VERSION, "complete": complete, "entries": entries}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+    return path
+
+
+def _read_index(path: Path) -> Tuple[List[dict], bool]:
+    """Entries and ``complete`` flag of the index at ``path``."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return [], False
+    if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+        return [], False
+    entries = data.get("entries")
+    if not isinstance(entries, list):
+        return [], False
+    return entries, data.get("complete") is True
+
+
+class NameIndex:
+    """Posting lists from normalized names and name tokens to entries."""
+
+    def __init__(self, entries: List[dict]) -> None:
+        self.entries = entries
+        self.exact: Dict[str, List[int]] = {}
+        self.tokens: Dict[str, List[int]] = {}
+        for i, entry in enumerate(entries):
+            name = (entry.get("metadata") or {}).get("name") or ""
+            self.exact.setdefault(_norm(name), []).append(i)
+            for tok in set(_tokens(name)):
+                self.tokens.setdefault(tok, []).append(i)
+
+    def lookup(self, query: str) -> List[IndexedHit]:
+        """
+        Return hits for an exact-name query, or ``[]`` to request a fallback.
+
+        Only queries whose normalized form equals some entry name qualify.
+        The hit list then holds every entry whose name contains all query
+        tokens (the same candidates the reranker's name pre-order favours),
+        exact matches first.
+        """
+        q_norm = _norm(query)
+        exact = self.exact.get(q_norm)
+        if not q_norm or not exact:
+            return []
+        q_tokens = _tokens(query)
+        ids = list(exact)
+        if q_tokens:
+            postings = [set(self.tokens.get(t, ())) for t in q_tokens]
+            covering = set.intersection(*postings) - set(exact)
+            ids.extend(sorted(covering, key=lambda i: (self._name(i), i)))
+        return [self._hit(i) for i in ids[:MAX_CANDIDATES]]
+
+    def _name(self, i: int) -> str:
+        return _norm((self.entries[i].get("metadata") or {}).get("name") or "")
+
+    def _hit(self, i: int) -> IndexedHit:
+        entry = self.entries[i]
+        # Copy metadata: the reranker rewrites ``name`` on some hits.
+        node = IndexedNode(entry.get("id", ""), entry.get("text", ""), dict(entry.get("metadata") or {}))
+        return IndexedHit(node)
+
+
+_LOADED: Dict[str, Tuple[Optional[Tuple[int, int]], Optional[NameIndex]]] = {}
+_LOADED_LOCK = threading.Lock()
+
+
+def get_name_index(collection: str, vector_dir: str | Path = "chroma_store") -> Optional[NameIndex]:
+    """Load (once per on-disk version) the name index for ``collection``; ``None`` unless complete."""
+    path = index_path(collection, vector_dir)
+    try:
+        st = path.stat()
+        stat_key: Optional[Tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stat_key = None
+    key = os.path.abspath(path)
+    with _LOADED_LOCK:
+        cached = _LOADED.get(key)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+    index = None
+    if stat_key is not None:
+        entries, complete = _read_index(path)
+        index = NameIndex(entries) if complete else None
+    with _LOADED_LOCK:
+        _LOADED[key] = (stat_key, index)
+    return index
+
+
+def lookup(collection: str, query: str, vector_dir: str | Path = "chroma_store") -> List[IndexedHit]:
+    index = get_name_index(collection, vector_dir)
+    return index.lookup(query) if index is not None else []
+
+
+def reset_loaded() -> None:
+    with _LOADED_LOCK:
+        _LOADED.clear()
+
+
+__all__ = [
+    "IndexedHit",
+    "IndexedNode",
+    "NameIndex",
+    "get_name_index",
+    "index_path",
+    "lookup",
+    "reset_loaded",
+    "update_name_index",
+]
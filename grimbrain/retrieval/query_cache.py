@@ -0,0 +1,193 @@
+"""
+query_cache.py — memoized ``run_query`` results.
+
+Entries are ``(markdown, json_sidecar, provenance)`` tuples kept in an
+in-process LRU and, optionally, mirrored to one JSON file per key on disk.
+Keys embed the collection's index signature (derived from the
+``hash_cache.json`` that ``retrieval.indexing`` rewrites after every
+re-index), so a rebuilt collection never serves stale answers.
+
+Environment:
+  GB_QUERY_CACHE=0         disable caching entirely
+  GB_QUERY_CACHE_SIZE=N    in-memory LRU capacity (default 256)
+  GB_QUERY_CACHE_DIR=path  also persist entries under ``path``
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from grimbrain.indexing.content_index import index_signature
+
+from .utils import collection_for_folder, folder_for_path
+
+# Same file ``retrieval.indexing`` maintains (relative to the working dir).
+HASH_CACHE_FILE = "hash_cache.json"
+
+CacheValue = Tuple[str, Optional[dict], Optional[list]]
+
+_SIG_LOCK = threading.Lock()
+_SIG_STATE: Dict[str, Any] = {"stat": None, "sigs": {}}
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def collection_signature(collection_name: str, hash_cache_file: str | Path | None = None) -> Optional[str]:
+    """
+    Return a short signature of the files indexed into ``collection_name``.
+
+    Signatures are computed with :func:`content_index.index_signature` over
+    the ``(collection, file) -> sha256`` rows of the hash cache and memoized
+    until the hash cache file changes on disk.  ``None`` means no index has
+    been recorded, in which case callers should not cache.
+    """
+    path = Path(hash_cache_file or HASH_CACHE_FILE)
+    key = _stat_key(path)
+    if key is None:
+        return None
+    with _SIG_LOCK:
+        if _SIG_STATE["stat"] == (str(path.resolve()), key):
+            return _SIG_STATE["sigs"].get(collection_name)
+        try:
+            hashes = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        grouped: Dict[str, Dict[Tuple[str, str], str]] = {}
+        for rel_path, sha in (hashes or {}).items():
+            coll = collection_for_folder(folder_for_path(rel_path))
+            grouped.setdefault(coll, {})[(coll, rel_path)] = str(sha)
+        sigs = {coll: index_signature(items) for coll, items in grouped.items()}
+        _SIG_STATE["stat"] = (str(path.resolve()), key)
+        _SIG_STATE["sigs"] = sigs
+        return sigs.get(collection_name)
+
+
+def make_key(*parts: Any) -> str:
+    """Stable digest for a tuple of key parts."""
+    blob = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class QueryCache:
+    """Thread-safe LRU of query results with an optional on-disk mirror."""
+
+    def __init__(self, max_entries: int = 256, disk_dir: str | Path | None = None) -> None:
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._lru: OrderedDict[str, CacheValue] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheValue]:
+        with self._lock:
+            value = self._lru.get(key)
+            if value is not None:
+                self._lru.move_to_end(key)
+                return _copy_value(value)
+        value = self._disk_get(key)
+        if value is not None:
+            self._remember(key, value)
+            return _copy_value(value)
+        return None
+
+    def put(self, key: str, value: CacheValue) -> None:
+        value = _copy_value(value)
+        self._remember(key, value)
+        self._disk_put(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    # internals ---------------------------------------------------------
+    def _remember(self, key: str, value: CacheValue) -> None:
+        with self._lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _disk_get(self, key: str) -> Optional[CacheValue]:
+        path = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            md, sidecar, prov = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        return md, sidecar, prov
+
+    def _disk_put(self, key: str, value: CacheValue) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        try:
+            payload = json.dumps(list(value), ensure_ascii=False)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, path)
+        except Exception:
+            pass
+
+
+def _copy_value(value: CacheValue) -> CacheValue:
+    md, sidecar, prov = value
+    return md, copy.deepcopy(sidecar), list(prov) if prov is not None else None
+
+
+_DEFAULT: Optional[QueryCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def cache_enabled() -> bool:
+    return os.getenv("GB_QUERY_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def default_cache() -> QueryCache:
+    """Process-wide cache configured from the environment on first use."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            try:
+                size = int(os.getenv("GB_QUERY_CACHE_SIZE", "256"))
+            except ValueError:
+                size = 256
+            _DEFAULT = QueryCache(max_entries=size, disk_dir=os.getenv("GB_QUERY_CACHE_DIR") or None)
+        return _DEFAULT
+
+
+def reset_default_cache() -> None:
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        _DEFAULT = None
+
+
+__all__ = [
+    "QueryCache",
+    "collection_signature",
+    "default_cache",
+    "reset_default_cache",
+    "cache_enabled",
+    "make_key",
+]
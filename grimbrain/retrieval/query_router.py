@@ -16,9 +16,10 @@ except Exception:
 
 import json
 import os
+import threading
 from pathlib import Path
 from datetime import datetime
-import re
+from ..config import flag
 from ..formatters import (
     auto_format,
     item_to_json,
@@ -30,7 +31,18 @@ from ..formatters import (
 )
 from ..formatters.monster_formatter import monster_to_json
 from ..formatters.spell_formatter import spell_to_json
-from .utils import ensure_collection, hit_text, ordinal
+from . import query_cache
+from . import alias_learning, generations, name_index, trace
+from .reranker import _node_meta, covers_all, rerank
+from .utils import (
+    _norm,
+    _tokens,
+    ensure_collection,
+    get_persistent_client,
+    hit_text,
+    ordinal,
+    reset_client_pool,
+)
 from llama_index.core.llms.mock import MockLLM
 from llama_index.core import VectorStoreIndex
 from llama_index.vector_stores.chroma import ChromaVectorStore
@@ -143,28 +155,6 @@ def _spell_json_to_markdown(data: Dict[str, Any]) -> str:
             lines.append(f"- {p}")
     return "\n".join(lines)
 
-# Common text-processing helpers
-STOPWORDS = {
-    "the","a","an","of","and","or","to","for","from","with","in","on","at",
-    "by","as","is","are","was","were","be","it","this","that","these","those"
-}
-
-def _norm(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", " ", (s or "").lower()).strip()
-
-def _tokens(s: str):
-    return [t for t in _norm(s).split() if t and t not in STOPWORDS]
-
-def _node_meta(hit):
-    node = getattr(hit, "node", None)
-    meta = getattr(node, "metadata", None) or getattr(node, "extra_info", None) or {}
-    if isinstance(meta, str):
-        try:
-            meta = json.loads(meta)
-        except Exception:
-            meta = {}
-    return meta
-
 def provenance_from_results(results) -> List[str]:
     prov: List[str] = []
     for r in results[:3]:
@@ -174,12 +164,6 @@ def provenance_from_results(results) -> List[str]:
         prov.append(f"{src} · {nm}")
     return prov
 
-SOURCE_BOOSTS = {
-    "MM": 1.0,      # Monster Manual
-    "MPMM": 0.6,    # Monsters of the Multiverse
-    "VGM": 0.4,     # Volo's Guide (for Booyahg variants)
-}
-
 def detect_type_auto(query: str) -> str:
     lowered = query.lower()
     for type_, keywords in AUTO_KEYWORDS.items():
@@ -187,6 +171,44 @@ def detect_type_auto(query: str) -> str:
             return type_
     return "rule"  # default fallback
 
+# Process-level pool of index wrappers keyed by (store path, collection,
+# embedder).  Building a ``VectorStoreIndex`` is cheap compared to opening the
+# persistent client, but both are now done once per collection instead of on
+# every lookup; ``as_query_engine`` only binds the requested ``top_k``.
+VECTOR_DIR = "chroma_store"
+MAX_TOP_K = 200
+_ENGINE_POOL: Dict[tuple, tuple] = {}
+_ENGINE_POOL_LOCK = threading.Lock()
+_EMBED_WARNED = False
+
+
+def reset_engine_pool() -> None:
+    """Drop pooled clients and indexes (e.g. after the store was wiped)."""
+    with _ENGINE_POOL_LOCK:
+        _ENGINE_POOL.clear()
+    reset_client_pool()
+    generations.release_lease()
+
+
+def _pooled_index(collection_name: str, embedder):
+    # Resolved per call: a published rebuild is picked up on the next lookup,
+    # while engines already handed out keep using their generation.
+    vector_dir = generations.lease_current(VECTOR_DIR)
+    client = get_persistent_client(vector_dir, PersistentClient)
+    key = (os.path.abspath(vector_dir), collection_name, id(embedder))
+    with _ENGINE_POOL_LOCK:
+        cached = _ENGINE_POOL.get(key)
+        # Rebuild if the pooled client was replaced (store wiped/reopened) or
+        # the embedder object we keyed on was garbage collected and reused.
+        if cached and cached[0] is client and cached[1] is embedder:
+            return cached[2]
+        collection = ensure_collection(client, collection_name, embedder)
+        vector_store = ChromaVectorStore.from_collection(collection)
+        index = VectorStoreIndex.from_vector_store(vector_store, embed_model=embedder)
+        _ENGINE_POOL[key] = (client, embedder, index)
+        return index
+
+
 def get_query_engine(collection_name: str, embed_model=None, top_k: int | None = None):
     # Always use local embeddings (no OpenAI) unless explicitly overridden.
     if Settings and CustomLocalEmbedding:
@@ -195,39 +217,54 @@ def get_query_engine(collection_name: str, embed_model=None, top_k: int | None =
                 Settings.embed_model = CustomLocalEmbedding(model_name=LOCAL_EMBED_MODEL)
                 _log(f"✅ Using local embedding: {LOCAL_EMBED_MODEL}")
             else:
-                _log("✅ Using preconfigured embedding model")
+                trace.event("embed_model", preconfigured=True)
         except Exception as e:
             print(f"⚠️ Failed to initialize local embedding: {e}", file=sys.stderr)
     else:
-        if not os.getenv("SUPPRESS_EMBED_WARNING"):
+        global _EMBED_WARNED
+        if not os.getenv("SUPPRESS_EMBED_WARNING") and not _EMBED_WARNED:
+            _EMBED_WARNED = True
             print(
                 "⚠️ Embedding not configured (Settings/CustomLocalEmbedding unavailable). Proceeding anyway.",
                 file=sys.stderr,
             )
 
-    client = PersistentClient(path="chroma_store")
     embedder = embed_model or (Settings.embed_model if Settings else None)
-    collection = ensure_collection(client, collection_name, embedder)
-    vector_store = ChromaVectorStore.from_collection(collection)
-
     k = top_k if top_k is not None else 10
-    return VectorStoreIndex.from_vector_store(
-        vector_store, embed_model=embedder
-    ).as_query_engine(similarity_top_k=k)
+    return _pooled_index(collection_name, embedder).as_query_engine(similarity_top_k=k)
 
 def pick_top_k(q: str) -> int:
     return 50 if any(len(t) >= 4 for t in _tokens(q)) else 15
 
 
-def retrieve_with_backoff(collection: str, embed_model, query: str, token: str, start_k: int) -> List[Any]:
+def _retrieve_upto(collection: str, embed_model, query: str, k: int, memo: Optional[dict] = None) -> List[Any]:
+    """Return the top ``k`` hits for ``query``, reusing a larger earlier fetch.
+
+    ``memo`` maps a query string to the hits of the widest retrieval issued so
+    far.  Vector results are ordered by similarity, so the top ``k`` of a
+    wider fetch are exactly what a ``top_k=k`` query would return.
+    """
+    if memo is not None:
+        prev = memo.get(query)
+        if prev is not None and (prev[0] >= k or len(prev[1]) < prev[0]):
+            return prev[1][:k]
+    hits = get_query_engine(collection, embed_model=embed_model, top_k=k).retrieve(query)
+    if memo is not None:
+        memo[query] = (k, hits)
+    return hits
+
+
+def retrieve_with_backoff(
+    collection: str, embed_model, query: str, token: str, start_k: int, memo: Optional[dict] = None
+) -> List[Any]:
     """Retrieve with progressively larger ``top_k`` until a NAME matches ``token``.
 
-    Mirrors the test helper but checks for an exact name match via ``_norm``.  The
-    query engine is rebuilt for each attempt with an increased ``top_k`` and stops
-    once a hit's normalized name exactly equals the single token or the limit is
-    reached (200).
+    Mirrors the test helper but checks for an exact name match via ``_norm``.
+    A single query is issued at the limit (200) and the doubling ``top_k``
+    schedule is replayed by slicing those results locally; the slice stops at
+    the first ``k`` whose hits contain a normalized name equal to ``token``.
     """
-    limit = 200
+    limit = max(MAX_TOP_K, start_k)
     ks: List[int] = [start_k]
     while ks[-1] < limit:
         next_k = min(limit, ks[-1] * 2)
@@ -235,172 +272,22 @@ def retrieve_with_backoff(collection: str, embed_model, query: str, token: str,
             break
         ks.append(next_k)
 
+    all_hits = _retrieve_upto(collection, embed_model, query, ks[-1], memo)
     hits: List[Any] = []
     for k in ks:
-        qe = get_query_engine(collection, embed_model=embed_model, top_k=k)
-        hits = qe.retrieve(query)
+        hits = all_hits[:k]
         if any(_norm(_node_meta(h).get("name") or "") == token for h in hits):
             break
     return hits
 
-def rerank(query, hits):
-    """
-    Heuristic reranker that:
-      • Single-token queries (e.g., "goblin"): hard-prefer name matches, huge boost for exact/prefix.
-      • Multi-token queries (e.g., "booyahg whip"): hard-prefer names covering ALL query tokens.
-      • Caps raw vector score so heuristics can win amid noisy neighbors.
-    Requires helpers: _norm, _tokens, _node_meta, hit_text.
-    """
-    if not hits:
-        return []
-
-    q_norm   = _norm(query)
-    q_tokens = _tokens(query)
-    single   = len(q_tokens) == 1
-    qtok     = q_tokens[0] if single else None
-
-    # “rare” = longer tokens; for multi-token focus, use rare else all
-    rare  = [t for t in q_tokens if len(t) >= 4]
-    focus = rare or q_tokens
-
-    base_canonical_guess = f"{query.strip().title()}|MM"
-
-    # ---------- HARD PRE-ORDER ----------
-    if single and qtok:
-        # Put anything with the token IN THE NAME before everything else
-        name_matches, others = [], []
-        for h in hits:
-            name = (_node_meta(h).get("name") or "")
-            if qtok in set(_tokens(name)):
-                name_matches.append(h)
-            else:
-                others.append(h)
-        if name_matches:
-            hits = name_matches + others
-    elif len(q_tokens) > 1:
-        # Put items whose NAME covers ALL focus tokens first, then partial, then others
-        full, partial, other = [], [], []
-        for h in hits:
-            name = (_node_meta(h).get("name") or "")
-            ntoks = set(_tokens(name))
-            if all(t in ntoks for t in focus):
-                full.append(h)
-            elif any(t in ntoks for t in focus):
-                partial.append(h)
-            else:
-                other.append(h)
-        if full or partial:
-            hits = full + partial + other
-
-    # ---------- SOFT SCORING ----------
-    def score(h):
-        # Keep some influence from the vector similarity but cap it
-        base_vec = float(getattr(h, "score", 0.0))
-        s = min(base_vec, 3.0)
-
-        meta = _node_meta(h)
-        name = meta.get("name") or ""
-        src  = meta.get("source") or ""
-        nn   = _norm(name)
-
-        # Token sets and a small slice of body for coverage check
-        name_tokens = set(_tokens(name))
-        body_tokens = set(_tokens(hit_text(h)[:400]))
-
-        # Exact/phrase boosts
-        if q_norm and q_norm == nn:
-            s += 6.0
-        elif q_norm and q_norm in nn:
-            s += 1.5
-        elif nn.startswith(q_norm + " "):
-            s += 1.0
-
-        if single and qtok:
-            # VERY strong single-token name bias
-            if nn == qtok:
-                s += 40.0              # exact “goblin”
-            elif nn.startswith(qtok + " "):
-                s += 25.0              # “goblin boss”
-            elif qtok in name_tokens:
-                s += 12.0              # token appears in name
-            else:
-                s -= 30.0              # name doesn't contain token → shove down
-        else:
-            # Multi-token: reward full coverage IN NAME heavily, partial moderately
-            if focus:
-                name_cov = sum(t in name_tokens for t in focus)
-                body_cov = sum(t in body_tokens for t in focus)
-                if name_cov == len(focus):
-                    s += 20.0
-                elif name_cov >= 1:
-                    s += 8.0
-                elif body_cov >= 1:
-                    s += 2.0
-                else:
-                    s -= 6.0
-
-        # Light source nudges
-        s += SOURCE_BOOSTS.get(src, 0.0)
-
-        # Base vs. variant nudges
-        if meta.get("canonical_id") == base_canonical_guess:
-            s += 2.0
-        if meta.get("variant_of") == base_canonical_guess:
-            s -= 0.4
-
-        # Explicit flags
-        s += 0.2 * int(meta.get("priority", 0))
-        if meta.get("is_variant"):
-            s -= 0.3
-
-        return s
-
-    sorted_hits = sorted(hits, key=score, reverse=True)
-
-    if single and qtok:
-        exact_idx = None
-        for idx, h in enumerate(sorted_hits):
-            name = (_node_meta(h).get("name") or "")
-            if _norm(name) == qtok:
-                exact_idx = idx
-                break
+ALIAS_FILE = Path(__file__).parent / "data" / "aliases.json"
 
-        if exact_idx is None:
-            for idx, h in enumerate(sorted_hits):
-                meta = _node_meta(h)
-                base = meta.get("variant_of") or meta.get("canonical_id") or ""
-                base_norm = _norm(base.split("|")[0])
-                if base_norm == qtok:
-                    meta["name"] = base.split("|")[0]
-                    exact_idx = idx
-                    break
-
-        if exact_idx is None:
-            top_meta = _node_meta(sorted_hits[0])
-            top_name = top_meta.get("name") or ""
-            if qtok in set(_tokens(top_name)):
-                top_meta["name"] = qtok.title()
-                exact_idx = 0
-
-        if exact_idx is not None and exact_idx != 0:
-            sorted_hits.insert(0, sorted_hits.pop(exact_idx))
-
-    return sorted_hits
-
-def covers_all(r, rare_tokens):
-    meta = _node_meta(r)
-    name = meta.get("name","")
-    body = hit_text(r)[:400]
-    toks = set(_tokens(name)) | set(_tokens(body))
-    return all(t in toks for t in rare_tokens)
 
 def _load_alias_map(alias_map):
     if alias_map is not None:
         return alias_map
     try:
-        here = Path(__file__).parent
-        p = here / "data" / "aliases.json"
-        with open(p, "r", encoding="utf-8") as f:
+        with open(ALIAS_FILE, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception:
         return {}
@@ -452,11 +339,13 @@ def _apply_source_preference(results, pref):
     return sorted(results, key=lambda h: order_map.get(_norm_source(_node_meta(h).get("source")), 9999))
 
 def _write_debug_log(results, effective_query):
+    """Dump the top hits to ``logs/`` — only when ``GB_RETRIEVAL_DEBUG_LOG=1``."""
+    if not flag("GB_RETRIEVAL_DEBUG_LOG"):
+        return
     SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     debug_log_path = Path(SCRIPT_DIR) / "logs" / f"fireball_debug_{timestamp}.txt"
     debug_log_path.parent.mkdir(parents=True, exist_ok=True)
-    print(f"Attempting to write debug log to: {debug_log_path}")
 
     try:
         with open(debug_log_path, "w", encoding="utf-8") as f:
@@ -468,12 +357,16 @@ def _write_debug_log(results, effective_query):
                 f.write(text[:1000])
                 f.write("\n" + "-" * 60 + "\n")
                 f.write(f"Metadata: {meta}\n\n")
-        print(f"📝 Saved debug log to {debug_log_path}")
+        trace.event("debug_log", path=debug_log_path)
     except Exception as log_exc:
-        print(f"❌ Failed to write debug log: {log_exc}")
+        trace.logger.warning("Failed to write debug log %s: %s", debug_log_path, log_exc)
 
 def _maybe_learn_alias(user_q: str, qtype: str, top_meta: dict, learn_aliases: bool):
-    """Append alias to data/aliases.json if the chosen top name ≠ user query (safe/lenient, opt-in)."""
+    """Queue an alias for data/aliases.json if the chosen top name ≠ user query (safe/lenient, opt-in).
+
+    Learned aliases are buffered and merged into the file in the background
+    (see :mod:`alias_learning`); call :func:`flush_learned_aliases` to force it.
+    """
     if not learn_aliases:
         return
     uq = (user_q or "").strip().lower()
@@ -485,29 +378,109 @@ def _maybe_learn_alias(user_q: str, qtype: str, top_meta: dict, learn_aliases: b
         sim = SequenceMatcher(None, uq, nm).ratio()
         if sim < 0.55:
             return  # too different; likely not an alias
-        import json
-        from pathlib import Path
-        here = Path(__file__).parent
-        p = here / "data" / "aliases.json"
-        data = {}
-        if p.exists():
-            try:
-                data = json.loads(p.read_text(encoding="utf-8"))
-            except Exception:
-                data = {}
-        bucket = data.setdefault(qtype, {})
-        entry = bucket.setdefault(uq, {"canonical": top_meta.get("name", user_q), "also": []})
-        if "also" not in entry or not isinstance(entry["also"], list):
-            entry["also"] = []
-        if uq not in entry["also"]:
-            entry["also"].append(uq)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        p.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-        print(f"🧠 Learned alias: '{user_q}' → '{top_meta.get('name')}'")
+        alias_learning.learner_for(ALIAS_FILE).learn(qtype, uq, top_meta.get("name", user_q))
+        trace.event("alias_learned", alias=uq, canonical=top_meta.get("name"))
     except Exception as _:
         pass
 
+
+def flush_learned_aliases() -> int:
+    """Write any buffered learned aliases now; returns how many were written."""
+    return alias_learning.flush_all()
+
+def _alias_digest(alias_map, alias_map_enabled: bool) -> str:
+    """Cheap fingerprint of the alias map a query would resolve against."""
+    if not alias_map_enabled:
+        return "off"
+    if alias_map is not None:
+        return query_cache.make_key(alias_map)[:16]
+    try:
+        st = ALIAS_FILE.stat()
+    except OSError:
+        return "none"
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
 def run_query(
+    query: str,
+    type: str = "auto",
+    embed_model=None,
+    *,
+    prefer_source=None,
+    alias_map: dict | None = None,
+    alias_map_enabled: bool = True,
+    learn_aliases: bool = False,
+    use_cache: bool = True,
+) -> tuple[str, dict | None, list | None]:
+    """
+    Cached front end for :func:`_run_query_uncached`.
+
+    Successful results are memoized by (normalized query, type, preferred
+    source, alias-map digest, collection index signature), so a re-index of
+    the collection or an edit to the alias map invalidates them
+    automatically.  Collections without a recorded index signature are never
+    cached.
+    """
+    query_type = type.lower()
+    if query_type == "auto":
+        query_type = detect_type_auto(query)
+    with trace.trace("query", query=query, type=query_type):
+        return _run_query_cached(
+            query,
+            query_type,
+            embed_model,
+            prefer_source=prefer_source,
+            alias_map=alias_map,
+            alias_map_enabled=alias_map_enabled,
+            learn_aliases=learn_aliases,
+            use_cache=use_cache,
+        )
+
+
+def _run_query_cached(query, query_type, embed_model, *, prefer_source, alias_map,
+                      alias_map_enabled, learn_aliases, use_cache):
+    collection_name = COLLECTION_MAP.get(query_type)
+
+    key = None
+    if use_cache and collection_name and query_cache.cache_enabled():
+        signature = query_cache.collection_signature(collection_name)
+        if signature is not None:
+            embedder = embed_model or (getattr(Settings, "embed_model", None) if Settings else None)
+            # Same normalization as _resolve_alias: queries it could treat
+            # differently (e.g. "fire-ball" vs "fire ball") must not share a key.
+            key = query_cache.make_key(
+                query.strip().lower(),
+                query_type,
+                prefer_source,
+                _alias_digest(alias_map, alias_map_enabled),
+                signature,
+                embedder.__class__.__name__ if embedder is not None else None,
+            )
+            cached = query_cache.default_cache().get(key)
+            trace.event("cache", hit=cached is not None)
+            if cached is not None:
+                md, sidecar, prov = cached
+                LAST_MONSTER_JSON.clear()
+                if query_type == "monster" and sidecar is not None:
+                    LAST_MONSTER_JSON.update(sidecar)
+                    sidecar = LAST_MONSTER_JSON
+                return md, sidecar, prov
+
+    result = _run_query_uncached(
+        query,
+        query_type,
+        embed_model,
+        prefer_source=prefer_source,
+        alias_map=alias_map,
+        alias_map_enabled=alias_map_enabled,
+        learn_aliases=learn_aliases,
+    )
+    if key is not None and not result[0].startswith("❌"):
+        query_cache.default_cache().put(key, result)
+    return result
+
+
+def _run_query_uncached(
     query: str,
     type: str = "auto",
     embed_model=None,
@@ -568,44 +541,64 @@ def run_query(
         qtok = q_tokens[0] if single else None
         rare = [t for t in q_tokens if len(t) >= 4]
         k = pick_top_k(effective_query)
+        # Widest hit list fetched per query string; lets the backoff and the
+        # coverage expansion below slice locally instead of re-querying.
+        fetched: Dict[str, tuple] = {}
+        # Per-hit rerank features, shared by both rerank passes below.
+        rerank_cache: Dict[int, Any] = {}
 
         # Try LLM-powered query first (if not FakeLLM)
         try:
             if isinstance(Settings.llm, MockLLM):
-                print("✅ Using mock LLM — skipping query() and using retrieve() instead")
-                print("⚠️ Skipping query() — using retrieve() due to MockLLM")
-                if single and qtok:
-                    results = retrieve_with_backoff(collection_name, embed_model, retrieve_query, qtok, start_k=k)
-                else:
-                    query_engine = get_query_engine(collection_name, embed_model, top_k=k)
-                    results = query_engine.retrieve(retrieve_query)
+                trace.event("mock_llm", mode="retrieve")
+                # Exact entry names resolve from the inverted name index;
+                # vector retrieval is only the fallback.
+                with trace.span("name_index", collection=collection_name) as sp:
+                    results = name_index.lookup(collection_name, effective_query, generations.lease_current(VECTOR_DIR))
+                    sp["hits"] = len(results)
+                if not results:
+                    with trace.span("retrieve", collection=collection_name, k=k) as sp:
+                        if single and qtok:
+                            results = retrieve_with_backoff(
+                                collection_name, embed_model, retrieve_query, qtok, start_k=k, memo=fetched
+                            )
+                        else:
+                            results = _retrieve_upto(collection_name, embed_model, retrieve_query, k, fetched)
+                        sp["hits"] = len(results)
 
                 if not results:
                     return "❌ No relevant entries found.", None, None
 
-                results = rerank(effective_query, results)
+                with trace.span("rerank", hits=len(results)):
+                    results = rerank(effective_query, results, rerank_cache)
 
                 # Optional coverage expansion if rare tokens aren't jointly covered
                 if rare and not any(covers_all(r, rare) for r in results):
-                    def key(r):
-                        m = _node_meta(r)
-                        return m.get("canonical_id") or (m.get("name"), m.get("source"))
-                    seen = set()
-                    merged = list(results)
-                    for topk in [max(100, k), max(200, k)]:
-                        for q2 in (retrieve_query, " ".join(rare)):
-                            qe2 = get_query_engine(collection_name, embed_model, top_k=topk)
-                            more = qe2.retrieve(q2)
-                            for r in more:
-                                kk = key(r)
-                                if kk in seen:
-                                    continue
-                                seen.add(kk)
-                                merged.append(r)
-                    results = merged
+                    with trace.span("expand", rare=",".join(rare)):
+                        def key(r):
+                            m = _node_meta(r)
+                            return m.get("canonical_id") or (m.get("name"), m.get("source"))
+                        seen = set()
+                        merged = list(results)
+                        widest = max(MAX_TOP_K, k)
+                        pools = {
+                            q2: _retrieve_upto(collection_name, embed_model, q2, widest, fetched)
+                            for q2 in (retrieve_query, " ".join(rare))
+                        }
+                        for topk in [max(100, k), widest]:
+                            for q2 in (retrieve_query, " ".join(rare)):
+                                more = pools[q2][:topk]
+                                for r in more:
+                                    kk = key(r)
+                                    if kk in seen:
+                                        continue
+                                    seen.add(kk)
+                                    merged.append(r)
+                        results = merged
 
                 # final rerank
-                results = rerank(effective_query, results)
+                with trace.span("rerank", hits=len(results)):
+                    results = rerank(effective_query, results, rerank_cache)
                 # NEW: source preference stable tiebreak
                 results = _apply_source_preference(results, prefer_source)
 
@@ -638,7 +631,9 @@ def run_query(
                 raw_text = str(response)
                 if query_type == "spell" and len(raw_text.strip()) < 100:
                     if single and qtok:
-                        results = retrieve_with_backoff(collection_name, embed_model, retrieve_query, qtok, start_k=k)
+                        results = retrieve_with_backoff(
+                            collection_name, embed_model, retrieve_query, qtok, start_k=k, memo=fetched
+                        )
                     else:
                         results = query_engine.retrieve(retrieve_query)
                     if not results:
@@ -651,9 +646,11 @@ def run_query(
                     raw_text = hit_text(ranked[0])
 
         except Exception as e:
-            print(f"⚠️ LLM query failed — falling back to similarity: {e}")
+            trace.logger.warning("LLM query failed — falling back to similarity: %s", e)
             if single and qtok:
-                results = retrieve_with_backoff(collection_name, embed_model, retrieve_query, qtok, start_k=k)
+                results = retrieve_with_backoff(
+                    collection_name, embed_model, retrieve_query, qtok, start_k=k, memo=fetched
+                )
             else:
                 results = query_engine.retrieve(retrieve_query)
             if not results:
@@ -665,42 +662,42 @@ def run_query(
             pref_meta["provenance"] = [_node_meta(r) for r in ranked[:3]]
             _maybe_learn_alias(query, query_type, pref_meta, learn_aliases)
 
-        print("🧪 Retrieved text:\n", raw_text[:500])
-        print(f"Detected format type for '{query}': {query_type}")
-        prov_list = provenance_from_results(results)
-        pref_meta["provenance"] = prov_list
-        if query_type == "item":
-            out = _format_with(ItemFormatter, raw_text, pref_meta)
-            out = _append_provenance(out, pref_meta)
-            json_sidecar = None
-            try:
-                json_sidecar = item_to_json(out, pref_meta)
-            except Exception:
-                json_sidecar = None
-        elif query_type == "rule":
-            out = _format_with(RuleFormatter, raw_text, pref_meta)
-            out = _append_provenance(out, pref_meta)
-            json_sidecar = None
-            try:
-                json_sidecar = rule_to_json(out, pref_meta)
-            except Exception:
+        trace.event("retrieved", type=query_type, chars=len(raw_text), preview=raw_text[:80].replace("\n", " "))
+        with trace.span("format", type=query_type):
+            prov_list = provenance_from_results(results)
+            pref_meta["provenance"] = prov_list
+            if query_type == "item":
+                out = _format_with(ItemFormatter, raw_text, pref_meta)
+                out = _append_provenance(out, pref_meta)
                 json_sidecar = None
-        else:
-            out = auto_format(raw_text, metadata=pref_meta)
-            json_sidecar = None
-            if query_type == "monster":
                 try:
-                    LAST_MONSTER_JSON.clear()
-                    LAST_MONSTER_JSON.update(monster_to_json(out, pref_meta))
-                    json_sidecar = LAST_MONSTER_JSON
+                    json_sidecar = item_to_json(out, pref_meta)
                 except Exception:
-                    LAST_MONSTER_JSON.clear()
-            elif query_type == "spell":
+                    json_sidecar = None
+            elif query_type == "rule":
+                out = _format_with(RuleFormatter, raw_text, pref_meta)
+                out = _append_provenance(out, pref_meta)
+                json_sidecar = None
                 try:
-                    json_sidecar = spell_to_json(out, pref_meta)
+                    json_sidecar = rule_to_json(out, pref_meta)
                 except Exception:
                     json_sidecar = None
-        return out, json_sidecar, prov_list
+            else:
+                out = auto_format(raw_text, metadata=pref_meta)
+                json_sidecar = None
+                if query_type == "monster":
+                    try:
+                        LAST_MONSTER_JSON.clear()
+                        LAST_MONSTER_JSON.update(monster_to_json(out, pref_meta))
+                        json_sidecar = LAST_MONSTER_JSON
+                    except Exception:
+                        LAST_MONSTER_JSON.clear()
+                elif query_type == "spell":
+                    try:
+                        json_sidecar = spell_to_json(out, pref_meta)
+                    except Exception:
+                        json_sidecar = None
+            return out, json_sidecar, prov_list
 
     except Exception as e:
         return f"❌ Failed to query collection '{collection_name}': {e}", None, None
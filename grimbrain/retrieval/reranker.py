@@ -0,0 +1,206 @@
+"""
+reranker.py — heuristic name-aware reranking of retrieval hits.
+
+Kept free of Chroma/LlamaIndex imports so the ordering rules can be tested
+(and reused) without a vector store.
+"""
+
+from __future__ import annotations
+
+import json
+
+from .utils import _norm, _tokens, hit_text
+
+
+def _node_meta(hit):
+    node = getattr(hit, "node", None)
+    meta = getattr(node, "metadata", None) or getattr(node, "extra_info", None) or {}
+    if isinstance(meta, str):
+        try:
+            meta = json.loads(meta)
+        except Exception:
+            meta = {}
+    return meta
+
+
+SOURCE_BOOSTS = {
+    "MM": 1.0,      # Monster Manual
+    "MPMM": 0.6,    # Monsters of the Multiverse
+    "VGM": 0.4,     # Volo's Guide (for Booyahg variants)
+}
+
+
+class _Features:
+    """Per-hit values the scorer reads, computed once per hit."""
+
+    __slots__ = ("meta", "nn", "name_tokens", "_hit", "_body_tokens")
+
+    def __init__(self, hit):
+        self.meta = _node_meta(hit)
+        name = self.meta.get("name") or ""
+        self.nn = _norm(name)
+        self.name_tokens = frozenset(_tokens(name))
+        self._hit = hit
+        self._body_tokens = None
+
+    @property
+    def body_tokens(self):
+        # Only multi-token scoring looks at the body; tokenize it lazily.
+        if self._body_tokens is None:
+            self._body_tokens = frozenset(_tokens(hit_text(self._hit)[:400]))
+        return self._body_tokens
+
+
+def _features(hits, cache):
+    if cache is None:
+        return [_Features(h) for h in hits]
+    out = []
+    for h in hits:
+        f = cache.get(id(h))
+        if f is None or f._hit is not h:
+            f = cache[id(h)] = _Features(h)
+        out.append(f)
+    return out
+
+
+def rerank(query, hits, cache=None):
+    """
+    Heuristic reranker that:
+      • Single-token queries (e.g., "goblin"): hard-prefer name matches, huge boost for exact/prefix.
+      • Multi-token queries (e.g., "booyahg whip"): hard-prefer names covering ALL query tokens.
+      • Caps raw vector score so heuristics can win amid noisy neighbors.
+
+    Name/body token sets are extracted once per hit and every candidate is
+    scored in a single pass; ties keep the hard pre-order, then input order.
+    ``cache`` (a dict owned by the caller) lets repeated reranks of the same
+    hit objects within one query reuse those features.
+    """
+    if not hits:
+        return []
+
+    q_norm   = _norm(query)
+    q_tokens = _tokens(query)
+    single   = len(q_tokens) == 1
+    qtok     = q_tokens[0] if single else None
+
+    # “rare” = longer tokens; for multi-token focus, use rare else all
+    rare  = [t for t in q_tokens if len(t) >= 4]
+    focus = rare or q_tokens
+    n_focus = len(focus)
+
+    base_canonical_guess = f"{query.strip().title()}|MM"
+    q_prefix = q_norm + " "
+    tok_prefix = (qtok + " ") if qtok else None
+
+    feats = _features(hits, cache)
+    n = len(hits)
+    group = [0] * n
+    scores = [0.0] * n
+    for i, f in enumerate(feats):
+        meta = f.meta
+        nn = f.nn
+        name_tokens = f.name_tokens
+
+        # Keep some influence from the vector similarity but cap it
+        s = min(float(getattr(hits[i], "score", 0.0)), 3.0)
+
+        # Exact/phrase boosts
+        if q_norm and q_norm == nn:
+            s += 6.0
+        elif q_norm and q_norm in nn:
+            s += 1.5
+        elif nn.startswith(q_prefix):
+            s += 1.0
+
+        if single and qtok:
+            in_name = qtok in name_tokens
+            group[i] = 0 if in_name else 1
+            # VERY strong single-token name bias
+            if nn == qtok:
+                s += 40.0              # exact “goblin”
+            elif nn.startswith(tok_prefix):
+                s += 25.0              # “goblin boss”
+            elif in_name:
+                s += 12.0              # token appears in name
+            else:
+                s -= 30.0              # name doesn't contain token → shove down
+        elif focus:
+            # Multi-token: reward full coverage IN NAME heavily, partial moderately
+            name_cov = sum(t in name_tokens for t in focus)
+            if len(q_tokens) > 1:
+                group[i] = 0 if name_cov == n_focus else (1 if name_cov else 2)
+            if name_cov == n_focus:
+                s += 20.0
+            elif name_cov >= 1:
+                s += 8.0
+            elif any(t in f.body_tokens for t in focus):
+                s += 2.0
+            else:
+                s -= 6.0
+
+        # Light source nudges
+        s += SOURCE_BOOSTS.get(meta.get("source") or "", 0.0)
+
+        # Base vs. variant nudges
+        if meta.get("canonical_id") == base_canonical_guess:
+            s += 2.0
+        if meta.get("variant_of") == base_canonical_guess:
+            s -= 0.4
+
+        # Explicit flags
+        s += 0.2 * int(meta.get("priority", 0))
+        if meta.get("is_variant"):
+            s -= 0.3
+
+        scores[i] = s
+
+    # The hard pre-order (name matches first) only applies when at least one
+    # hit lands in a preferred group; it then breaks score ties.
+    if not any(g == 0 for g in group) and not (len(q_tokens) > 1 and any(g == 1 for g in group)):
+        group = [0] * n
+    order = sorted(range(n), key=lambda i: (-scores[i], group[i], i))
+    sorted_hits = [hits[i] for i in order]
+    sorted_feats = [feats[i] for i in order]
+
+    if single and qtok:
+        exact_idx = None
+        for idx, f in enumerate(sorted_feats):
+            if f.nn == qtok:
+                exact_idx = idx
+                break
+
+        if exact_idx is None:
+            for idx, f in enumerate(sorted_feats):
+                meta = f.meta
+                base = meta.get("variant_of") or meta.get("canonical_id") or ""
+                base_norm = _norm(base.split("|")[0])
+                if base_norm == qtok:
+                    meta["name"] = base.split("|")[0]
+                    _forget(cache, sorted_hits[idx])
+                    exact_idx = idx
+                    break
+
+        if exact_idx is None:
+            top = sorted_feats[0]
+            if qtok in top.name_tokens:
+                top.meta["name"] = qtok.title()
+                _forget(cache, sorted_hits[0])
+                exact_idx = 0
+
+        if exact_idx is not None and exact_idx != 0:
+            sorted_hits.insert(0, sorted_hits.pop(exact_idx))
+
+    return sorted_hits
+
+
+def _forget(cache, hit):
+    """Drop cached features for a hit whose name was just rewritten."""
+    if cache is not None:
+        cache.pop(id(hit), None)
+
+def covers_all(r, rare_tokens):
+    meta = _node_meta(r)
+    name = meta.get("name","")
+    body = hit_text(r)[:400]
+    toks = set(_tokens(name)) | set(_tokens(body))
+    return all(t in toks for t in rare_tokens)
@@ -0,0 +1,99 @@
+"""
+trace.py — opt-in structured tracing for the retrieval pipeline.
+
+Tracing is off by default so bulk lookups do no extra I/O.  Enable it with
+``GB_RETRIEVAL_TRACE=1`` (or :func:`set_tracing`) to get per-stage timing
+spans and events on the ``grimbrain.retrieval`` logger, e.g.::
+
+    retrieval.retrieve 3.2 ms collection=grim_bestiary k=200 hits=200
+
+The spans of the most recent traced ``run_query`` are also kept in memory
+(see :func:`last_trace`) for tests and tooling.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from grimbrain.config import flag
+
+logger = logging.getLogger("grimbrain.retrieval")
+
+_FORCED: Optional[bool] = None
+_CURRENT: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar(
+    "grimbrain_retrieval_trace", default=None
+)
+_LAST: List[Dict[str, Any]] = []
+
+
+def set_tracing(enabled: Optional[bool]) -> None:
+    """Force tracing on/off; ``None`` defers to ``GB_RETRIEVAL_TRACE``."""
+    global _FORCED
+    _FORCED = enabled
+
+
+def enabled() -> bool:
+    if _FORCED is not None:
+        return _FORCED
+    return flag("GB_RETRIEVAL_TRACE")
+
+
+def _fmt(fields: Dict[str, Any]) -> str:
+    return " ".join(f"{k}={v}" for k, v in fields.items())
+
+
+def _record(rec: Dict[str, Any]) -> None:
+    spans = _CURRENT.get()
+    if spans is not None:
+        spans.append(rec)
+
+
+@contextlib.contextmanager
+def trace(name: str, **fields: Any) -> Iterator[None]:
+    """Root span: collects nested spans/events into :func:`last_trace`."""
+    if not enabled():
+        yield
+        return
+    spans: List[Dict[str, Any]] = []
+    token = _CURRENT.set(spans)
+    try:
+        with span(name, **fields):
+            yield
+    finally:
+        _CURRENT.reset(token)
+        _LAST[:] = spans
+
+
+@contextlib.contextmanager
+def span(name: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """Time a pipeline stage; extra fields may be added to the yielded dict."""
+    if not enabled():
+        yield {}
+        return
+    t0 = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        _record({"span": name, "ms": round(ms, 3), **fields})
+        logger.info("retrieval.%s %.1f ms %s", name, ms, _fmt(fields))
+
+
+def event(name: str, **fields: Any) -> None:
+    """Record a point-in-time event (no timing)."""
+    if not enabled():
+        return
+    _record({"event": name, **fields})
+    logger.info("retrieval.%s %s", name, _fmt(fields))
+
+
+def last_trace() -> List[Dict[str, Any]]:
+    """Spans and events recorded by the most recent traced query."""
+    return list(_LAST)
+
+
+__all__ = ["enabled", "event", "last_trace", "logger", "set_tracing", "span", "trace"]
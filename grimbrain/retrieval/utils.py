@@ -9,10 +9,12 @@ Design goals
 
 from __future__ import annotations
 
+import functools
 import inspect
 import os
 import re
 import sys
+import threading
 from typing import Any, Iterable, Optional
 # PATCH: Add extra types for patch helpers
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union, Callable, Union
@@ -66,6 +68,19 @@ def normalize_name(name: str) -> str:
     return n
 
 
+# Common text-processing helpers shared by the query router and name index
+STOPWORDS = {
+    "the","a","an","of","and","or","to","for","from","with","in","on","at",
+    "by","as","is","are","was","were","be","it","this","that","these","those"
+}
+
+def _norm(s: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", (s or "").lower()).strip()
+
+def _tokens(s: str):
+    return [t for t in _norm(s).split() if t and t not in STOPWORDS]
+
+
 def fmt_sources(sources: Iterable[str] | None) -> str:
     """Render a simple 'Sources considered' footer line."""
     if not sources:
@@ -275,6 +290,56 @@ def ensure_collection(client: Any, name: str, embedder: Any | None = None):
     return collection
 
 
+# -----------------------------------------------------------------------------
+# Chroma client pool
+# -----------------------------------------------------------------------------
+
+_CLIENT_POOL: Dict[str, Any] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def get_persistent_client(
+    path: Union[str, Path] = "chroma_store",
+    factory: Optional[Callable[..., Any]] = None,
+):
+    """
+    Return the process-wide Chroma client for ``path``, opening it only once.
+
+    ``factory`` defaults to ``chromadb.PersistentClient``; callers that import
+    the client class themselves pass it through so tests can monkeypatch it.
+    """
+    key = os.path.abspath(str(path))
+    with _CLIENT_POOL_LOCK:
+        client = _CLIENT_POOL.get(key)
+        if client is None:
+            if factory is None:
+                from chromadb import PersistentClient as factory  # type: ignore
+            client = factory(path=str(path))
+            _CLIENT_POOL[key] = client
+    return client
+
+
+def reset_client_pool(path: Union[str, Path, None] = None) -> None:
+    """Forget pooled clients (all, or just the one for ``path``)."""
+    with _CLIENT_POOL_LOCK:
+        if path is None:
+            _CLIENT_POOL.clear()
+        else:
+            _CLIENT_POOL.pop(os.path.abspath(str(path)), None)
+
+
+def collection_for_folder(folder: str) -> str:
+    """Chroma collection name used for a top-level ``data/`` folder."""
+    safe_folder = "".join(c for c in folder if c.isalnum() or c in "_-").lower()
+    return f"grim_{safe_folder}"
+
+
+def folder_for_path(rel_path: Union[str, Path]) -> str:
+    """Top-level grouping folder for a path relative to the data directory."""
+    parts = Path(rel_path).parts
+    return parts[0] if len(parts) > 1 else Path(rel_path).stem
+
+
 # -----------------------------------------------------------------------------
 # Name scoring (kept for compatibility — some older routes import these)
 # -----------------------------------------------------------------------------
@@ -459,17 +524,20 @@ def _deepcopy(x: Any) -> Any:
         return x
 
 def _deep_merge(base: Any, overlay: Any) -> Any:
-    """Shallow-on-lists, deep-on-dicts merge; overlay wins."""
+    """
+    Shallow-on-lists, deep-on-dicts merge; overlay wins.
+
+    Subtrees are shared rather than copied: only dicts on the overlay's paths
+    are rebuilt, so callers must not mutate the result's nested values in
+    place (``_apply_single_mod`` copies a container before changing it).
+    """
     if isinstance(base, dict) and isinstance(overlay, dict):
-        out: Dict[str, Any] = {}
-        for k in base.keys() | overlay.keys():
-            if k in overlay:
-                out[k] = _deep_merge(base.get(k), overlay[k])
-            else:
-                out[k] = _deepcopy(base[k])
+        out: Dict[str, Any] = dict(base)
+        for k, v in overlay.items():
+            out[k] = _deep_merge(base.get(k), v)
         return out
     # For lists and primitives, overlay replaces
-    return _deepcopy(overlay) if overlay is not None else _deepcopy(base)
+    return overlay if overlay is not None else base
 
 def _walk_strings(node: Any, fn: Callable[[str], str], props: Optional[Iterable[str]] = None) -> Any:
     """Recursively apply fn to all strings (optionally only to certain property names)."""
@@ -485,6 +553,10 @@ def _walk_strings(node: Any, fn: Callable[[str], str], props: Optional[Iterable[
         return [_walk_strings(v, fn, props) for v in node]
     return fn(node) if isinstance(node, str) else node
 
+@functools.lru_cache(maxsize=512)
+def _compile_mod_pattern(pattern: str, flags: int) -> "re.Pattern[str]":
+    return re.compile(pattern, flags)
+
 def _apply_single_mod(obj: Dict[str, Any], prop: str, spec: Dict[str, Any], warn: Callable[[str], None]) -> None:
     """Apply one mod spec to obj[prop]. Tolerant to minor schema variations."""
     mode = spec.get("mode")
@@ -501,7 +573,7 @@ def _apply_single_mod(obj: Dict[str, Any], prop: str, spec: Dict[str, Any], warn
         if not isinstance(repl, str):
             warn(f"⚠️ Skipping replaceTxt for key '{prop}' due to non-string 'replace'")
             return
-        pat = re.compile(repl, re.I if "i" in flags.lower() else 0)
+        pat = _compile_mod_pattern(repl, re.I if "i" in flags.lower() else 0)
         def _fn(s: str) -> str:
             return pat.sub(with_, s)
         new_obj = _walk_strings(obj if prop == "*" else obj.get(prop, {}), _fn, props)
@@ -518,8 +590,7 @@ def _apply_single_mod(obj: Dict[str, Any], prop: str, spec: Dict[str, Any], warn
         if isinstance(skills, dict):
             cur = obj.get("skill", {})
             if isinstance(cur, dict):
-                cur.update(skills)
-                obj["skill"] = cur
+                obj["skill"] = {**cur, **skills}
         return
 
     # Array operations against obj[prop]
@@ -527,7 +598,9 @@ def _apply_single_mod(obj: Dict[str, Any], prop: str, spec: Dict[str, Any], warn
         warn(f"⚠️ Skipping _mod for key '{prop}' because value is not an array: {type(obj.get(prop))}")
         return
 
-    arr: List[Any] = obj[prop]
+    # Copy before mutating: the list may be shared with a resolved base entry.
+    arr: List[Any] = list(obj[prop])
+    obj[prop] = arr
     items = _coalesce("items", "itemss", "iteems", in_dict=spec)
     if mode in {"appendArr", "prependArr", "insertArr", "replaceArr"} and items is None:
         warn(f"⚠️ Skipping _mod for key '{prop}' due to missing 'items' in {mode}")
@@ -670,14 +743,69 @@ def resolve_copy(
     overlay = {k: v for k, v in obj.items() if k not in ("_copy", "copy", "_mod")}
     if base:
         merged = _deep_merge(base, overlay)
+        # ``stamp_doc_meta`` updates ``meta`` in place; don't share the base's.
+        if isinstance(merged.get("meta"), dict):
+            merged["meta"] = dict(merged["meta"])
     else:
-        merged = _deepcopy(overlay)
+        # ``overlay`` is already a fresh top-level dict; mods copy on write.
+        merged = overlay
 
     # Apply _mod from the object-level (and support misplaced _mod inside spec as a fallback)
     mods = obj.get("_mod") or (spec.get("_mod") if isinstance(spec, dict) else None)
     _apply_mods(merged, mods, _warn)
     return merged
 
+class CopyResolver:
+    """
+    Memoizing ``(name, source) -> resolved entry`` resolver for `_copy` chains.
+
+    Wraps a raw-entry lookup (callable or dict, as accepted by `resolve_copy`).
+    Bases that themselves `_copy` are resolved first, once each, so a variant
+    of a variant sees its base's patches.  Resolved entries share unchanged
+    subtrees with their bases; treat them as read-only.
+    """
+
+    def __init__(
+        self,
+        lookup: Union[Callable[[str, str], Optional[Dict[str, Any]]], Dict[Tuple[str, str], Dict[str, Any]]],
+        *,
+        warn: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.lookup = lookup
+        self.warn = warn
+        self._memo: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        self._active: set = set()
+
+    def _raw(self, name: str, source: str) -> Optional[Dict[str, Any]]:
+        if callable(self.lookup):
+            return self.lookup(name, source)
+        return self.lookup.get((name, source))
+
+    def __call__(self, name: str, source: str) -> Optional[Dict[str, Any]]:
+        key = (name, source)
+        if key in self._memo:
+            return self._memo[key]
+        raw = self._raw(name, source)
+        if not isinstance(raw, dict) or not (raw.get("_copy") or raw.get("copy")):
+            resolved = raw
+        elif key in self._active:
+            (self.warn or print)(f"⚠️ resolve_copy cycle at ({name}, {source}); using unresolved entry")
+            return raw
+        else:
+            self._active.add(key)
+            try:
+                resolved = resolve_copy(raw, self, warn=self.warn)
+            finally:
+                self._active.discard(key)
+        self._memo[key] = resolved
+        return resolved
+
+    def resolve(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve ``obj`` against memoized bases (``obj`` itself is not memoized)."""
+        if not (obj.get("_copy") or obj.get("copy")):
+            return obj
+        return resolve_copy(obj, self, warn=self.warn)
+
 def stamp_doc_meta(
     doc: Dict[str, Any],
     collection: Optional[str] = None,
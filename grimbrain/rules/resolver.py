@@ -13,6 +13,7 @@ try:  # pragma: no cover - optional dependency
 except Exception:  # pragma: no cover
     PersistentClient = None  # type: ignore
 
+from ..retrieval.generations import lease_current
 from .index import load_rules
 
 
@@ -71,7 +72,9 @@ class RuleResolver:
         if PersistentClient is None:
             return
         try:
-            client = PersistentClient(path=str(self.chroma_dir))
+            # Follow the generation pointer on every (re)open; until then a
+            # published rebuild does not disturb this resolver.
+            client = PersistentClient(path=str(lease_current(self.chroma_dir)))
             self.collection = client.get_collection("content")
         except Exception:
             self.collection = None
@@ -33,10 +33,12 @@ from grimbrain.engine.campaign import (
     CampaignState as EngineCampaignState,
 )
 from grimbrain.io.campaign_io import (
+    commit_campaign,
+    export_campaign,
     load_campaign as io_load_campaign,
     save_campaign as io_save_campaign,
 )
-from grimbrain.engine.bestiary import make_combatant_from_monster, weapon_names_for_monster
+from grimbrain.engine.bestiary import make_combatants
 from grimbrain.engine.encounters import run_encounter
 from grimbrain.engine.loot import roll_loot
 from grimbrain.engine.progression import award_xp, maybe_level_up
@@ -46,6 +48,7 @@ from grimbrain.engine.skirmish import run_skirmish
 from grimbrain.engine.narrator import get_narrator, pick_template_line
 from grimbrain.engine.config import load_config, save_config, choose_ai_enabled
 from grimbrain.engine.journal import format_entries, log_event, write_export
+from grimbrain.engine.journal_log import JournalLog, flush_journal
 from grimbrain.engine.srd import load_srd, skill_ability
 from grimbrain.engine.types import roll_d20
 
@@ -252,6 +255,7 @@ def _document_to_state(data: CampaignDocument | Any) -> EngineCampaignState:
     journal_source = payload.get("journal") or state_info.get("journal") or []
     if not isinstance(journal_source, list):
         journal_source = [journal_source]
+    journal_pointer = payload.get("journal_log")
     seed = (
         meta.get("seed")
         or state_info.get("seed")
@@ -276,6 +280,11 @@ def _document_to_state(data: CampaignDocument | Any) -> EngineCampaignState:
         short_rest_hours=int(rest_info.get("short_hours", payload.get("short_rest_hours", 4) or 4)),
         long_rest_to_morning=bool(rest_info.get("long_to_morning", payload.get("long_rest_to_morning", True))),
         journal=list(journal_source),
+        journal_log=(
+            str(journal_pointer["path"])
+            if isinstance(journal_pointer, dict) and journal_pointer.get("path")
+            else None
+        ),
         light_level=str(state_info.get("light", payload.get("light_level", "normal"))),
         narrative_style=str(style),
     )
@@ -351,13 +360,47 @@ def _state_to_document(state: EngineCampaignState) -> CampaignDocument:
     return doc
 
 
+# Set by ``campaign_session`` while serving: states are then kept in memory
+# and written out on the session's schedule instead of by every command.
+_SESSION = None
+
+
+def _read_state(path: str | Path) -> EngineCampaignState:
+    st = _document_to_state(load_campaign(path))
+    if st.journal_log:
+        st.journal_log = str(Path(path).parent / st.journal_log)
+    return st
+
+
+def _write_state(state: EngineCampaignState, path: str | Path) -> Path:
+    pointer = flush_journal(state, path)
+    document = _state_to_document(state)
+    document["journal_log"] = pointer
+    return commit_campaign(document, path)
+
+
 def _load_state(path: str | Path) -> EngineCampaignState:
-    return _document_to_state(load_campaign(path))
+    if _SESSION is not None:
+        return _SESSION.load(path)
+    return _read_state(path)
 
 
 def _save_state(state: EngineCampaignState, path: str | Path) -> Path:
-    document = _state_to_document(state)
-    return save_campaign(document, path)
+    if _SESSION is not None:
+        flush_journal(state, path)  # appends only; keeps journal queries current
+        return _SESSION.save(state, path)
+    return _write_state(state, path)
+
+
+def _journal_log(state: EngineCampaignState, path: str | Path) -> JournalLog:
+    """The journal log for the save at ``path``.
+
+    Saves first if the state still carries inline entries (e.g. a save from
+    before journals moved out of the campaign file).
+    """
+    if state.journal or not state.journal_log:
+        _save_state(state, path)
+    return JournalLog(state.journal_log)
 
 
 def _default_party() -> list[EnginePartyMemberRef]:
@@ -939,38 +982,35 @@ def travel(
     tpl_ctx = _narration_context(st)
     narrator = _get_narrator_instance()
     style_name = getattr(st, "narrative_style", "classic")
-    start_line, start_tpl = pick_template_line(
-        style_name, "travel_start", tpl_ctx, seed=_seed_with_offset(base_seed, 0)
-    )
-    if start_line:
-        start_ctx = dict(tpl_ctx)
-        start_ctx.update(
-            {
-                "style": style_name,
-                "section": "travel",
-                "tpl_id": start_tpl,
-            }
+
+    # Every narration line for this step is known once the encounter is
+    # resolved, so plan them all and render them in one batch.
+    def plan_line(slot: str, scene_id: str, section: str, offset: int) -> None:
+        line, tpl_id = pick_template_line(
+            style_name, section, tpl_ctx, seed=_seed_with_offset(base_seed, offset)
         )
-        print(narrator.render("travel#start", start_line, start_ctx))
+        if line:
+            line_ctx = dict(tpl_ctx)
+            line_ctx.update({"style": style_name, "section": "travel", "tpl_id": tpl_id})
+            planned[slot] = (scene_id, line, line_ctx)
+
+    planned: dict[str, tuple[str, str, dict[str, Any]]] = {}
+    winner = res.get("winner", "?")
+    outcome_key = "encounter_victory" if winner == "A" else "encounter_defeat"
+    plan_line("start", "travel#start", "travel_start", 0)
+    if res.get("encounter"):
+        plan_line("intro", "travel#encounter_intro", "encounter_intro", 1)
+        plan_line("outcome", f"travel#{outcome_key}", outcome_key, 2)
+    else:
+        plan_line("no_encounter", "travel#no_encounter", "travel_no_encounter", 1)
+    rendered = dict(zip(planned, narrator.render_many(list(planned.values()))))
+
+    if "start" in rendered:
+        print(rendered["start"])
     if res.get("encounter"):
-        winner = res.get("winner", "?")
         outcome = "Victory!" if winner == "A" else "Defeat..."
-        intro_line, intro_tpl = pick_template_line(
-            style_name,
-            "encounter_intro",
-            tpl_ctx,
-            seed=_seed_with_offset(base_seed, 1),
-        )
-        if intro_line:
-            intro_ctx = dict(tpl_ctx)
-            intro_ctx.update(
-                {
-                    "style": style_name,
-                    "section": "travel",
-                    "tpl_id": intro_tpl,
-                }
-            )
-            print(narrator.render("travel#encounter_intro", intro_line, intro_ctx))
+        if "intro" in rendered:
+            print(rendered["intro"])
         print(f"Encounter: {res['encounter']} — {outcome}")
         if notes:
             print("\n".join(notes))
@@ -978,46 +1018,10 @@ def travel(
             f"{p.name} {st.current_hp.get(p.id, p.max_hp)}/{p.max_hp}" for p in st.party
         )
         print(f"Party HP: {hp}")
-        outcome_key = "encounter_victory" if winner == "A" else "encounter_defeat"
-        outcome_line, outcome_tpl = pick_template_line(
-            style_name,
-            outcome_key,
-            tpl_ctx,
-            seed=_seed_with_offset(base_seed, 2),
-        )
-        if outcome_line:
-            outcome_ctx = dict(tpl_ctx)
-            outcome_ctx.update(
-                {
-                    "style": style_name,
-                    "section": "travel",
-                    "tpl_id": outcome_tpl,
-                }
-            )
-            print(
-                narrator.render(
-                    f"travel#{outcome_key}", outcome_line, outcome_ctx
-                )
-            )
-    else:
-        no_encounter_line, no_tpl = pick_template_line(
-            style_name,
-            "travel_no_encounter",
-            tpl_ctx,
-            seed=_seed_with_offset(base_seed, 1),
-        )
-        if no_encounter_line:
-            no_ctx = dict(tpl_ctx)
-            no_ctx.update(
-                {
-                    "style": style_name,
-                    "section": "travel",
-                    "tpl_id": no_tpl,
-                }
-            )
-            print(
-                narrator.render("travel#no_encounter", no_encounter_line, no_ctx)
-            )
+        if "outcome" in rendered:
+            print(rendered["outcome"])
+    elif "no_encounter" in rendered:
+        print(rendered["no_encounter"])
 
 
 @app.command()
@@ -1285,13 +1289,15 @@ def story(
             persist()
             break
 
+        lines = []
         if scene.text:
-            print(narrator.render(scene.id, scene.text, ctx))
-
+            lines.append((scene.id, scene.text, ctx))
         if scene.if_flag and scene.if_flag.flag and scene.if_flag.flag in flags:
             cond_text = scene.if_flag.text or ""
             if cond_text:
-                print(narrator.render(f"{scene.id}#if", cond_text, ctx))
+                lines.append((f"{scene.id}#if", cond_text, ctx))
+        for text in narrator.render_many(lines):
+            print(text)
 
         if scene.check:
             chk = scene.check
@@ -1329,15 +1335,9 @@ def story(
         if scene.encounter:
             enemies = _parse_enemies(scene.encounter)
             allies_map = party_to_combatants(state)
-            foes = []
-            for idx, name in enumerate(enemies, 1):
-                cmb = make_combatant_from_monster(name, team="B", cid=f"E{idx}")
-                wp, off = weapon_names_for_monster(name)
-                if wp:
-                    cmb.weapon = wp
-                cmb.offhand = off
+            foes = make_combatants(enemies, team="B")
+            for cmb in foes:
                 cmb.environment_light = getattr(state, "light_level", "normal")
-                foes.append(cmb)
             roster = list(allies_map.values()) + foes
             res = run_skirmish(roster, seed=rng.randint(1, 999999))
             apply_combat_results(state, allies_map)
@@ -1557,17 +1557,31 @@ def journal(
     clear: bool = typer.Option(False, "--clear", help="Erase the journal after showing"),
     style: str = typer.Option("compact", "--style", help="compact|detailed"),
     export: str | None = typer.Option(None, "--export", help="Write to path (.md or .txt)"),
+    day: int | None = typer.Option(None, "--day", help="Only entries from this day"),
+    kind: str | None = typer.Option(None, "--kind", help="Only entries of this kind"),
+    loc: str | None = typer.Option(None, "--loc", help="Only entries at this location"),
+    page: int | None = typer.Option(None, "--page", help="Show page N, counting back from the newest"),
+    per_page: int = typer.Option(20, "--per-page", help="Entries per page"),
 ):
     """Print or export the adventure log from the campaign save."""
 
     st = _load_state(load)
     _apply_style_from_context(st, ctx)
-    entries = list(getattr(st, "journal", []) or [])
-    if grep:
-        needle = grep.lower()
-        entries = [e for e in entries if needle in (e.get("text", "").lower())]
-    if tail is not None and tail > 0:
-        entries = entries[-tail:]
+    log = _journal_log(st, load)
+    filters = {
+        "day": day if isinstance(day, int) else None,
+        "kind": kind if isinstance(kind, str) else None,
+        "loc": loc if isinstance(loc, str) else None,
+        "grep": grep if isinstance(grep, str) and grep else None,
+    }
+    more = False
+    if isinstance(page, int) and page > 0:
+        size = per_page if isinstance(per_page, int) and per_page > 0 else 20
+        entries, more = log.page(page, size, **filters)
+    elif tail is not None and tail > 0:
+        entries, _ = log.page(1, tail, **filters)
+    else:
+        entries = list(log.entries(**filters))
 
     export_path = export if isinstance(export, str) else None
     if export_path:
@@ -1579,8 +1593,10 @@ def journal(
             print("\n".join(lines))
         else:
             print("(Journal is empty.)")
+        if more:
+            print(f"(Older entries: --page {page + 1})")
     if clear:
-        st.journal = []
+        log.clear()
         _save_state(st, load)
         print("(Journal cleared.)")
 
@@ -1626,6 +1642,20 @@ def quest(
     _save_state(st, load)
 
 
+@app.command()
+def export(
+    load: str = typer.Option(..., "--load"),
+    out: str | None = typer.Option(None, "--out", help="Write to this path instead of the save"),
+    fmt: str | None = typer.Option(None, "--format", help="json|yaml (default: from the suffix)"),
+):
+    """Write the current campaign state out as YAML or JSON."""
+
+    out_path = out if isinstance(out, str) else None
+    fmt_value = fmt if isinstance(fmt, str) else None
+    target = export_campaign(load, out_path, fmt_value)
+    print(f"Exported campaign to {target}")
+
+
 def campaign_loop(path: str, ctx: typer.Context | None = None) -> None:
     """Interactive loop allowing continuous campaign play."""
     state = _load_state(path)
@@ -0,0 +1,352 @@
+"""
+campaign_session.py — ``grimbrain serve``: a long-lived campaign session.
+
+Every ``campaign_play`` subcommand normally runs in a fresh process that
+imports the engine, loads the SRD and the campaign save, and writes the save
+back.  A session pays for that once: it imports everything at startup, keeps
+each campaign state it loads in memory, and writes dirty states out every
+``--autosave`` seconds, on ``flush`` and on exit.  Process-wide caches
+(monster catalog, bestiary, narration store, template packs, AI transport)
+stay warm between commands.
+
+Requests are JSON-RPC 2.0, one object per line, on stdin (replies on stdout)
+or on a Unix socket (``--socket PATH``)::
+
+    {"jsonrpc": "2.0", "id": 1, "method": "travel", "params": {"load": "camp.json", "hours": 4}}
+    {"jsonrpc": "2.0", "id": 1, "result": {"output": "...", "exit_code": 0}}
+
+Methods are the ``campaign_play`` commands (params are their keyword
+arguments) plus ``flush`` and ``shutdown``.  ``params.stdin`` is an optional
+list of lines answering the command's prompts (shop, story choices).  While
+serving, the session owns the saves it has loaded; edits made to them by
+other processes are overwritten at the next write.
+
+Environment:
+  GB_SERVE_AUTOSAVE=secs  seconds between writes of dirty states (default 30, 0 = only on flush/exit)
+"""
+
+from __future__ import annotations
+
+import copy
+import inspect
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+import typer
+from typer.models import ArgumentInfo, OptionInfo
+
+from grimbrain.scripts import campaign_play as cp
+
+DEFAULT_AUTOSAVE = 30.0
+
+COMMANDS = (
+    "explore",
+    "export",
+    "journal",
+    "long_rest",
+    "quest",
+    "shop",
+    "short_rest",
+    "status",
+    "story",
+    "travel",
+)
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+COMMAND_FAILED = -32000
+
+
+def _autosave_interval() -> float:
+    try:
+        return max(0.0, float(os.getenv("GB_SERVE_AUTOSAVE", str(DEFAULT_AUTOSAVE))))
+    except ValueError:
+        return DEFAULT_AUTOSAVE
+
+
+class SessionError(Exception):
+    """A request the session cannot run; ``code`` is the JSON-RPC error code."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def _bind(func: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Keyword arguments for a command: ``params`` plus the command's own defaults."""
+    sig = inspect.signature(func)
+    unknown = sorted(set(params) - set(sig.parameters) - {"ctx"})
+    if unknown:
+        raise SessionError(INVALID_PARAMS, f"Unknown params: {', '.join(unknown)}")
+    kwargs: Dict[str, Any] = {}
+    for name, param in sig.parameters.items():
+        if name == "ctx":
+            kwargs[name] = None
+            continue
+        if name in params:
+            kwargs[name] = params[name]
+            continue
+        default = param.default
+        if isinstance(default, (OptionInfo, ArgumentInfo)):
+            default = default.default
+        if default is inspect.Parameter.empty or default is Ellipsis:
+            raise SessionError(INVALID_PARAMS, f"Missing param: {name}")
+        kwargs[name] = default
+    return kwargs
+
+
+class CampaignSession:
+    """Campaign states held in memory across ``campaign_play`` commands."""
+
+    def __init__(self, autosave: Optional[float] = None) -> None:
+        self.autosave = _autosave_interval() if autosave is None else max(0.0, autosave)
+        self._states: Dict[str, Tuple[Path, Any]] = {}
+        self._dirty: set[str] = set()
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        self._previous = None
+        self.commands_run = 0
+
+    # -- state hooks used by campaign_play -----------------------------------
+
+    def load(self, path: str | Path):
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._states.get(key)
+            if entry is None:
+                entry = self._states[key] = (Path(path), cp._read_state(path))
+            return copy.deepcopy(entry[1])
+
+    def save(self, state: Any, path: str | Path) -> Path:
+        key = os.path.abspath(path)
+        with self._lock:
+            self._states[key] = (Path(path), state)
+            self._dirty.add(key)
+        return Path(path)
+
+    def flush(self) -> int:
+        """Write every state changed since the last flush; returns how many."""
+        with self._lock:
+            dirty, self._dirty = sorted(self._dirty), set()
+            for key in dirty:
+                path, state = self._states[key]
+                cp._write_state(state, path)
+            return len(dirty)
+
+    # -- lifecycle ----------------------------------------------------------------
+
+    def __enter__(self) -> "CampaignSession":
+        self._previous, cp._SESSION = cp._SESSION, self
+        if self.autosave:
+            self._stop.clear()
+            self._timer = threading.Thread(target=self._autosave_loop, daemon=True)
+            self._timer.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            if cp._SESSION is self:
+                cp._SESSION = self._previous
+
+    def _autosave_loop(self) -> None:
+        while not self._stop.wait(self.autosave):
+            try:
+                self.flush()
+            except Exception as exc:  # keep serving; the next flush retries
+                print(f"(autosave failed: {exc})", file=sys.stderr)
+
+    # -- commands -------------------------------------------------------------
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        params = dict(params or {})
+        if method == "flush":
+            return {"saved": self.flush()}
+        if method not in COMMANDS:
+            raise SessionError(METHOD_NOT_FOUND, f"Unknown method: {method}")
+        stdin_lines = params.pop("stdin", None) or []
+        if not isinstance(stdin_lines, list):
+            raise SessionError(INVALID_PARAMS, "stdin must be a list of lines")
+        func = getattr(cp, method)
+        kwargs = _bind(func, params)
+        buf = io.StringIO()
+        exit_code = 0
+        with self._lock:
+            if method == "export":
+                self.flush()  # export reads the save's store
+            cp._CURRENT_STYLE = None  # a fresh process would start without one
+            saved_stdin = sys.stdin
+            sys.stdin = io.StringIO("".join(f"{line}\n" for line in stdin_lines))
+            try:
+                with redirect_stdout(buf):
+                    func(**kwargs)
+            except typer.Exit as exc:
+                exit_code = int(getattr(exc, "exit_code", getattr(exc, "code", 0)) or 0)
+            except SystemExit as exc:
+                exit_code = int(exc.code or 0) if isinstance(exc.code, int) else 1
+            except Exception as exc:
+                raise SessionError(COMMAND_FAILED, f"{type(exc).__name__}: {exc}") from exc
+            finally:
+                sys.stdin = saved_stdin
+            self.commands_run += 1
+        return {"output": buf.getvalue(), "exit_code": exit_code}
+
+    def handle(self, request: Any) -> Optional[Dict[str, Any]]:
+        """JSON-RPC reply for ``request``; ``None`` for notifications."""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        req_id = request.get("id")
+        params = request.get("params")
+        if params is not None and not isinstance(params, dict):
+            return _error(req_id, INVALID_PARAMS, "params must be an object")
+        try:
+            result = self.call(request["method"], params)
+        except SessionError as exc:
+            reply = _error(req_id, exc.code, str(exc))
+        else:
+            reply = {"jsonrpc": "2.0", "id": req_id, "result": result}
+        return reply if "id" in request else None
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """Reply line for one request line (or batch); ``None`` if nothing to send."""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return json.dumps(_error(None, PARSE_ERROR, "Parse error"))
+        if isinstance(request, list):
+            replies = [r for r in (self.handle(item) for item in request) if r is not None]
+            return json.dumps(replies) if replies else None
+        reply = self.handle(request)
+        return json.dumps(reply) if reply is not None else None
+
+
+def _error(req_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
+
+
+def _is_shutdown(line: str) -> bool:
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return False
+    return isinstance(request, dict) and request.get("method") == "shutdown"
+
+
+def _shutdown_reply(line: str) -> Optional[str]:
+    request = json.loads(line)
+    if "id" not in request:
+        return None
+    return json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": {"ok": True}})
+
+
+# ---------------------------------------------------------------------------
+# Transports
+
+
+def serve_stdio(session: CampaignSession, stdin: TextIO, stdout: TextIO) -> None:
+    """Answer requests from ``stdin`` until EOF or ``shutdown``."""
+    for line in stdin:
+        if not line.strip():
+            continue
+        if _is_shutdown(line):
+            reply = _shutdown_reply(line)
+            if reply:
+                stdout.write(reply + "\n")
+                stdout.flush()
+            return
+        reply = session.handle_line(line)
+        if reply is not None:
+            stdout.write(reply + "\n")
+            stdout.flush()
+
+
+class _SocketHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server = self.server
+        for raw in self.rfile:
+            line = raw.decode("utf-8")
+            if not line.strip():
+                continue
+            if _is_shutdown(line):
+                reply = _shutdown_reply(line)
+                if reply:
+                    self.wfile.write((reply + "\n").encode("utf-8"))
+                threading.Thread(target=server.shutdown, daemon=True).start()
+                return
+            reply = server.session.handle_line(line)  # type: ignore[attr-defined]
+            if reply is not None:
+                self.wfile.write((reply + "\n").encode("utf-8"))
+
+
+class _SocketServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def serve_socket(session: CampaignSession, path: str | Path) -> None:
+    """Answer requests on a Unix socket at ``path`` until ``shutdown``."""
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+    server = _SocketServer(str(path), _SocketHandler)
+    server.session = session  # type: ignore[attr-defined]
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+
+
+def serve(socket_path: Optional[str] = None, autosave: Optional[float] = None) -> int:
+    """Run a session on ``socket_path`` (or stdin/stdout) until shutdown or SIGTERM."""
+
+    def _terminate(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, _terminate)
+    with CampaignSession(autosave=autosave) as session:
+        try:
+            if socket_path:
+                print(f"Serving campaign session on {socket_path}", file=sys.stderr)
+                serve_socket(session, socket_path)
+            else:
+                serve_stdio(session, sys.stdin, sys.stdout)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="grimbrain serve")
+    parser.add_argument("--socket", help="Unix socket path (default: JSON-RPC on stdin/stdout)")
+    parser.add_argument("--autosave", type=float, default=None, help="Seconds between writes")
+    args = parser.parse_args(argv)
+    return serve(args.socket, args.autosave)
+
+
+__all__ = ["CampaignSession", "SessionError", "serve", "serve_socket", "serve_stdio"]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(_main())
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 def _generate_id() -> str:
@@ -28,6 +28,7 @@ class TextNode:
     text: str
     metadata: Dict[str, Any]
     node_id: str
+    embedding: Optional[List[float]] = None
 
     def get_content(self) -> str:
         return self.text
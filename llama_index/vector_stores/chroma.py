@@ -46,7 +46,11 @@ class ChromaVectorStore:
             texts.append(text)
             meta = dict(getattr(node, "metadata", {}) or {})
             metadatas.append(meta)
-            if embeddings is not None:
+            if getattr(node, "embedding", None) is not None:
+                # Like the real store: precomputed embeddings are used as-is.
+                embeddings = embeddings if embeddings is not None else []
+                embeddings.append(list(node.embedding))
+            elif embeddings is not None:
                 embeddings.append(embed_model.get_text_embedding(text))
 
         kwargs = {"ids": ids, "metadatas": metadatas, "documents": texts}
@@ -21,7 +21,7 @@ def load_packs(names: List[str]) -> Dict[str, dict]:
     """
 
     try:
-        from grimbrain.content import load_packs as _real  # type: ignore
+        from grimbrain.content.packs import load_packs as _real  # type: ignore
     except Exception:  # pragma: no cover
         return {}
     return _real(names)
@@ -1,10 +1,14 @@
 import json
 import os
+import random
+import string
+import zlib
 from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
 from grimbrain.ai import CacheInputs, call_with_cache, make_key
+from grimbrain.ai.ai_cache import read_index
 
 
 def _inputs(prompt: str = "Hello", **param_overrides) -> CacheInputs:
@@ -26,10 +30,11 @@ def _inputs(prompt: str = "Hello", **param_overrides) -> CacheInputs:
 
 
 def _read_index(cache_dir) -> dict:
-    path = cache_dir / "index.json"
-    if not path.exists():
-        return {}
-    return json.loads(path.read_text(encoding="utf-8"))
+    return read_index(cache_dir)
+
+
+def _blob_files(cache_dir) -> list:
+    return sorted(cache_dir.glob("blobs/*/*.z"))
 
 
 @pytest.fixture(autouse=True)
@@ -79,8 +84,7 @@ def test_key_sensitive_to_params(tmp_path, monkeypatch):
     assert {out_a, out_b} == {"A", "B"}
     assert calls == ["A", "B"]
     assert make_key(inputs_a) != make_key(inputs_b)
-    txt_files = {p.name for p in tmp_path.glob("*.txt")}
-    assert len(txt_files) == 2
+    assert len(_blob_files(tmp_path)) == 2
 
 
 def test_call_with_cache_passes_inputs(tmp_path, monkeypatch):
@@ -112,8 +116,7 @@ def test_atomic_single_write_under_concurrency(tmp_path, monkeypatch):
 
     assert results == ["value"] * 5
     assert calls == ["hit"]  # generator executed once
-    txt_files = list(tmp_path.glob("*.txt"))
-    assert len(txt_files) == 1
+    assert len(_blob_files(tmp_path)) == 1
     idx = _read_index(tmp_path)
     key = make_key(inputs)
     assert idx["entries"][key]["hits"] == 5
@@ -155,7 +158,8 @@ def test_stale_index_recovery(tmp_path, monkeypatch):
     idx = _read_index(tmp_path)
     entry = idx["entries"][key]
     assert entry["hits"] == 1
-    assert (tmp_path / f"{key}.txt").read_text(encoding="utf-8") == "new text"
+    (blob,) = _blob_files(tmp_path)
+    assert zlib.decompress(blob.read_bytes()).decode("utf-8") == "new text"
 
 
 def test_disable_and_refresh_flags(tmp_path, monkeypatch):
@@ -198,7 +202,9 @@ def test_eviction_basic(tmp_path, monkeypatch):
     monkeypatch.setenv("GRIMBRAIN_AI_CACHE_MAX_BYTES", "60")
 
     def generator_factory(label: str):
-        payload = label * 40
+        # Incompressible, so each payload takes ~45 bytes on disk.
+        rng = random.Random(label)
+        payload = "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(40))
 
         def inner():
             return payload
@@ -215,5 +221,140 @@ def test_eviction_basic(tmp_path, monkeypatch):
 
     idx = _read_index(tmp_path)
     assert len(idx["entries"]) <= 2
-    existing_files = {p.name for p in tmp_path.glob("*.txt")}
-    assert len(existing_files) == len(idx["entries"])
+    assert len(_blob_files(tmp_path)) == len(idx["entries"])
+
+
+def test_hits_append_to_log_without_rewriting_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv("GRIMBRAIN_AI_CACHE_DIR", str(tmp_path))
+    inputs = _inputs("Append only")
+    call_with_cache(inputs, lambda: "text")
+    snapshot = tmp_path / "index.json"
+    before = snapshot.stat().st_mtime_ns if snapshot.exists() else None
+    for _ in range(3):
+        assert call_with_cache(inputs, lambda: "other") == "text"
+    after = snapshot.stat().st_mtime_ns if snapshot.exists() else None
+    assert before == after
+    ops = [json.loads(l)["op"] for l in (tmp_path / "index.0.log").read_text().splitlines()]
+    assert ops == ["put", "hit", "hit", "hit"]
+    assert _read_index(tmp_path)["entries"][make_key(inputs)]["hits"] == 4
+
+
+def test_log_is_compacted_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv("GRIMBRAIN_AI_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr("grimbrain.ai.ai_cache._COMPACT_MIN_OPS", 4)
+    call_with_cache(_inputs("a"), lambda: "text a")
+    call_with_cache(_inputs("b"), lambda: "text b")
+    for _ in range(3):
+        call_with_cache(_inputs("a"), lambda: "miss")
+    snapshot = json.loads((tmp_path / "index.json").read_text(encoding="utf-8"))
+    assert snapshot["log"] == 1 and len(snapshot["entries"]) == 2
+    assert snapshot["entries"][make_key(_inputs("a"))]["hits"] == 4
+    assert not (tmp_path / "index.0.log").exists()
+    assert call_with_cache(_inputs("b"), lambda: "miss") == "text b"
+    assert _read_index(tmp_path)["entries"][make_key(_inputs("b"))]["hits"] == 2
+
+
+def test_concurrent_misses_share_one_call_without_holding_lock(tmp_path, monkeypatch):
+    import threading
+
+    monkeypatch.setenv("GRIMBRAIN_AI_CACHE_DIR", str(tmp_path))
+    release = threading.Event()
+    calls: list[str] = []
+
+    def slow(received):
+        calls.append(received.messages[0]["content"])
+        release.wait(5)
+        return "slow " + received.messages[0]["content"]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(call_with_cache, _inputs("same"), slow) for _ in range(3)]
+        # A different key is not blocked behind the in-flight call.
+        assert call_with_cache(_inputs("other"), lambda: "fast") == "fast"
+        release.set()
+        assert [f.result() for f in futures] == ["slow same"] * 3
+    assert calls == ["same"]
+    assert _read_index(tmp_path)["entries"][make_key(_inputs("same"))]["hits"] == 3
+
+
+def test_call_many_and_async(tmp_path, monkeypatch):
+    import asyncio
+
+    from grimbrain.ai import acall_with_cache, call_many_with_cache
+
+    monkeypatch.setenv("GRIMBRAIN_AI_CACHE_DIR", str(tmp_path))
+    calls: list[str] = []
+
+    def generator(received):
+        calls.append(received.messages[0]["content"])
+        return received.messages[0]["content"].upper()
+
+    batch = [_inputs("a"), _inputs("b"), _inputs("a"), _inputs("c")]
+    assert call_many_with_cache(batch, generator, max_workers=3) == ["A", "B", "A", "C"]
+    assert sorted(calls) == ["a", "b", "c"]
+
+    async def agen(received):
+        await asyncio.sleep(0)
+        return "async " + received.messages[0]["content"]
+
+    async def main():
+        return await asyncio.gather(
+            acall_with_cache(_inputs("a"), agen), acall_with_cache(_inputs("d"), agen)
+        )
+
+    assert asyncio.run(main()) == ["A", "async d"]
+
+
+def test_identical_outputs_share_one_compressed_blob(tmp_path, monkeypatch):
+    monkeypatch.setenv("GRIMBRAIN_AI_CACHE_DIR", str(tmp_path))
+    text = "The torchlight gutters. " * 20
+    call_with_cache(_inputs("one"), lambda: text)
+    call_with_cache(_inputs("two"), lambda: text)
+    (blob,) = _blob_files(tmp_path)
+    assert blob.stat().st_size < len(text)
+    entries = _read_index(tmp_path)["entries"]
+    assert len(entries) == 2 and {e["blob"] for e in entries.values()} == {blob.stem}
+
+    # The shared blob survives until its last entry is evicted.
+    monkeypatch.setenv("GRIMBRAIN_AI_REFRESH_CACHE", "1")
+    assert call_with_cache(_inputs("one"), lambda: "changed") == "changed"
+    monkeypatch.delenv("GRIMBRAIN_AI_REFRESH_CACHE")
+    assert call_with_cache(_inputs("two"), lambda: "miss") == text
+    assert len(_blob_files(tmp_path)) == 2
+
+
+def test_eviction_keeps_recently_hit_entries(tmp_path, monkeypatch):
+    monkeypatch.setenv("GRIMBRAIN_AI_CACHE_DIR", str(tmp_path))
+
+    def payload(label):
+        rng = random.Random(label)
+        return "".join(rng.choice(string.ascii_letters) for _ in range(200))
+
+    for label in "abc":
+        call_with_cache(_inputs(label), lambda label=label: payload(label))
+    call_with_cache(_inputs("a"), lambda: "miss")  # a is now most recent
+    size = _blob_files(tmp_path)[0].stat().st_size
+    monkeypatch.setenv("GRIMBRAIN_AI_CACHE_MAX_BYTES", str(size * 3 + size // 2))
+    call_with_cache(_inputs("d"), lambda: payload("d"))
+    keys = set(_read_index(tmp_path)["entries"])
+    assert keys == {make_key(_inputs(x)) for x in "acd"}
+
+
+def test_hit_after_missed_compaction_does_not_recreate_old_log(tmp_path, monkeypatch):
+    from grimbrain.ai.ai_cache import _IndexStore
+
+    monkeypatch.setenv("GRIMBRAIN_AI_CACHE_DIR", str(tmp_path))
+    inputs = _inputs("Compacted elsewhere")
+    call_with_cache(inputs, lambda: "text")
+    key = make_key(inputs)
+
+    reader = _IndexStore(tmp_path)  # another process's view, still on generation 0
+    reader.refresh()
+    other = _IndexStore(tmp_path)
+    other.refresh()
+    other.compact()
+
+    reader.hit(key)
+    assert not (tmp_path / "index.0.log").exists()
+    ops = [json.loads(l)["op"] for l in (tmp_path / "index.1.log").read_text().splitlines()]
+    assert ops == ["hit"]
+    assert _read_index(tmp_path)["entries"][key]["hits"] == 2
@@ -0,0 +1,73 @@
+import socket
+
+import pytest
+
+from grimbrain.engine.ai_transport import HTTPTransport, StubServer, TransportError
+from grimbrain.engine.narrator_ai import AINarrator
+
+
+@pytest.fixture(autouse=True)
+def _no_cache(monkeypatch):
+    monkeypatch.setenv("GRIMBRAIN_AI_DISABLE_CACHE", "1")
+
+
+def test_transport_reuses_one_connection():
+    with StubServer() as server:
+        transport = HTTPTransport(server.url, retries=0)
+        for i in range(5):
+            data = transport.post_json("/v1/responses", {"input": [{"role": "user", "content": str(i)}]}, {})
+            assert data["output"][0]["content"][0]["text"].endswith(str(i))
+        transport.close()
+        assert server.connections == 1
+        assert transport.connections_opened == 1
+
+
+def test_transport_retries_server_errors_then_gives_up():
+    with StubServer() as server:
+        transport = HTTPTransport(server.url, retries=2, backoff=0.001)
+        server.fail_next.extend([503, 429])
+        assert transport.post_json("/v1/responses", {}, {})["output"]
+        assert len(server.requests) == 3
+
+        server.fail_next.extend([400])
+        with pytest.raises(TransportError) as err:
+            transport.post_json("/v1/responses", {}, {})
+        assert err.value.status == 400
+
+        server.fail_next.extend([503, 502, 500, 504])
+        with pytest.raises(TransportError) as err:
+            transport.post_json("/v1/responses", {}, {})
+        assert err.value.status == 500
+        assert len(server.requests) == 7
+        assert server.fail_next == [504]
+        transport.close()
+
+
+def test_transport_timeout_on_reused_connection_is_not_resent():
+    with StubServer() as server:
+        transport = HTTPTransport(server.url, retries=1, backoff=0.001, timeout=0.1)
+        assert transport.post_json("/v1/responses", {}, {})["output"]
+        server.latency = 0.3
+        with pytest.raises(TransportError) as err:
+            transport.post_json("/v1/responses", {}, {})
+        assert "timed out" in str(err.value)
+        assert len(server.requests) == 3  # one send per attempt, no free re-POST
+
+        # A keep-alive connection the server dropped is replaced silently.
+        server.latency = 0.0
+        assert transport.post_json("/v1/responses", {}, {})["output"]
+        transport._idle[0].sock.shutdown(socket.SHUT_RDWR)
+        assert transport.post_json("/v1/responses", {}, {})["output"]
+        transport.close()
+
+
+def test_ai_narrator_uses_transport_and_falls_back():
+    with StubServer(reply=lambda prompt: f"AI: {prompt}") as server:
+        transport = HTTPTransport(server.url, retries=0)
+        narrator = AINarrator(api_key="k", transport=transport)
+        assert narrator.render("Hello {{who}}", {"who": "Ana"}) == "AI: Hello Ana"
+        assert narrator.render("Again", {}) == "AI: Again"
+        assert server.connections == 1
+        server.fail_next.append(500)
+        assert narrator.render("Fallback {{who}}", {"who": "Bo"}) == "Fallback Bo"
+        transport.close()
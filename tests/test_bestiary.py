@@ -1,4 +1,12 @@
-from grimbrain.engine.bestiary import make_combatant_from_monster, weapon_names_for_monster
+import json
+import os
+
+from grimbrain.engine import bestiary
+from grimbrain.engine.bestiary import (
+    make_combatant_from_monster,
+    make_combatants,
+    weapon_names_for_monster,
+)
 
 
 def test_load_goblin_minimal_fields():
@@ -10,3 +18,28 @@ def test_load_goblin_minimal_fields():
 def test_weapon_mapping_exists():
     w1, w2 = weapon_names_for_monster("Goblin")
     assert w1 is not None
+
+
+def test_make_combatants_clones_prototype():
+    foes = make_combatants(["Goblin x3", "Ogre"])
+    assert [f.id for f in foes] == ["E1", "E2", "E3", "E4"]
+    assert [f.name for f in foes] == ["Goblin", "Goblin", "Goblin", "Ogre"]
+    assert all(f.team == "B" for f in foes)
+    foes[0].hp -= 3
+    foes[0].conditions.add("prone")
+    assert foes[1].hp == foes[1].max_hp and "prone" not in foes[1].conditions
+    assert foes[0].actor is not foes[1].actor
+
+
+def test_bestiary_cache_tracks_file_changes(tmp_path, monkeypatch):
+    blob = json.loads((bestiary.MONSTER_DIR / "goblin.json").read_text())
+    path = tmp_path / "goblin.json"
+    path.write_text(json.dumps(blob))
+    monkeypatch.setattr(bestiary, "MONSTER_DIR", tmp_path)
+    assert make_combatant_from_monster("Goblin", team="B").hp == blob["hp"]
+    path.write_text(json.dumps(dict(blob, hp=99)))
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+    assert make_combatant_from_monster("Goblin", team="B").hp == 99
+    # Callers of the public loader get their own copy.
+    bestiary._load_monster_blob("Goblin")["hp"] = 1
+    assert bestiary._load_monster_blob("Goblin")["hp"] == 99
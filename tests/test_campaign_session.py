@@ -0,0 +1,84 @@
+import io
+import json
+import socket
+import threading
+import time
+
+from grimbrain.engine.campaign import CampaignState, PartyMemberRef, save_campaign
+from grimbrain.io.campaign_io import load_campaign
+from grimbrain.scripts import campaign_play
+from grimbrain.scripts.campaign_session import CampaignSession, serve_socket, serve_stdio
+
+
+def _save(tmp_path):
+    st = CampaignState(
+        seed=4,
+        party=[PartyMemberRef(id="PC1", name="Scout", str_mod=0, dex_mod=2, con_mod=1,
+                              int_mod=0, wis_mod=0, cha_mod=0, ac=13, max_hp=10, pb=2,
+                              speed=30, weapon_primary="Bow")],
+    )
+    path = tmp_path / "camp.json"
+    save_campaign(st, str(path))
+    return path
+
+
+def _rpc(req_id, method, **params):
+    return json.dumps({"jsonrpc": "2.0", "id": req_id, "method": method, "params": params})
+
+
+def test_session_keeps_state_in_memory_until_flush(tmp_path):
+    path = _save(tmp_path)
+    with CampaignSession(autosave=0) as session:
+        reply = json.loads(session.handle_line(_rpc(1, "quest", load=str(path), add="Find the relic")))
+        assert "Added quest Q1" in reply["result"]["output"]
+        reply = json.loads(session.handle_line(_rpc(2, "quest", load=str(path))))
+        assert "Q1: Find the relic" in reply["result"]["output"]
+        assert load_campaign(path)["quest_log"] == []  # not written yet
+
+        reply = json.loads(session.handle_line(_rpc(3, "journal", load=str(path), kind="quest")))
+        assert "(quest) Quest added: Q1" in reply["result"]["output"]
+
+        reply = json.loads(session.handle_line(_rpc(4, "nope")))
+        assert reply["error"]["code"] == -32601
+        reply = json.loads(session.handle_line(_rpc(5, "status")))
+        assert reply["error"]["code"] == -32602
+        assert json.loads(session.handle_line("{oops"))["error"]["code"] == -32700
+        assert session.handle_line(json.dumps({"jsonrpc": "2.0", "method": "flush"})) is None
+    assert campaign_play._SESSION is None
+    assert load_campaign(path)["quest_log"][0]["text"] == "Find the relic"
+
+
+def test_stdio_and_socket_transports(tmp_path):
+    path = _save(tmp_path)
+    stdin = io.StringIO(
+        _rpc(1, "status", load=str(path)) + "\n"
+        + _rpc(2, "shutdown") + "\n"
+        + _rpc(3, "status", load=str(path)) + "\n"
+    )
+    stdout = io.StringIO()
+    with CampaignSession(autosave=0) as session:
+        serve_stdio(session, stdin, stdout)
+    replies = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [r["id"] for r in replies] == [1, 2]
+    assert "Day 1 morning" in replies[0]["result"]["output"]
+
+    sock_path = tmp_path / "gb.sock"
+    with CampaignSession(autosave=0) as session:
+        thread = threading.Thread(target=serve_socket, args=(session, sock_path))
+        thread.start()
+        for _ in range(100):
+            if sock_path.exists():
+                break
+            time.sleep(0.01)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(sock_path))
+            stream = client.makefile("rw")
+            stream.write(_rpc(1, "quest", load=str(path), add="Scout the ridge") + "\n")
+            stream.flush()
+            assert "Added quest Q1" in json.loads(stream.readline())["result"]["output"]
+            stream.write(_rpc(2, "shutdown") + "\n")
+            stream.flush()
+            assert json.loads(stream.readline())["result"] == {"ok": True}
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    assert load_campaign(path)["quest_log"][0]["text"] == "Scout the ridge"
@@ -0,0 +1,111 @@
+import json
+import os
+import time
+
+from grimbrain.io.campaign_io import commit_campaign, export_campaign, load_campaign, save_campaign
+from grimbrain.io.campaign_store import (
+    CampaignStore,
+    apply_ops,
+    diff_document,
+    reset_campaign_stores,
+    store_dir,
+)
+
+
+def _doc(hp=10, gold=5):
+    return {
+        "seed": 7,
+        "day": 1,
+        "time_of_day": "morning",
+        "party": [{"id": "PC1", "name": "Scout", "max_hp": 12, "current_hp": hp}],
+        "current_hp": {"PC1": hp},
+        "gold": gold,
+        "inventory": {"Torch": 2},
+        "quest_log": [],
+    }
+
+
+def test_diff_and_apply_roundtrip():
+    old = _doc()
+    new = _doc(hp=4, gold=9)
+    new["inventory"] = {"Torch": 1, "Rope": 1}
+    new["quest_log"] = [{"id": "Q1", "text": "Find the relic", "done": False}]
+    del new["seed"]
+    ops = diff_document(old, new)
+    assert ["set", ["party", 0, "current_hp"], 4] in ops
+    assert ["del", ["seed"]] in ops
+    assert apply_ops(json.loads(json.dumps(old)), json.loads(json.dumps(ops))) == new
+
+
+def test_commits_append_ops_and_compact(tmp_path, monkeypatch):
+    monkeypatch.setenv("GB_CAMPAIGN_COMPACT_OPS", "3")
+    reset_campaign_stores()
+    path = tmp_path / "camp.json"
+    save_campaign(_doc(), path)
+    original = path.read_text()
+
+    commit_campaign(_doc(hp=8), path)
+    commit_campaign(_doc(hp=6), path)
+    assert path.read_text() == original  # the save itself is not rewritten
+    log = store_dir(path) / "ops.1.log"
+    assert len(log.read_text().splitlines()) == 2
+    assert load_campaign(path)["current_hp"]["PC1"] == 6
+
+    # A fresh process replays the log on top of the snapshot.
+    assert CampaignStore(path).load()["party"][0]["current_hp"] == 6
+    assert json.loads((store_dir(path) / "snapshot.json").read_text())["doc"]["gold"] == 5
+
+    commit_campaign(_doc(hp=5), path)  # third commit compacts
+    assert json.loads(path.read_text())["current_hp"]["PC1"] == 5
+    assert not log.exists()
+    assert not (store_dir(path) / "ops.2.log").exists()
+    reset_campaign_stores()
+
+
+def test_direct_save_and_export(tmp_path):
+    reset_campaign_stores()
+    path = tmp_path / "camp.json"
+    save_campaign(_doc(), path)
+    commit_campaign(_doc(gold=40), path)
+
+    out = export_campaign(path, tmp_path / "copy.yaml")
+    assert "gold: 40" in out.read_text()
+    export_campaign(path)
+    assert json.loads(path.read_text())["gold"] == 40
+
+    # Writing the save directly wins over the store.
+    commit_campaign(_doc(gold=41), path)
+    save_campaign(_doc(gold=1), path)
+    assert load_campaign(path)["gold"] == 1
+    commit_campaign(_doc(gold=2), path)
+    assert load_campaign(path)["gold"] == 2
+    reset_campaign_stores()
+
+
+def test_hand_edit_keeps_unexported_ops(tmp_path):
+    reset_campaign_stores()
+    path = tmp_path / "camp.json"
+    save_campaign(_doc(), path)
+    commit_campaign(_doc(hp=8, gold=20), path)
+
+    edited = json.loads(path.read_text())  # still the pre-commit state
+    edited["inventory"]["Rope"] = 1
+    edited["day"] = 3
+    path.write_text(json.dumps(edited))
+
+    doc = load_campaign(path)
+    assert doc["inventory"] == {"Torch": 2, "Rope": 1} and doc["day"] == 3
+    assert doc["gold"] == 20 and doc["current_hp"]["PC1"] == 8
+    assert CampaignStore(path).load()["inventory"] == doc["inventory"]  # another process agrees
+
+    doc["gold"] = 25
+    commit_campaign(doc, path)
+    export_campaign(path)
+    saved = json.loads(path.read_text())
+    assert saved["gold"] == 25 and saved["day"] == 3 and saved["inventory"]["Rope"] == 1
+
+    # Touching the save changes nothing.
+    commit_campaign(dict(saved, gold=30), path)
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert load_campaign(path)["gold"] == 30
+    reset_campaign_stores()
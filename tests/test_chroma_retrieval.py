@@ -9,7 +9,8 @@ from grimbrain.retrieval.indexing import load_and_index_grouped_by_folder, wipe_
 from grimbrain.retrieval.query_router import get_query_engine, _node_meta
 
 
-def test_monster_retrieval_from_chroma(tmp_path):
+def test_monster_retrieval_from_chroma(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # store generations, leases and hash caches stay out of the tree
     data_dir = tmp_path / "data"
     data_dir.mkdir()
 
@@ -0,0 +1,43 @@
+from grimbrain.retrieval.doc_builders import bound, build_entry, chunk_text, detect_kind
+
+
+def test_detect_kind():
+    assert detect_kind({"name": "Goblin", "hp": {"average": 7}}) == "monster"
+    assert detect_kind({"name": "Fireball", "level": 3, "school": "V"}) == "spell"
+    assert detect_kind({"name": "Action Surge", "className": "Fighter", "level": 2}) == "class"
+    assert detect_kind({"name": "Bag of Holding", "rarity": "uncommon"}) == "item"
+    assert detect_kind({"name": "Alert", "entries": []}, "grim_feats") == "feat"
+    assert detect_kind({"name": "Trinkets", "colLabels": ["d100"], "rows": [[1, "x"]]}) == "table"
+    assert detect_kind({"name": "Abbathor", "pantheon": "Dwarven"}) == "generic"
+
+
+def test_generic_builder_skips_nested_structures():
+    deity = {
+        "name": "Abbathor", "source": "MTF", "page": 73, "pantheon": "Dwarven",
+        "alignment": ["N", "E"], "domains": ["Trickery"],
+        "customExtensionOf": {"deep": [{"nested": "x" * 5000}]},
+        "entries": ["The Great Master of {@i Greed}.", {"type": "entries", "name": "Lore", "entries": ["Old."]}],
+    }
+    [(text, meta)] = build_entry(deity)
+    assert text.splitlines()[0] == "Abbathor"
+    assert "pantheon: Dwarven" in text and "alignment: N, E" in text
+    assert "The Great Master of Greed." in text and "Lore.\nOld." in text
+    assert "nested" not in text and "page" not in text
+    assert meta == {"source": "MTF", "name": "Abbathor", "type": "generic"}
+
+
+def test_text_is_bounded_and_optionally_chunked():
+    item = {"name": "Tome", "source": "DMG", "rarity": "rare", "entries": ["word " * 50] * 100}
+    [(text, meta)] = build_entry(item, limit=500)
+    assert len(text) <= 502 and text.endswith("…")
+    assert meta["type"] == "item" and meta["rarity"] == "rare"
+
+    docs = build_entry(item, limit=2000, chunk=600)
+    assert len(docs) > 1
+    assert all(t.startswith("Tome") and len(t) <= 600 + len("Tome\n") for t, _ in docs)
+    assert [m["chunk"] for _, m in docs] == list(range(len(docs)))
+
+
+def test_bound_and_chunk_text_passthrough():
+    assert bound("short", 100) == "short"
+    assert chunk_text("X", "short", 0) == ["short"]
@@ -18,7 +18,7 @@ def run_play(script, seed=7, json_mode=True, packs="packs/test_effects"):
             "--rules",
             "rules",
             "--out",
-            ".chroma",
+            env["GB_CHROMA_DIR"],
             "--packs",
             packs,
         ]
@@ -0,0 +1,68 @@
+import pytest
+
+from grimbrain.retrieval import generations
+
+
+def test_unversioned_store_is_its_own_generation(tmp_path):
+    base = tmp_path / "chroma_store"
+    assert generations.current_dir(base) == base
+
+
+def test_publish_swaps_pointer_and_prunes(tmp_path):
+    base = tmp_path / "chroma_store"
+    base.mkdir()
+    (base / "legacy.sqlite3").write_text("x")
+
+    first = generations.new_generation(base)
+    generations.publish(base, first)
+    assert generations.current_dir(base) == first
+    assert base.exists()  # previous generation kept for open readers
+
+    second = generations.new_generation(base)
+    assert second.name == "chroma_store.2"
+    assert generations.current_dir(base) == first  # unpublished builds are invisible
+    generations.publish(base, second)
+    assert generations.current_dir(base) == second
+    assert first.exists() and base.exists()  # the unversioned store is never pruned
+
+    generations.prune(base, keep=1)
+    assert not first.exists() and second.exists()
+
+
+def test_discard_unpublished_generation(tmp_path):
+    base = tmp_path / "chroma_store"
+    gen = generations.new_generation(base)
+    generations.discard(gen)
+    assert not gen.exists()
+    assert generations.current_dir(base) == base
+
+
+def test_prune_skips_generations_leased_by_readers(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    base = tmp_path / "chroma_store"
+    first = generations.new_generation(base)
+    generations.publish(base, first)
+
+    # Another reader (a separate open file, as in another process) leases it.
+    reader = open(generations.lease_path(first), "a+b")
+    fcntl.flock(reader.fileno(), fcntl.LOCK_SH)
+    try:
+        for _ in range(2):
+            generations.publish(base, generations.new_generation(base))
+        assert first.exists()
+        assert generations.prune(base, keep=1) == [tmp_path / "chroma_store.2"]
+        assert first.exists()
+    finally:
+        reader.close()
+
+    assert generations.prune(base, keep=1) == [first]
+    assert not generations.lease_path(first).exists()
+    assert generations.lease_current(base) == tmp_path / "chroma_store.3"
+    generations.release_lease()
+
+
+def test_unversioned_store_gets_no_lease_file(tmp_path):
+    base = tmp_path / "chroma_store"
+    base.mkdir()
+    assert generations.lease_current(base) == base
+    assert not generations.lease_path(base).exists()
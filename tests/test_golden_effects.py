@@ -23,7 +23,7 @@ def test_burning_pretty_golden():
         "--rules",
         "rules",
         "--out",
-        ".chroma",
+        env["GB_CHROMA_DIR"],
         "--packs",
         "packs/test_effects",
     ]
@@ -1,3 +1,6 @@
+import json
+from pathlib import Path
+
 from grimbrain.retrieval import indexing
 
 
@@ -23,7 +26,9 @@ def test_wipe_chroma_store(tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
     log = []
     indexing.wipe_chroma_store(log)
-    assert not store_dir.exists()
+    current = indexing.generations.current_dir("chroma_store")
+    assert current.name == "chroma_store.1" and not any(current.iterdir())
+    assert store_dir.exists()  # previous generation kept for open readers
     assert log == [
         {
             "file": "ALL",
@@ -37,3 +42,132 @@ def test_wipe_chroma_store(tmp_path, monkeypatch):
 def test_flatten_field():
     assert indexing.flatten_field({"a": 1, "b": 2}) == "a: 1, b: 2"
     assert indexing.flatten_field("value") == "value"
+
+
+def _write(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload))
+
+
+def test_first_pass_keeps_keys_not_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "data"
+    _write(data_dir / "bestiary" / "mm.json", {"monster": [
+        {"name": "Goblin", "source": "MM", "hp": 7},
+        {"name": "Goblin", "source": "MM", "hp": 7, "traits": ["Nimble Escape"]},
+    ]})
+    updated = {}
+    changed, records, hashes = indexing._scan_json_files(data_dir, {}, updated, [], False)
+    rel = str(Path("bestiary") / "mm.json")
+    assert changed == {"bestiary": [rel]}
+    lookup = indexing._lookups_by_folder(records)
+    assert lookup["bestiary"][("Goblin", "MM")][:2] == (rel, 1)
+    assert updated == hashes
+
+
+def test_streaming_index_batches_and_resolves_copy(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "data"
+    _write(data_dir / "bestiary" / "mm.json", {"monster": [
+        {"name": f"Goblin {i}", "source": "MM", "hp": i} for i in range(5)
+    ]})
+    _write(data_dir / "bestiary" / "homebrew.json", {"monster": [
+        {"name": "Goblin Chief", "source": "HB", "_copy": {"name": "Goblin 3", "source": "MM"}},
+    ]})
+    batches = []
+    monkeypatch.setattr(
+        indexing, "_index_docs_to_chroma",
+        lambda docs, *a: batches.append([d.metadata for d in docs]) or [],
+    )
+    log = []
+    indexing.load_and_index_grouped_by_folder(data_dir, None, log, batch_size=2)
+    assert [len(b) for b in batches] == [2, 2, 2]
+    chief = next(m for b in batches for m in b if m["name"] == "Goblin Chief")
+    assert chief["hp"] == "3"
+    assert log[-1]["entries"] == 6 and log[-1]["collection"] == "grim_bestiary"
+
+    # Unchanged files are only scanned for keys on the next run.
+    batches.clear()
+    indexing.load_and_index_grouped_by_folder(data_dir, None, log, batch_size=2)
+    assert batches == []
+
+
+def test_base_change_reindexes_transitive_copy_dependents(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "data"
+    _write(data_dir / "bestiary" / "mm.json", {"monster": [
+        {"name": "Goblin", "source": "MM", "hp": 7},
+        {"name": "Orc", "source": "MM", "hp": 15},
+    ]})
+    _write(data_dir / "bestiary" / "hb.json", {"monster": [
+        {"name": "Goblin Chief", "source": "HB", "_copy": {"name": "Goblin", "source": "MM"}},
+        {"name": "Orc Chief", "source": "HB", "_copy": {"name": "Orc", "source": "MM"}},
+    ]})
+    _write(data_dir / "bestiary" / "hb2.json", {"monster": [
+        {"name": "Goblin King", "source": "HB2", "_copy": {"name": "Goblin Chief", "source": "HB"}},
+    ]})
+    indexed = []
+    monkeypatch.setattr(
+        indexing, "_index_docs_to_chroma",
+        lambda docs, *a: indexed.extend(d.metadata for d in docs) or [],
+    )
+    indexing.load_and_index_grouped_by_folder(data_dir, None, [])
+    assert indexing.copy_deps_path().exists()
+
+    indexed.clear()
+    _write(data_dir / "bestiary" / "mm.json", {"monster": [
+        {"name": "Goblin", "source": "MM", "hp": 9},
+        {"name": "Orc", "source": "MM", "hp": 15},
+    ]})
+    indexing.load_and_index_grouped_by_folder(data_dir, None, [])
+    by_name = {m["name"]: m for m in indexed}
+    assert set(by_name) == {"Goblin", "Orc", "Goblin Chief", "Goblin King"}
+    assert by_name["Goblin Chief"]["hp"] == "9"
+    assert by_name["Goblin King"]["hp"] == "9"
+
+
+class _BatchEmbed:
+    def __init__(self):
+        self.calls = []
+
+    def get_text_embedding_batch(self, texts):
+        self.calls.append(len(texts))
+        return [[float(len(t))] for t in texts]
+
+
+def test_parallel_pipeline_embeds_in_batches(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "data"
+    for i in range(3):
+        _write(data_dir / "bestiary" / f"b{i}.json", {"monster": [
+            {"name": f"Goblin {i}-{j}", "source": "MM", "hp": j} for j in range(3)
+        ]})
+    _write(data_dir / "spells" / "phb.json", {"spell": [{"name": "Fireball", "source": "PHB", "level": 3}]})
+    written = []
+    monkeypatch.setattr(
+        indexing, "_index_docs_to_chroma",
+        lambda nodes, collection, *a: written.append((collection, [n.embedding for n in nodes])) or [],
+    )
+    embed = _BatchEmbed()
+    log = []
+    indexing.load_and_index_grouped_by_folder(data_dir, embed, log, batch_size=4, workers=2)
+    assert sorted(embed.calls) == [1, 1, 4, 4]
+    assert all(vec is not None for _, vecs in written for vec in vecs)
+    by_collection = {e["collection"]: e for e in log}
+    assert by_collection["grim_bestiary"]["entries"] == 9
+    assert by_collection["grim_spells"]["entries"] == 1
+
+
+def test_force_wipe_builds_a_new_generation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "data"
+    _write(data_dir / "bestiary" / "mm.json", {"monster": [{"name": "Goblin", "source": "MM", "hp": 7}]})
+    targets = []
+    monkeypatch.setattr(
+        indexing, "_index_docs_to_chroma",
+        lambda nodes, collection, vector_dir, *a: targets.append(str(vector_dir)) or [],
+    )
+    indexing.load_and_index_grouped_by_folder(data_dir, None, [], vector_dir="chroma_store")
+    indexing.load_and_index_grouped_by_folder(data_dir, None, [], vector_dir="chroma_store", force_wipe=True)
+    assert targets == ["chroma_store", "chroma_store.1"]
+    assert Path("chroma_store.current").read_text() == "chroma_store.1"
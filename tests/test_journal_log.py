@@ -0,0 +1,74 @@
+import json
+
+from grimbrain.engine.campaign import CampaignState, PartyMemberRef, load_campaign, save_campaign
+from grimbrain.engine.journal import log_event
+from grimbrain.engine.journal_log import JournalLog, journal_dir
+from grimbrain.io.campaign_store import read_document
+from grimbrain.scripts import campaign_play
+
+
+def _entry(i, day, kind="travel", loc="Road"):
+    return {"day": day, "time": "morning", "loc": loc, "kind": kind, "text": f"event {i}"}
+
+
+def test_log_segments_index_and_filters(tmp_path):
+    log = JournalLog(tmp_path / "camp.journal", segment_size=4)
+    log.append([_entry(i, 1 + i // 3, kind="rest" if i % 5 == 0 else "travel") for i in range(10)])
+    assert len(log) == 10
+    index = json.loads((log.root / "index.json").read_text())
+    assert [s["count"] for s in index["segments"]] == [4, 4, 2]
+    assert index["segments"][0]["day_min"] == 1 and index["segments"][0]["day_max"] == 2
+
+    assert [e["text"] for e in log.entries(day=2)] == ["event 3", "event 4", "event 5"]
+    assert [e["text"] for e in log.entries(kind="rest")] == ["event 0", "event 5"]
+    assert [e["text"] for e in log.entries(grep="EVENT 9")] == ["event 9"]
+
+    page, more = log.page(1, 3)
+    assert [e["text"] for e in page] == ["event 7", "event 8", "event 9"] and more
+    page, more = log.page(4, 3)
+    assert [e["text"] for e in page] == ["event 0"] and not more
+
+    # A line written past the indexed length (interrupted append) is dropped.
+    with (log.root / "seg-00002.jsonl").open("ab") as fh:
+        fh.write(b'{"text": "orphan"}\n')
+    log.append([_entry(10, 4, loc="Town")])
+    assert [e["text"] for e in log.entries(loc="town")] == ["event 10"]
+    assert not any(e["text"] == "orphan" for e in log.entries())
+
+
+def test_save_holds_pointer_and_migrates_inline_journal(tmp_path, capsys):
+    st = CampaignState(
+        seed=3,
+        party=[PartyMemberRef(id="PC1", name="Scout", str_mod=0, dex_mod=2, con_mod=1,
+                              int_mod=0, wis_mod=0, cha_mod=0, ac=13, max_hp=10, pb=2,
+                              speed=30, weapon_primary="Bow")],
+    )
+    for i in range(5):
+        log_event(st, f"legacy {i}", kind="travel")
+    path = tmp_path / "camp.json"
+    save_campaign(st, str(path))  # old-style save: journal inline
+
+    loaded = campaign_play._load_state(path)
+    log_event(loaded, "new entry", kind="quest")
+    campaign_play._save_state(loaded, path)
+    doc = read_document(path)
+    assert doc["journal"] == []
+    assert doc["journal_log"] == {"path": "camp.journal", "entries": 6}
+    assert len(JournalLog(journal_dir(path))) == 6
+
+    # Saving again only appends what was logged since.
+    again = campaign_play._load_state(path)
+    campaign_play._save_state(again, path)
+    assert len(JournalLog(journal_dir(path))) == 6
+    assert [e["text"] for e in load_campaign(str(path)).journal][-1] == "new entry"
+
+    campaign_play.journal(load=str(path), tail=None, grep=None, clear=False, page=2, per_page=4)
+    out = capsys.readouterr().out
+    assert "legacy 0" in out and "legacy 1" in out and "legacy 2" not in out
+
+    campaign_play.journal(load=str(path), tail=None, grep=None, clear=False, page=1, per_page=4)
+    out = capsys.readouterr().out
+    assert "new entry" in out and "--page 2" in out
+
+    campaign_play.journal(load=str(path), tail=None, grep=None, clear=False, kind="quest")
+    assert capsys.readouterr().out.count("(quest)") == 1
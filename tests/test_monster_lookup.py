@@ -0,0 +1,60 @@
+import difflib
+import json
+import os
+
+from grimbrain.indexing.content_index import ContentDoc, incremental_index
+from grimbrain.indexing.monster_lookup import (
+    LOOKUP_DATA,
+    LOOKUP_INDEX,
+    FuzzyIndex,
+    open_monster_lookup,
+)
+
+
+def _docs():
+    yield ContentDoc(
+        doc_type="monster", id="monster.goblin", name="Goblin", pack="legacy-data",
+        payload={"name": "Goblin", "hp": 7, "ac": 15}, aliases=["gob"],
+    )
+    yield ContentDoc(
+        doc_type="monster", id="monster.ogre", name="Ogre", pack="legacy-data",
+        payload={"name": "Ogre", "hp": 59, "ac": 11},
+    )
+    yield ContentDoc(
+        doc_type="rule", id="attack.club", name="Club", pack="legacy-data", payload={"name": "Club"},
+    )
+
+
+def test_incremental_index_writes_lookup(tmp_path):
+    incremental_index(_docs(), tmp_path / "manifest.json", tmp_path)
+    assert (tmp_path / LOOKUP_INDEX).exists() and (tmp_path / LOOKUP_DATA).exists()
+    index = json.loads((tmp_path / LOOKUP_INDEX).read_text())
+    assert set(index["offsets"]) == {"goblin", "ogre"}
+
+    lookup = open_monster_lookup(tmp_path)
+    try:
+        assert lookup.resolve("GOB") == "goblin"
+        assert lookup.resolve("Ogre") == "ogre"
+        assert lookup.resolve("club") is None
+        assert lookup.payload("ogre")["hp"] == 59
+        assert lookup.suggest("gobln")[0] == "goblin"
+    finally:
+        lookup.close()
+
+
+def test_stale_lookup_falls_back_to_manifest(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    incremental_index(_docs(), manifest, tmp_path)
+    data = json.loads(manifest.read_text())
+    data["monster/monster.goblin"]["payload"]["hp"] = 12
+    manifest.write_text(json.dumps(data))
+    os.utime(manifest, ns=(manifest.stat().st_mtime_ns + 10**9,) * 2)
+    lookup = open_monster_lookup(tmp_path)
+    assert lookup.payload("goblin")["hp"] == 12
+
+
+def test_fuzzy_index_matches_difflib():
+    keys = ["goblin", "goblin boss", "hobgoblin", "ogre", "orc", "owlbear", "ancient red dragon", "wolf"]
+    index = FuzzyIndex(keys)
+    for query in ["gobln", "ogr", "wolff", "owl bear", "dragon", "hobgobin", "x"]:
+        assert index.suggest(query) == difflib.get_close_matches(query, keys, n=3, cutoff=0.6)
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from grimbrain.retrieval import name_index
+from grimbrain.retrieval.name_index import IndexedNode, get_name_index, update_name_index
+
+
+def _node(i, name, source="MM"):
+    return IndexedNode(f"n{i}", f"{name}\nAC: 15", {"name": name, "source": source})
+
+
+@pytest.fixture
+def store(tmp_path):
+    nodes = [
+        _node(1, "Goblin"),
+        _node(2, "Goblin Boss"),
+        _node(3, "Hobgoblin"),
+        _node(4, "Booyahg Whip", "VGM"),
+        _node(5, "Booyahg Booyahg Booyahg"),
+    ]
+    update_name_index("grim_bestiary", nodes, tmp_path, complete=True)
+    return tmp_path
+
+
+def _names(hits):
+    return [h.node.metadata["name"] for h in hits]
+
+
+def test_single_token_exact_hit(store):
+    hits = name_index.lookup("grim_bestiary", "goblin", store)
+    assert _names(hits) == ["Goblin", "Goblin Boss"]
+
+
+def test_multi_token_exact_hit(store):
+    hits = name_index.lookup("grim_bestiary", "Booyahg Whip", store)
+    assert _names(hits) == ["Booyahg Whip"]
+    assert hits[0].node.get_content().startswith("Booyahg Whip")
+
+
+def test_non_exact_query_falls_back(store):
+    assert name_index.lookup("grim_bestiary", "gob", store) == []
+    assert name_index.lookup("grim_bestiary", "whip", store) == []
+    assert name_index.lookup("grim_spells", "goblin", store) == []
+
+
+def test_hit_metadata_is_isolated(store):
+    hits = name_index.lookup("grim_bestiary", "goblin", store)
+    hits[0].node.metadata["name"] = "Changed"
+    assert _names(name_index.lookup("grim_bestiary", "goblin", store))[0] == "Goblin"
+
+
+def test_reindex_replaces_entry_and_reloads(store):
+    first = get_name_index("grim_bestiary", store)
+    update_name_index("grim_bestiary", [IndexedNode("n9", "Goblin v2", {"name": "Goblin", "source": "MM"})], store)
+    data = json.loads(name_index.index_path("grim_bestiary", store).read_text())
+    assert [e["id"] for e in data["entries"]].count("n1") == 0
+    assert get_name_index("grim_bestiary", store) is not first
+    hits = name_index.lookup("grim_bestiary", "goblin", store)
+    assert hits[0].node.text == "Goblin v2"
+
+
+def test_partial_index_is_not_trusted(tmp_path):
+    # An incremental run on a store without a name index only sees changed files.
+    update_name_index("grim_bestiary", [_node(1, "Goblin Boss")], tmp_path)
+    assert get_name_index("grim_bestiary", tmp_path) is None
+    assert name_index.lookup("grim_bestiary", "goblin boss", tmp_path) == []
+
+    update_name_index("grim_bestiary", [_node(1, "Goblin"), _node(2, "Goblin Boss")], tmp_path, complete=True)
+    update_name_index("grim_bestiary", [_node(3, "Hobgoblin")], tmp_path)
+    assert _names(name_index.lookup("grim_bestiary", "hobgoblin", tmp_path)) == ["Hobgoblin"]
+
+
+def test_run_query_skips_vector_search_for_exact_name(tmp_path, monkeypatch):
+    pytest.importorskip("chromadb")
+    from llama_index.core import Settings
+    from llama_index.core.llms.mock import MockLLM
+    from grimbrain.retrieval import query_router
+
+    class NoQueryClient:
+        def __init__(self, path):
+            pass
+
+        def get_or_create_collection(self, name, **kwargs):
+            raise AssertionError("vector store should not be opened")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(query_router, "PersistentClient", NoQueryClient)
+    monkeypatch.setattr(query_router, "get_query_engine", lambda *a, **k: None)
+    Settings.llm = MockLLM()
+    update_name_index("grim_bestiary", [_node(1, "Goblin"), _node(2, "Goblin Boss")], "chroma_store", complete=True)
+
+    seen = []
+
+    def record(results):
+        seen.extend(h.node.metadata["name"] for h in results)
+        return []
+
+    monkeypatch.setattr(query_router, "provenance_from_results", record)
+    query_router.run_query("goblin", "monster", use_cache=False)
+    assert seen == ["Goblin", "Goblin Boss"]
@@ -0,0 +1,143 @@
+import json
+
+from grimbrain.engine import narrator
+from grimbrain.engine.narration_cache import NarrationStore, reset_narration_stores
+
+
+def test_store_reads_existing_jsonl_and_appends(tmp_path):
+    path = tmp_path / "narration.jsonl"
+    path.write_text(
+        json.dumps({"key": "a", "text": "old"}) + "\n"
+        + "not json\n"
+        + json.dumps({"key": "a", "text": "new"}) + "\n",
+        encoding="utf-8",
+    )
+    store = NarrationStore(path, max_entries=0)
+    assert store.get("a") == "new"
+    assert store.get("b") is None
+    store.put("b", "héllo")
+    assert store.get("b") == "héllo"
+    # A line appended by another process is picked up on the next lookup.
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"key": "c", "text": "other"}) + "\n")
+    assert store.get("c") == "other"
+    assert NarrationStore(path).get("b") == "héllo"
+
+
+def test_store_compacts_duplicates_and_evicts_lru(tmp_path, monkeypatch):
+    monkeypatch.setattr("grimbrain.engine.narration_cache.MIN_COMPACT_DEAD", 2)
+    path = tmp_path / "narration.jsonl"
+    store = NarrationStore(path, max_entries=3)
+    for i in range(3):
+        store.put(f"k{i}", f"t{i}")
+    for _ in range(4):
+        store.put("k1", "again")
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    assert store.get("k1") == "again"
+
+    store.get("k0")  # k2 is now least recently used
+    store.put("k3", "t3")
+    assert store.get("k2") is None
+    assert {json.loads(l)["key"] for l in path.read_text(encoding="utf-8").splitlines()} == {"k0", "k1", "k3"}
+    assert NarrationStore(path).get("k0") == "t0"
+
+
+def test_cached_narrator_hits_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(narrator, "NARRATION_CACHE", tmp_path / "narration.jsonl")
+    reset_narration_stores()
+    calls = []
+
+    class Backend:
+        KIND = "template"
+
+        def render(self, template, ctx):
+            calls.append(template)
+            return template.replace("{{who}}", ctx["who"])
+
+    cn = narrator.CachedNarrator(Backend())
+    assert cn.render("intro", "Hi {{who}}", {"who": "Ana"}) == "Hi Ana"
+    assert cn.render("intro", "Hi {{who}}", {"who": "Ana"}) == "Hi Ana"
+    assert calls == ["Hi {{who}}"]
+
+
+def test_render_many_runs_ai_lines_concurrently_with_deadline(tmp_path, monkeypatch):
+    import threading
+
+    monkeypatch.setattr(narrator, "NARRATION_CACHE", tmp_path / "narration.jsonl")
+    reset_narration_stores()
+    started = threading.Barrier(2, timeout=5)
+    stuck = threading.Event()
+
+    class Backend:
+        KIND = "fake-ai"
+
+        def render(self, template, ctx):
+            if template == "slow":
+                stuck.wait(5)
+                return "late"
+            started.wait()  # both fast lines must be in flight at once
+            return template.upper()
+
+    cn = narrator.CachedNarrator(Backend())
+    lines = [("a", "one", {}), ("b", "two", {}), ("c", "slow", {})]
+    try:
+        assert cn.render_many(lines, deadline=0.5) == ["ONE\none", "TWO\ntwo", "slow"]
+    finally:
+        stuck.set()
+
+
+def test_render_many_late_lines_stay_off_stdout_and_exit(tmp_path, monkeypatch, capsys):
+    import subprocess
+    import sys
+    import threading
+    import time
+
+    monkeypatch.setattr(narrator, "NARRATION_CACHE", tmp_path / "narration.jsonl")
+    reset_narration_stores()
+    release = threading.Event()
+    calls = []
+
+    class Backend:
+        KIND = "fake-ai"
+
+        def render(self, template, ctx):
+            calls.append(template)
+            if template == "slow":
+                release.wait(5)
+            return template.upper()
+
+    cn = narrator.CachedNarrator(Backend(), debug=True)
+    lines = [("a", "one", {}), ("c", "slow", {})]
+    assert cn.render_many(lines, deadline=0.2) == ["ONE\none", "slow"]
+    out = capsys.readouterr().out
+    assert "cache=MISS scene=a" in out and "fallback=template scene=c" in out
+
+    release.set()
+    cache_file = tmp_path / "narration.jsonl"
+    for _ in range(250):  # the late call lands in the cache...
+        if cache_file.exists() and "SLOW" in cache_file.read_text(encoding="utf-8"):
+            break
+        time.sleep(0.02)
+    assert cn.render_many([("c", "slow", {}), ("a", "one", {})])[0] == "SLOW\nslow"
+    assert calls.count("slow") == 1
+    assert "cache=MISS" not in capsys.readouterr().out  # ...without printing
+
+    # A call still in flight does not hold up interpreter exit.
+    script = (
+        "import sys, threading\n"
+        "from grimbrain.engine import narrator\n"
+        "narrator.NARRATION_CACHE = sys.argv[1]\n"
+        "class B:\n"
+        "    KIND = 'fake-ai'\n"
+        "    def render(self, template, ctx):\n"
+        "        threading.Event().wait()\n"
+        "cn = narrator.CachedNarrator(B(), flush=True)\n"
+        "print(cn.render_many([('a', 'x', {}), ('b', 'y', {})], deadline=0.1))\n"
+    )
+    start = time.monotonic()
+    proc = subprocess.run(
+        [sys.executable, "-c", script, str(tmp_path / "other.jsonl")], capture_output=True, text=True, timeout=30
+    )
+    assert proc.stdout.strip() == "['x', 'y']"
+    assert time.monotonic() - start < 10
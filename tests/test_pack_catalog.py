@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from grimbrain.content import packs
+from grimbrain.content.packs import load_packs
+
+
+@pytest.fixture(autouse=True)
+def _pack_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("GB_PACK_CACHE_DIR", str(tmp_path / "cache"))
+    packs.reset_pack_cache()
+    yield
+    packs.reset_pack_cache()
+
+
+def _monster(name, source="MM", text="Hit."):
+    return {"name": name, "source": source, "actions": [{"name": "Bite", "text": text}]}
+
+
+def _make_packs(tmp_path):
+    root = tmp_path / "packs"
+    (root / "a").mkdir(parents=True)
+    (root / "b").mkdir()
+    (root / "a" / "goblin.json").write_text(json.dumps(_monster("Goblin")))
+    (root / "a" / "wolf.json").write_text(json.dumps(_monster("Wolf")))
+    (root / "b" / "goblin.json").write_text(json.dumps(_monster("Goblin", text="Hit. Longer text.")))
+    return root
+
+
+def test_load_packs_merges_and_prefers_longer_actions(tmp_path):
+    catalog = load_packs([str(_make_packs(tmp_path))])
+    assert sorted(catalog) == ["goblin", "wolf"]
+    assert catalog["goblin"]["actions"][0]["text"] == "Hit. Longer text."
+    assert dict(catalog.items())["wolf"]["name"] == "Wolf"
+
+
+def test_unchanged_packs_are_not_reread(tmp_path, monkeypatch):
+    root = _make_packs(tmp_path)
+    load_packs([str(root)])
+    packs.reset_pack_cache()
+
+    reads = []
+    real_read_text = packs.Path.read_text
+
+    def _spy(self, *a, **kw):
+        reads.append(self.name)
+        return real_read_text(self, *a, **kw)
+
+    monkeypatch.setattr(packs.Path, "read_text", _spy)
+    catalog = load_packs([str(root)])
+    assert reads and all(r.endswith(".names.json") for r in reads)
+    assert catalog["wolf"]["name"] == "Wolf"  # data loaded lazily, from the cache
+    assert not any(r in ("goblin.json", "wolf.json") for r in reads)
+
+
+def test_changed_pack_is_reindexed(tmp_path):
+    root = _make_packs(tmp_path)
+    load_packs([str(root)])
+    (root / "a" / "ogre.json").write_text(json.dumps(_monster("Ogre")))
+    assert "ogre" in load_packs([str(root)])
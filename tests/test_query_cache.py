@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from grimbrain.retrieval import query_cache
+from grimbrain.retrieval.query_cache import QueryCache, collection_signature
+
+
+def test_lru_evicts_oldest():
+    cache = QueryCache(max_entries=2)
+    cache.put("a", ("A", None, []))
+    cache.put("b", ("B", None, []))
+    assert cache.get("a")[0] == "A"
+    cache.put("c", ("C", None, []))
+    assert cache.get("b") is None
+    assert cache.get("a")[0] == "A"
+    assert cache.get("c")[0] == "C"
+
+
+def test_sidecar_is_copied():
+    cache = QueryCache()
+    sidecar = {"name": "Goblin", "actions": [{"name": "Scimitar"}]}
+    cache.put("k", ("md", sidecar, ["MM · Goblin"]))
+    sidecar["actions"].clear()
+    got = cache.get("k")[1]
+    assert got["actions"] == [{"name": "Scimitar"}]
+    got["name"] = "changed"
+    assert cache.get("k")[1]["name"] == "Goblin"
+
+
+def test_disk_mirror_survives_new_instance(tmp_path):
+    QueryCache(disk_dir=tmp_path).put("abc", ("md", {"hp": 7}, ["MM · Goblin"]))
+    fresh = QueryCache(disk_dir=tmp_path)
+    assert fresh.get("abc") == ("md", {"hp": 7}, ["MM · Goblin"])
+
+
+def test_signature_changes_on_reindex(tmp_path):
+    hc = tmp_path / "hash_cache.json"
+    assert collection_signature("grim_bestiary", hc) is None
+    hc.write_text(json.dumps({"bestiary/mm.json": "aaa", "spells/phb.json": "bbb"}))
+    first = collection_signature("grim_bestiary", hc)
+    spells = collection_signature("grim_spells", hc)
+    assert first and spells and first != spells
+    hc.write_text(json.dumps({"bestiary/mm.json": "cccc", "spells/phb.json": "bbb"}))
+    assert collection_signature("grim_bestiary", hc) != first
+    assert collection_signature("grim_spells", hc) == spells
+
+
+def test_run_query_served_from_cache(tmp_path, monkeypatch):
+    pytest.importorskip("chromadb")
+    from grimbrain.retrieval import query_router
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "hash_cache.json").write_text(json.dumps({"bestiary/mm.json": "aaa"}))
+    monkeypatch.setattr(query_cache, "_DEFAULT", QueryCache())
+    calls = []
+
+    def fake_pipeline(query, qtype, *a, **k):
+        calls.append(query)
+        query_router.LAST_MONSTER_JSON.update({"name": "Goblin"})
+        return "### Goblin", query_router.LAST_MONSTER_JSON, ["MM · Goblin"]
+
+    monkeypatch.setattr(query_router, "_run_query_uncached", fake_pipeline)
+    first = query_router.run_query("Goblin", "monster", alias_map={})
+    second = query_router.run_query(" goblin ", "monster", alias_map={})
+    assert calls == ["Goblin"]
+    assert second == first
+    assert second[1] is query_router.LAST_MONSTER_JSON
+
+    # Alias lookup sees these differently, so they must not share an entry.
+    query_router.run_query("gob-lin", "monster", alias_map={})
+    query_router.run_query("gob lin", "monster", alias_map={})
+    assert calls == ["Goblin", "gob-lin", "gob lin"]
+
+    (tmp_path / "hash_cache.json").write_text(json.dumps({"bestiary/mm.json": "bbbb"}))
+    query_router.run_query("goblin", "monster", alias_map={})
+    assert len(calls) == 4
@@ -0,0 +1,82 @@
+import pytest
+
+pytest.importorskip("chromadb")
+
+from llama_index.core import Settings
+from llama_index.core.embeddings.mock_embed_model import MockEmbedding
+from llama_index.core.llms.mock import MockLLM
+
+from grimbrain.retrieval import query_router
+
+
+class FakeCollection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def get(self, *a, **k):
+        return {}
+
+    def add(self, *a, **k):
+        pass
+
+    def query(self, n_results=10, **kwargs):
+        self.queries.append(n_results)
+        rows = self.rows[:n_results]
+        return {
+            "ids": [[r["name"] for r in rows]],
+            "documents": [[r["name"] for r in rows]],
+            "metadatas": [[{"name": r["name"], "source": "MM"} for r in rows]],
+            "distances": [[float(i) for i, _ in enumerate(rows)]],
+        }
+
+
+@pytest.fixture
+def fake_store(monkeypatch, tmp_path):
+    rows = [{"name": f"Filler {i}"} for i in range(120)] + [{"name": "Goblin"}]
+    collection = FakeCollection(rows)
+    clients = []
+
+    class FakeClient:
+        def __init__(self, path):
+            clients.append(path)
+
+        def get_or_create_collection(self, name, **kwargs):
+            return collection
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(query_router, "PersistentClient", FakeClient)
+    query_router.reset_engine_pool()
+    Settings.embed_model = MockEmbedding(embed_dim=8)
+    Settings.llm = MockLLM()
+    yield collection, clients
+    query_router.reset_engine_pool()
+
+
+def test_engine_pool_reuses_client(fake_store):
+    collection, clients = fake_store
+    query_router.get_query_engine("grim_bestiary", top_k=5)
+    query_router.get_query_engine("grim_bestiary", top_k=50)
+    assert len(clients) == 1
+
+
+def test_backoff_slices_single_query(fake_store):
+    collection, _ = fake_store
+    hits = query_router.retrieve_with_backoff("grim_bestiary", None, "goblin", "goblin", start_k=50)
+    assert collection.queries == [200]
+    assert hits[-1].node.metadata["name"] == "Goblin"
+
+
+def test_backoff_stops_at_first_matching_k(fake_store):
+    collection, _ = fake_store
+    collection.rows.insert(3, {"name": "Goblin"})
+    hits = query_router.retrieve_with_backoff("grim_bestiary", None, "goblin", "goblin", start_k=15)
+    assert len(hits) == 15
+    assert collection.queries == [200]
+
+
+def test_monster_lookup_hits_chroma_once(fake_store):
+    collection, clients = fake_store
+    query_router.run_query("goblin", "monster")
+    assert len(clients) == 1
+    assert len(collection.queries) == 1
@@ -0,0 +1,107 @@
+"""Golden orderings for ``retrieval.reranker.rerank``.
+
+The golden file was recorded from the original per-hit scoring closure; any
+reranker change must reproduce it exactly (order and rewritten names).
+"""
+
+import json
+import random
+from pathlib import Path
+
+from grimbrain.retrieval.reranker import rerank
+
+GOLDEN = Path(__file__).parent / "golden" / "rerank_orders.json"
+
+NAMES = [
+    "Goblin", "Goblin Boss", "Goblin Shaman", "Hobgoblin", "Hobgoblin Captain",
+    "Booyahg Whip", "Booyahg Slave of Yeenoghu", "Booyahg Booyahg Booyahg",
+    "Fireball", "Delayed Blast Fireball", "Fire Bolt", "Ancient Red Dragon",
+    "Young Red Dragon", "Red Dragon Wyrmling", "Dragon Turtle", "Bag of Holding",
+    "Potion of Healing", "The Lost Mine", "Goblin Hideout", "Whip",
+]
+SOURCES = ["MM", "MPMM", "VGM", "PHB", "DMG", ""]
+QUERIES = [
+    "goblin", "Goblin", "goblins", "booyahg whip", "Booyahg", "fire ball",
+    "fireball", "the goblin", "hobgoblin captain", "dragon", "red dragon",
+    "ancient red dragon", "xyz", "of the", "whip", "bag holding", "boss",
+]
+
+
+class Node:
+    def __init__(self, node_id, text, metadata):
+        self.id = node_id
+        self.text = text
+        self.metadata = metadata
+
+    def get_content(self):
+        return self.text
+
+
+class Hit:
+    def __init__(self, node, score):
+        self.node = node
+        self.score = score
+
+
+def _corpus(seed):
+    rng = random.Random(seed)
+    hits = []
+    for i in range(40):
+        name = rng.choice(NAMES)
+        src = rng.choice(SOURCES)
+        meta = {"name": name, "source": src}
+        roll = rng.random()
+        if roll < 0.15:
+            meta["canonical_id"] = f"{rng.choice(['Goblin', 'Dragon', 'Whip'])}|MM"
+        elif roll < 0.3:
+            meta["variant_of"] = f"{rng.choice(['Goblin', 'Booyahg', 'Fireball'])}|MM"
+            meta["is_variant"] = True
+        if rng.random() < 0.2:
+            meta["priority"] = rng.randint(0, 3)
+        body = " ".join(rng.choice(NAMES).lower() for _ in range(rng.randint(1, 40)))
+        if rng.random() < 0.1:
+            meta = json.dumps(meta)
+        hits.append(Hit(Node(f"h{i}", f"{name}\n{body}", meta), round(rng.uniform(0, 5), 3)))
+    return hits
+
+
+def _summary(hits):
+    out = []
+    for h in hits:
+        meta = h.node.metadata
+        if isinstance(meta, str):
+            meta = json.loads(meta)
+        out.append([h.node.id, meta.get("name")])
+    return out
+
+
+def _run_all(shared_cache=False):
+    results = {}
+    for seed in range(4):
+        for q in QUERIES:
+            hits = _corpus(seed)
+            cache = {} if shared_cache else None
+            first = rerank(q, hits, cache)
+            # run_query reranks twice (before and after coverage expansion)
+            second = rerank(q, first + _corpus(seed + 100)[:10], cache)
+            results[f"{seed}:{q}"] = {"first": _summary(first), "second": _summary(second)}
+    return results
+
+
+def test_rerank_matches_golden():
+    expected = json.loads(GOLDEN.read_text(encoding="utf-8"))
+    assert _run_all() == expected
+
+
+def test_rerank_feature_cache_matches_golden():
+    expected = json.loads(GOLDEN.read_text(encoding="utf-8"))
+    assert _run_all(shared_cache=True) == expected
+
+
+def test_rerank_empty():
+    assert rerank("goblin", []) == []
+
+
+if __name__ == "__main__":  # pragma: no cover - regenerate golden
+    lines = [f"{json.dumps(k)}: {json.dumps(v, separators=(',', ':'))}" for k, v in _run_all().items()]
+    GOLDEN.write_text("{\n" + ",\n".join(lines) + "\n}\n", encoding="utf-8")
@@ -0,0 +1,69 @@
+import json
+import logging
+
+import pytest
+
+from grimbrain.retrieval import trace
+from grimbrain.retrieval.alias_learning import AliasLearner
+
+
+@pytest.fixture(autouse=True)
+def _reset_tracing():
+    yield
+    trace.set_tracing(None)
+
+
+def test_tracing_off_by_default(monkeypatch, caplog):
+    monkeypatch.delenv("GB_RETRIEVAL_TRACE", raising=False)
+    caplog.set_level(logging.INFO, logger="grimbrain.retrieval")
+    with trace.trace("query", query="goblin"):
+        with trace.span("retrieve") as sp:
+            sp["hits"] = 3
+        trace.event("cache", hit=False)
+    assert caplog.records == []
+
+
+def test_spans_are_timed_and_collected(monkeypatch, caplog):
+    monkeypatch.setenv("GB_RETRIEVAL_TRACE", "1")
+    caplog.set_level(logging.INFO, logger="grimbrain.retrieval")
+    with trace.trace("query", query="goblin"):
+        with trace.span("retrieve", collection="grim_bestiary") as sp:
+            sp["hits"] = 3
+        trace.event("cache", hit=False)
+    spans = trace.last_trace()
+    assert [s.get("span") or s.get("event") for s in spans] == ["retrieve", "cache", "query"]
+    assert spans[0]["hits"] == 3 and spans[0]["ms"] >= 0
+    assert any("retrieval.retrieve" in r.getMessage() for r in caplog.records)
+
+
+def test_alias_learner_batches_writes(tmp_path):
+    path = tmp_path / "aliases.json"
+    learner = AliasLearner(path, delay=60)
+    learner.learn("spell", "fire ball", "Fireball")
+    learner.learn("monster", "gobbo", "Goblin")
+    assert not path.exists()
+    assert learner.flush() == 2
+    data = json.loads(path.read_text())
+    assert data["spell"]["fire ball"] == {"canonical": "Fireball", "also": ["fire ball"]}
+    assert data["monster"]["gobbo"]["canonical"] == "Goblin"
+    assert learner.flush() == 0
+
+
+def test_alias_learner_merges_existing_file(tmp_path):
+    path = tmp_path / "aliases.json"
+    path.write_text(json.dumps({"spell": {"mm": {"canonical": "Magic Missile", "also": []}}}))
+    learner = AliasLearner(path, delay=60)
+    learner.learn("spell", "fire ball", "Fireball")
+    learner.flush()
+    data = json.loads(path.read_text())
+    assert set(data["spell"]) == {"mm", "fire ball"}
+
+
+def test_alias_learner_background_flush(tmp_path):
+    path = tmp_path / "aliases.json"
+    learner = AliasLearner(path, delay=0.01)
+    learner.learn("spell", "fire ball", "Fireball")
+    timer = learner._timer
+    timer.join(2)
+    assert json.loads(path.read_text())["spell"]["fire ball"]["canonical"] == "Fireball"
+    assert learner.pending == {}
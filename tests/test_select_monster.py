@@ -0,0 +1,77 @@
+import json
+import random
+
+import pytest
+
+from grimbrain.content import select
+from grimbrain.content.select import select_monster
+
+
+@pytest.fixture
+def pack_root(tmp_path, monkeypatch):
+    root = tmp_path / "packs"
+    (root / "a").mkdir(parents=True)
+    monsters = [
+        ("Goblin", "1/4", ["goblinoid", "humanoid"]),
+        ("Hobgoblin", "1/2", ["goblinoid", "humanoid"]),
+        ("Bugbear", "1", ["goblinoid", "humanoid"]),
+        ("Wolf", "1/4", ["beast"]),
+        ("Ogre", "2", ["giant"]),
+        ("Mystery", None, ["humanoid"]),
+    ]
+    for name, cr, tags in monsters:
+        data = {"name": name, "tags": tags}
+        if cr:
+            data["cr"] = cr
+        (root / "a" / f"{name.lower()}.json").write_text(json.dumps(data))
+    monkeypatch.setattr(select, "PACK_ROOT", root)
+    select.reset_catalog()
+    yield root
+    select.reset_catalog()
+
+
+def test_candidates_by_tags_and_cr(pack_root):
+    catalog = select.monster_catalog(pack_root)
+    assert catalog.candidates(["Goblinoid"]) == ["Bugbear", "Goblin", "Hobgoblin"]
+    assert catalog.candidates(["humanoid"], "0-0.5") == ["Goblin", "Hobgoblin"]
+    assert catalog.candidates(None, "0.25") == ["Goblin", "Wolf"]
+    assert catalog.candidates(None, "1/4") == catalog.candidates()  # unparsable: no CR filter
+    assert catalog.candidates(["humanoid"], exclude={"goblin"}) == ["Bugbear", "Hobgoblin", "Mystery"]
+    assert catalog.candidates(["dragon"]) == []
+
+
+def test_selection_is_seeded(pack_root):
+    expected = random.Random(7).choice(["Bugbear", "Goblin", "Hobgoblin"])
+    assert select_monster(tags=["goblinoid"], seed=7) == expected
+    with pytest.raises(ValueError):
+        select_monster(tags=["dragon"], seed=1)
+
+
+def test_repeated_selection_scans_packs_once(pack_root, monkeypatch):
+    scans = []
+    real = select._scan
+    monkeypatch.setattr(select, "_scan", lambda root: scans.append(root) or real(root))
+    for seed in range(10_000):
+        select_monster(tags=["humanoid"], cr="0-2", seed=seed)
+    assert len(scans) == 1
+
+
+def test_catalog_rebuilt_when_pack_dirs_change(pack_root):
+    first = select.monster_catalog(pack_root)
+    assert select.monster_catalog(pack_root) is first
+    (pack_root / "a" / "orc.json").write_text(json.dumps({"name": "Orc", "cr": "1/2", "tags": ["humanoid"]}))
+    assert "Orc" in select.monster_catalog(pack_root).candidates(["humanoid"])
+    (pack_root / "b").mkdir()
+    (pack_root / "b" / "kobold.json").write_text(json.dumps({"name": "Kobold", "cr": "1/8", "tags": ["humanoid"]}))
+    assert "Kobold" in select.monster_catalog(pack_root).candidates(["humanoid"])
+
+    # In-place edits leave directory mtimes alone but change the file signature.
+    (pack_root / "a" / "wolf.json").write_text(json.dumps({"name": "Dire Wolf", "cr": "1", "tags": ["beast"]}))
+    assert select.monster_catalog(pack_root).candidates(["beast"]) == ["Dire Wolf"]
+
+
+def test_candidates_do_not_share_the_memo(pack_root):
+    catalog = select.monster_catalog(pack_root)
+    first = catalog.candidates(["goblinoid"])
+    first.clear()
+    assert catalog.candidates(["goblinoid"]) == ["Bugbear", "Goblin", "Hobgoblin"]
@@ -0,0 +1,63 @@
+import json
+import os
+import random
+from collections import defaultdict
+
+import pytest
+
+from grimbrain.engine import template_packs
+from grimbrain.engine.narrator import TemplateNarrator
+from grimbrain.engine.template_packs import CompiledTemplate, load_pack, pick_index
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "plain text",
+        "{lead} walks to the {location}.",
+        "Braces {{kept}} and {missing}",
+        "{hp:>4} / {name!r}",
+        "{party[0]} leads",
+    ],
+)
+def test_compiled_template_matches_format_map(raw):
+    ctx = {"lead": "Aria", "location": "moor", "hp": 7, "name": "Bo", "party": ["Cy"]}
+    assert CompiledTemplate(raw).render(ctx) == raw.format_map(defaultdict(str, ctx))
+
+
+def test_pick_index_matches_random():
+    for seed in (None, 0, 1, 123, "seed"):
+        if seed is not None:
+            assert pick_index(seed, 5) == random.Random(seed).randrange(5)
+    assert 0 <= pick_index(None, 3) < 3
+
+
+def test_template_narrator_placeholders():
+    out = TemplateNarrator().render("{{who}} meets {{whom}} at {{{who}}}", {"who": "Ana"})
+    assert out == "Ana meets {{whom}} at {Ana}"
+
+
+def test_pack_cached_on_disk_and_refreshed_on_change(tmp_path, monkeypatch):
+    monkeypatch.setenv("GB_NARRATIVE_CACHE_DIR", str(tmp_path / "cache"))
+    template_packs.reset_template_packs()
+    pack_file = tmp_path / "mine.yaml"
+    pack_file.write_text('travel_start:\n  - "Off to {location}."\n', encoding="utf-8")
+    pack = load_pack(pack_file)
+    assert pack["travel_start"][0].render({"location": "town"}) == "Off to town."
+    cached = list((tmp_path / "cache").glob("mine-*.json"))
+    assert cached and json.loads(cached[0].read_text())["pack"]["travel_start"][0][0] == "Off to {location}."
+
+    # A fresh process reads the JSON instead of YAML.
+    template_packs.reset_template_packs()
+    monkeypatch.setattr(template_packs, "compile_pack", lambda data: pytest.fail("YAML re-parsed"))
+    monkeypatch.setattr(template_packs._FORMATTER, "parse", lambda raw: pytest.fail("template re-parsed"))
+    tpl = load_pack(pack_file)["travel_start"][0]
+    assert tpl.raw == "Off to {location}." and tpl.simple
+    assert tpl.render({"location": "port"}) == "Off to port."
+    monkeypatch.undo()
+    monkeypatch.setenv("GB_NARRATIVE_CACHE_DIR", str(tmp_path / "cache"))
+
+    pack_file.write_text('travel_start:\n  - "Onward to {location}!"\n', encoding="utf-8")
+    os.utime(pack_file, ns=(pack_file.stat().st_mtime_ns + 10**9,) * 2)
+    assert load_pack(pack_file)["travel_start"][0].render({"location": "x"}) == "Onward to x!"
+    assert load_pack(tmp_path / "absent.yaml") is None
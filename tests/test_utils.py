@@ -7,6 +7,8 @@ from grimbrain.retrieval.utils import (
     coerce_obj,
     ordinal,
     hit_text,
+    CopyResolver,
+    resolve_copy,
 )
 
 
@@ -70,3 +72,50 @@ def test_hit_text_handles_various_inputs():
     assert hit_text(hit) == "hello"
     assert hit_text({"text": "hi"}) == "hi"
     assert hit_text("raw") == "raw"
+
+
+def test_resolve_copy_shares_base_without_mutating_it():
+    base = {"name": "Goblin", "source": "MM", "action": [{"name": "Scimitar"}], "skill": {"stealth": 6}}
+    variant = {
+        "name": "Goblin Archer",
+        "source": "HB",
+        "_copy": {"name": "Goblin", "source": "MM"},
+        "_mod": {"action": {"mode": "appendArr", "items": {"name": "Shortbow"}}},
+    }
+    out = resolve_copy(variant, {("Goblin", "MM"): base})
+    assert [a["name"] for a in out["action"]] == ["Scimitar", "Shortbow"]
+    assert base["action"] == [{"name": "Scimitar"}]
+    assert out["skill"] is base["skill"]
+
+
+def test_copy_resolver_memoizes_chains():
+    raw = {
+        ("Goblin", "MM"): {"name": "Goblin", "source": "MM", "hp": 7, "trait": ["Nimble Escape"]},
+        ("Goblin Boss", "MM"): {
+            "name": "Goblin Boss", "source": "MM", "_copy": {"name": "Goblin", "source": "MM"},
+            "_mod": {"trait": {"mode": "appendArr", "items": "Redirect Attack"}},
+        },
+    }
+    calls = []
+
+    def lookup(name, source):
+        calls.append((name, source))
+        return raw.get((name, source))
+
+    resolver = CopyResolver(lookup)
+    king = {"name": "Goblin King", "source": "HB", "hp": 30, "_copy": {"name": "Goblin Boss", "source": "MM"}}
+    out = resolver.resolve(king)
+    assert out["hp"] == 30 and out["trait"] == ["Nimble Escape", "Redirect Attack"]
+    assert "_copy" not in out
+    resolver.resolve(dict(king, name="Goblin Queen"))
+    assert calls == [("Goblin Boss", "MM"), ("Goblin", "MM")]
+
+
+def test_copy_resolver_breaks_cycles():
+    raw = {
+        ("A", "X"): {"name": "A", "source": "X", "_copy": {"name": "B", "source": "X"}},
+        ("B", "X"): {"name": "B", "source": "X", "_copy": {"name": "A", "source": "X"}},
+    }
+    warnings = []
+    out = CopyResolver(raw, warn=warnings.append)("A", "X")
+    assert out["name"] == "A" and warnings